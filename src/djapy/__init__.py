@@ -1,13 +1,24 @@
 from .core.auth import djapy_method, djapy_auth
 from djapy.openapi import openapi
+from .core.metrics import metrics
 from .core.dec import djapify, async_djapify
 from .core.mid import UHandleErrorMiddleware
 from .schema import Schema
 from .core.auth import SessionAuth, BaseAuthMechanism
+from .core.error_handlers import register_error_handler
+from .core.batch import batch_view, create_batch_view
+from .core.cache import djapy_cache, invalidate_cache
+from .core.conditional import djapy_condition
+from .core.compression import djapy_compress
+from .core.encoders import register_encoder
+from .core.fields import djapy_fields
 
 __all__ = [
    'djapify', 'async_djapify',
-   'openapi', 'djapy_auth', 'djapy_method',
+   'openapi', 'metrics', 'djapy_auth', 'djapy_method',
    'Schema', 'UHandleErrorMiddleware', 'SessionAuth',
-   'BaseAuthMechanism'
+   'BaseAuthMechanism', 'register_error_handler',
+   'batch_view', 'create_batch_view', 'djapy_cache', 'invalidate_cache',
+   'djapy_condition', 'djapy_compress', 'register_encoder',
+   'djapy_fields'
 ]
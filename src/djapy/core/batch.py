@@ -0,0 +1,150 @@
+__all__ = ['BatchOperation', 'BatchRequest', 'BatchResult', 'create_batch_view', 'batch_view']
+
+import asyncio
+import copy
+import logging
+from typing import Any, Dict, List, Literal, Union
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponseBase, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.datastructures import MultiValueDict
+from pydantic import Field, field_validator
+from pydantic_core import PydanticCustomError, from_json, to_json
+
+from djapy.core.conf import djapy_setting
+from djapy.core.dec import async_djapify
+from djapy.core.defaults import DEFAULT_MESSAGE_ERROR
+from djapy.schema import Schema
+
+BATCH_NOT_FOUND = {"message": "No djapy view matches this path", "alias": "not_found"}
+BATCH_NESTED = {"message": "Batch operations cannot be nested", "alias": "nested_batch"}
+
+# Negotiation and precondition headers of the batch request, which don't apply to its operations
+SUB_REQUEST_DROPPED_HEADERS = frozenset({
+   "HTTP_ACCEPT", "HTTP_ACCEPT_ENCODING", "HTTP_IF_MATCH", "HTTP_IF_NONE_MATCH",
+   "HTTP_IF_MODIFIED_SINCE", "HTTP_IF_UNMODIFIED_SINCE", "HTTP_IF_RANGE", "HTTP_RANGE",
+})
+
+
+class BatchOperation(Schema):
+   """One call inside a batch, e.g. `{"method": "GET", "path": "/todos/", "query": {"page": 2}}`."""
+   method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+   path: str
+   query: Dict[str, Union[str, int, float, bool, List[Union[str, int, float, bool]]]] = Field(default_factory=dict)
+   body: Any = None
+
+
+class BatchRequest(Schema):
+   operations: List[BatchOperation]
+
+   @field_validator("operations")
+   @classmethod
+   def _limit_operations(cls, operations: List[BatchOperation]) -> List[BatchOperation]:
+      limit = djapy_setting("DJAPY_BATCH_MAX_OPERATIONS")
+      if limit and len(operations) > limit:
+         raise PydanticCustomError(
+            "too_many_operations", "A batch may hold at most {limit} operations", {"limit": limit}
+         )
+      return operations
+
+
+class BatchResult(Schema):
+   status: int
+   headers: Dict[str, str] = Field(default_factory=dict)
+   body: Any = None
+
+
+def _sub_request(request: HttpRequest, operation: BatchOperation, path: str, query_string: str) -> HttpRequest:
+   """
+   Shallow copy of the batch request, pointed at another path.
+
+   The copy keeps `user`, `session` and everything else set up by middleware, so the batch
+   is authenticated once; only the method, path, query string and body are swapped. Results
+   are embedded in a JSON response, so operations always answer uncompressed JSON and
+   never 304.
+   """
+   sub = copy.copy(request)
+   body = b"" if operation.body is None else to_json(operation.body)
+   sub.method = operation.method
+   sub.path = sub.path_info = path
+   sub.META = {
+      **{key: value for key, value in request.META.items() if key not in SUB_REQUEST_DROPPED_HEADERS},
+      "HTTP_ACCEPT": "application/json",
+      "REQUEST_METHOD": operation.method,
+      "PATH_INFO": path,
+      "QUERY_STRING": query_string,
+      "CONTENT_TYPE": "application/json",
+      "CONTENT_LENGTH": str(len(body)),
+   }
+   sub.content_type, sub.content_params = "application/json", {}
+   sub.GET = QueryDict(query_string)
+   sub._body = body
+   sub._post, sub._files = QueryDict(), MultiValueDict()
+   return sub
+
+
+async def _read(response: HttpResponseBase) -> bytes:
+   if not response.streaming:
+      return response.content
+   if response.is_async:
+      return b"".join([chunk async for chunk in response.streaming_content])
+   return await sync_to_async(b"".join)(response.streaming_content)
+
+
+async def _result(response: HttpResponseBase) -> BatchResult:
+   content = await _read(response)
+   try:
+      body = from_json(content) if content else None
+   except ValueError:
+      body = content.decode(errors="replace")
+   headers = {key: value for key, value in response.items() if key.lower() != "content-length"}
+   return BatchResult(status=response.status_code, headers=headers, body=body)
+
+
+async def _run_operation(request: HttpRequest, operation: BatchOperation) -> BatchResult:
+   path, _, query_string = operation.path.partition("?")
+   if operation.query:
+      query_string = "&".join(filter(None, (query_string, urlencode(operation.query, doseq=True))))
+   try:
+      match = resolve(path)
+   except Resolver404:
+      return BatchResult(status=404, body=BATCH_NOT_FOUND)
+   if getattr(match.func, "djapy_batch", False):
+      return BatchResult(status=400, body=BATCH_NESTED)
+   if not getattr(match.func, "djapy", False):
+      return BatchResult(status=404, body=BATCH_NOT_FOUND)
+
+   sub = _sub_request(request, operation, path, query_string)
+   sub.resolver_match = match
+   try:
+      if asyncio.iscoroutinefunction(match.func):
+         response = await match.func(sub, *match.args, **match.kwargs)
+      else:
+         response = await sync_to_async(match.func)(sub, *match.args, **match.kwargs)
+      return await _result(response)
+   except Exception as exc:
+      logging.exception(f"Error in batch operation {operation.method} {operation.path}: {exc}")
+      return BatchResult(status=500, body=DEFAULT_MESSAGE_ERROR)
+
+
+def create_batch_view(**djapify_kwargs):
+   """
+   Build a POST view that runs many djapy operations in one HTTP request.
+
+   Each operation is resolved through the URL resolver and called in-process with a copy
+   of the batch request; async views run concurrently, sync views in the thread-sensitive
+   executor. Keyword arguments are passed on to `async_djapify`, e.g. `auth` or `tags`.
+   """
+
+   async def batch(request: HttpRequest, data: BatchRequest) -> {200: List[BatchResult]}:
+      """Run several API operations in one request; results keep the order of `operations`."""
+      return list(await asyncio.gather(*(_run_operation(request, op) for op in data.operations)))
+
+   view = async_djapify(method="POST", **djapify_kwargs)(batch)
+   view.djapy_batch = True
+   return view
+
+
+batch_view = create_batch_view()
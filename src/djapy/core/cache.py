@@ -0,0 +1,271 @@
+__all__ = ['ViewCache', 'CachedResponse', 'djapy_cache', 'invalidate_cache']
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Type, Union
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.cache import caches
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db.models.utils import make_model_tuple
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import empty
+from pydantic_core import to_json
+
+from djapy.core.conf import djapy_setting
+from djapy.core.view_func import ViewFuncT
+
+CACHE_KEY_PREFIX = "djapy:cache"
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+
+ModelRef = Union[Type[Model], str]
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+   """Serialized response as stored in the cache."""
+   status: int
+   content: bytes
+   content_type: str = "application/json"
+
+   def to_response(self) -> HttpResponse:
+      return HttpResponse(self.content, status=self.status, content_type=self.content_type)
+
+
+class _LocalLRU:
+   """Small in-process LRU with per-entry expiry, consulted before the Django cache."""
+
+   def __init__(self, max_size: int):
+      self.max_size = max_size
+      self._entries: OrderedDict = OrderedDict()
+      self._lock = threading.Lock()
+
+   def get(self, key: str) -> Optional[CachedResponse]:
+      with self._lock:
+         entry = self._entries.get(key)
+         if entry is None:
+            return None
+         expires, value = entry
+         if expires < time.monotonic():
+            del self._entries[key]
+            return None
+         self._entries.move_to_end(key)
+         return value
+
+   def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+      if self.max_size <= 0:
+         return
+      with self._lock:
+         self._entries[key] = (time.monotonic() + ttl, value)
+         self._entries.move_to_end(key)
+         while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+   def clear(self) -> None:
+      with self._lock:
+         self._entries.clear()
+
+
+def _model_label(model: ModelRef) -> str:
+   return model.lower() if isinstance(model, str) else model._meta.label_lower
+
+
+def _generation_key(label: str) -> str:
+   return f"{CACHE_KEY_PREFIX}:gen:{label}"
+
+
+def _generations_backend():
+   # Generations live in the djapy alias whatever backend a view stores its entries in
+   return caches[djapy_setting("DJAPY_CACHE_ALIAS")]
+
+
+def _user_identity(request: HttpRequest) -> str:
+   user = getattr(request, "user", None)
+   if user is None or not user.is_authenticated:
+      return "anon"
+   return str(user.pk)
+
+
+def _user_pending(request: HttpRequest) -> bool:
+   """True when `request.user` is still lazy, i.e. reading it would query the database."""
+   return getattr(getattr(request, "user", None), "_wrapped", None) is empty
+
+
+class ViewCache:
+   """
+   Response cache of one view, keyed on the validated input rather than the raw URL.
+
+   Keys combine the view, its validated keyword arguments, the user and the `vary_on`
+   headers, plus the generation of every `invalidate_on` model; saving or deleting such a
+   model bumps its generation, so stale entries are never read again and simply expire.
+   Hits are served from the in-process LRU first, then from the Django cache backend.
+   """
+
+   def __init__(
+     self,
+     view_id: str,
+     ttl: int,
+     vary_on: Sequence[str] = (),
+     per_user: bool = True,
+     invalidate_on: Sequence[ModelRef] = (),
+     cache_alias: Optional[str] = None,
+     local_size: Optional[int] = None
+   ):
+      self.view_id = view_id
+      self.ttl = ttl
+      self.vary_on = tuple(vary_on)
+      self.per_user = per_user
+      self.models = tuple(_model_label(model) for model in invalidate_on)
+      self.cache_alias = cache_alias
+      self.local = _LocalLRU(djapy_setting("DJAPY_CACHE_LOCAL_SIZE") if local_size is None else local_size)
+      for model in invalidate_on:
+         _connect_invalidation(model)
+
+   @property
+   def backend(self):
+      return caches[self.cache_alias or djapy_setting("DJAPY_CACHE_ALIAS")]
+
+   def _digest(self, request: HttpRequest, data: dict, user: str, variant: str) -> str:
+      parts = [to_json(data, fallback=repr), variant.encode()]
+      if self.per_user:
+         parts.append(user.encode())
+      parts.extend((request.headers.get(name) or "").encode() for name in self.vary_on)
+      return hashlib.blake2b(b"\x00".join(parts), digest_size=16).hexdigest()
+
+   def _key(self, digest: str, generations: dict) -> str:
+      gens = ".".join(str(generations.get(_generation_key(label), 0)) for label in self.models)
+      return f"{CACHE_KEY_PREFIX}:{self.view_id}:{gens}:{digest}"
+
+   def key(self, request: HttpRequest, data: dict, variant: str = "") -> Optional[str]:
+      """
+      Cache key for this request, None if the request must not be cached.
+
+      `variant` tells apart representations of the same input, e.g. the negotiated format.
+      """
+      if request.method not in CACHEABLE_METHODS:
+         return None
+      generations = _generations_backend().get_many([_generation_key(label) for label in self.models]) if self.models else {}
+      user = _user_identity(request) if self.per_user else ""
+      return self._key(self._digest(request, data, user, variant), generations)
+
+   async def akey(self, request: HttpRequest, data: dict, variant: str = "") -> Optional[str]:
+      if request.method not in CACHEABLE_METHODS:
+         return None
+      generations = {}
+      if self.models:
+         generations = await _generations_backend().aget_many([_generation_key(label) for label in self.models])
+      user = ""
+      if self.per_user:
+         # Loading the lazy session user queries the database, keep that off the event loop
+         if _user_pending(request):
+            user = await sync_to_async(_user_identity)(request)
+         else:
+            user = _user_identity(request)
+      return self._key(self._digest(request, data, user, variant), generations)
+
+   def get(self, key: str) -> Optional[HttpResponse]:
+      if (hit := self.local.get(key)) is None:
+         if (hit := self.backend.get(key)) is None:
+            return None
+         self.local.set(key, hit, self.ttl)
+      return hit.to_response()
+
+   async def aget(self, key: str) -> Optional[HttpResponse]:
+      if (hit := self.local.get(key)) is None:
+         if (hit := await self.backend.aget(key)) is None:
+            return None
+         self.local.set(key, hit, self.ttl)
+      return hit.to_response()
+
+   def _entry(self, response: HttpResponse) -> Optional[CachedResponse]:
+      if 200 <= response.status_code < 300 and not response.streaming:
+         return CachedResponse(response.status_code, response.content, response["Content-Type"])
+      return None
+
+   def set(self, key: str, response: HttpResponse) -> None:
+      if entry := self._entry(response):
+         self.local.set(key, entry, self.ttl)
+         self.backend.set(key, entry, self.ttl)
+
+   async def aset(self, key: str, response: HttpResponse) -> None:
+      if entry := self._entry(response):
+         self.local.set(key, entry, self.ttl)
+         await self.backend.aset(key, entry, self.ttl)
+
+
+def invalidate_cache(*models: ModelRef) -> None:
+   """Invalidate every cached response of views declaring one of `models` in `invalidate_on`."""
+   backend = _generations_backend()
+   for model in models:
+      key = _generation_key(_model_label(model))
+      try:
+         backend.incr(key)
+      except ValueError:
+         # Generations never expire, a missing one starts over above the implicit 0
+         if not backend.add(key, 1, None):
+            backend.incr(key)
+
+
+def _invalidate(sender: Type[Model], **kwargs) -> None:
+   invalidate_cache(sender)
+
+
+def _invalidate_m2m(sender: Type[Model], instance: Model, model: Type[Model], action: str, **kwargs) -> None:
+   if action.startswith("post_"):
+      invalidate_cache(type(instance), model)
+
+
+def _connect_m2m_invalidation(model: Type[Model]) -> None:
+   uid = f"{CACHE_KEY_PREFIX}:{_model_label(model)}"
+   for field in model._meta.many_to_many:
+      through = field.remote_field.through
+      m2m_changed.connect(_invalidate_m2m, sender=through, weak=False, dispatch_uid=f"{uid}:{field.name}")
+
+
+def _connect_invalidation(model: ModelRef) -> None:
+   uid = f"{CACHE_KEY_PREFIX}:{_model_label(model)}"
+   post_save.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
+   post_delete.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
+   if isinstance(model, str):
+      # Like the lazy senders above, "app_label.Model" is resolved once the model is registered
+      apps.lazy_model_operation(_connect_m2m_invalidation, make_model_tuple(model))
+   else:
+      _connect_m2m_invalidation(model)
+
+
+def djapy_cache(
+  ttl: int = 60,
+  vary_on: Optional[List[str]] = None,
+  per_user: bool = True,
+  invalidate_on: Optional[List[ModelRef]] = None,
+  cache_alias: Optional[str] = None
+) -> Callable[[ViewFuncT], ViewFuncT]:
+   """
+   Cache the serialized responses of a djapified view.
+
+   @djapify
+   @djapy_cache(ttl=30, vary_on=["Accept-Language"], invalidate_on=[Todo])
+   def list_todos(request, done: bool = False) -> {200: list[TodoSchema]}:
+       ...
+
+   Only successful GET/HEAD responses are stored. Hits skip the view and serialization;
+   request input is still validated, as it makes up the cache key.
+   """
+
+   def decorator(view_func: ViewFuncT) -> ViewFuncT:
+      view_func.djapy_cache = ViewCache(
+         f"{view_func.__module__}.{view_func.__qualname__}",
+         ttl=ttl,
+         vary_on=vary_on or (),
+         per_user=per_user,
+         invalidate_on=invalidate_on or (),
+         cache_alias=cache_alias
+      )
+      return view_func
+
+   return decorator
@@ -0,0 +1,191 @@
+__all__ = ['CompressionPolicy', 'djapy_compress', 'negotiate_encoding', 'available_encodings']
+
+import zlib
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+from djapy.core.conf import djapy_setting
+from djapy.core.view_func import ViewFuncT
+
+try:
+   import brotli
+except ImportError:
+   brotli = None
+
+try:
+   import zstandard
+except ImportError:
+   zstandard = None
+
+
+class _ZlibCompressor:
+   def __init__(self, wbits: int):
+      self._obj = zlib.compressobj(6, zlib.DEFLATED, wbits)
+
+   def feed(self, data: bytes) -> bytes:
+      return self._obj.compress(data)
+
+   def flush(self) -> bytes:
+      return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+   def finish(self) -> bytes:
+      return self._obj.flush()
+
+
+class _BrotliCompressor:
+   def __init__(self):
+      self._obj = brotli.Compressor(quality=5)
+
+   def feed(self, data: bytes) -> bytes:
+      return self._obj.process(data)
+
+   def flush(self) -> bytes:
+      return self._obj.flush()
+
+   def finish(self) -> bytes:
+      return self._obj.finish()
+
+
+class _ZstdCompressor:
+   def __init__(self):
+      self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+
+   def feed(self, data: bytes) -> bytes:
+      return self._obj.compress(data)
+
+   def flush(self) -> bytes:
+      return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+   def finish(self) -> bytes:
+      return self._obj.flush()
+
+
+# Content codings by server preference, used to break ties between equal q-values
+CODECS: Dict[str, Callable] = {}
+if zstandard is not None:
+   CODECS["zstd"] = _ZstdCompressor
+if brotli is not None:
+   CODECS["br"] = _BrotliCompressor
+CODECS["gzip"] = lambda: _ZlibCompressor(31)
+CODECS["deflate"] = lambda: _ZlibCompressor(15)
+
+
+def available_encodings() -> tuple:
+   return tuple(CODECS)
+
+
+@lru_cache(maxsize=256)
+def _accepted(header: str) -> Dict[str, float]:
+   accepted = {}
+   for part in header.split(","):
+      coding, _, params = part.strip().partition(";")
+      q = 1.0
+      for param in params.split(";"):
+         name, _, value = param.strip().partition("=")
+         if name.lower() == "q":
+            try:
+               q = float(value)
+            except ValueError:
+               q = 0.0
+      if coding:
+         accepted[coding.lower()] = q
+   return accepted
+
+
+def negotiate_encoding(header: str, encodings: Sequence[str]) -> Optional[str]:
+   """Pick the content coding for an `Accept-Encoding` header, None for identity."""
+   if not header:
+      return None
+   accepted = _accepted(header)
+   wildcard = accepted.get("*", 0.0)
+   best, best_q = None, 0.0
+   for coding in encodings:
+      if coding not in CODECS:
+         continue
+      q = accepted.get(coding, wildcard)
+      if q > best_q:
+         best, best_q = coding, q
+   return best
+
+
+def _compress_iter(compressor, chunks: Iterable[bytes]) -> Iterator[bytes]:
+   for chunk in chunks:
+      # Flush after each chunk so streamed items reach the client as they are produced
+      if data := compressor.feed(chunk) + compressor.flush():
+         yield data
+   yield compressor.finish()
+
+
+async def _acompress_iter(compressor, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+   async for chunk in chunks:
+      if data := compressor.feed(chunk) + compressor.flush():
+         yield data
+   yield compressor.finish()
+
+
+class CompressionPolicy:
+   """
+   Response compression negotiated from `Accept-Encoding`.
+
+   Plain responses are compressed only from `min_size` bytes on and only when that makes
+   them smaller; streaming responses are always compressed, chunk by chunk. gzip and
+   deflate are always available, zstd and br when `zstandard`/`brotli` are installed.
+   """
+
+   def __init__(self, min_size: Optional[int] = None, encodings: Optional[Sequence[str]] = None):
+      self.min_size = min_size
+      self.encodings = tuple(encodings) if encodings is not None else None
+
+   def compress(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+      if response.has_header("Content-Encoding") or response.status_code == 304:
+         return response
+      encodings = self.encodings or djapy_setting("DJAPY_COMPRESSION_ENCODINGS")
+      coding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), encodings)
+      # Whether compressed or not, the body depends on Accept-Encoding
+      patch_vary_headers(response, ("Accept-Encoding",))
+      if coding is None:
+         return response
+
+      compressor = CODECS[coding]()
+      if response.streaming:
+         if response.is_async:
+            response.streaming_content = _acompress_iter(compressor, response.streaming_content)
+         else:
+            response.streaming_content = _compress_iter(compressor, response.streaming_content)
+         del response["Content-Length"]
+      else:
+         min_size = djapy_setting("DJAPY_COMPRESSION_MIN_SIZE") if self.min_size is None else self.min_size
+         if len(response.content) < min_size:
+            return response
+         compressed = compressor.feed(response.content) + compressor.finish()
+         if len(compressed) >= len(response.content):
+            return response
+         response.content = compressed
+
+      # The compressed body differs byte for byte, so a strong ETag becomes weak
+      if (etag := response.get("ETag")) and etag.startswith('"'):
+         response.headers["ETag"] = f"W/{etag}"
+      response.headers["Content-Encoding"] = coding
+      return response
+
+
+def djapy_compress(
+  enabled: bool = True,
+  min_size: Optional[int] = None,
+  encodings: Optional[Sequence[str]] = None
+) -> Callable[[ViewFuncT], ViewFuncT]:
+   """
+   Compress the responses of a djapified view, or opt it out of `DJAPY_COMPRESSION`.
+
+   `min_size` and `encodings` default to `DJAPY_COMPRESSION_MIN_SIZE` and
+   `DJAPY_COMPRESSION_ENCODINGS`.
+   """
+
+   def decorator(view_func: ViewFuncT) -> ViewFuncT:
+      view_func.djapy_compress = CompressionPolicy(min_size, encodings) if enabled else False
+      return view_func
+
+   return decorator
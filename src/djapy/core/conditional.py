@@ -0,0 +1,133 @@
+__all__ = ['ConditionalPolicy', 'Validators', 'djapy_condition', 'body_etag']
+
+import datetime
+import hashlib
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from djapy.core.view_func import ViewFuncT
+
+CONDITIONAL_METHODS = frozenset({"GET", "HEAD"})
+
+
+def body_etag(content: bytes) -> str:
+   """Strong ETag of serialized response bytes."""
+   return quote_etag(hashlib.blake2b(content, digest_size=16).hexdigest())
+
+
+def _timestamp(value: Any) -> Optional[int]:
+   if value is None:
+      return None
+   if isinstance(value, datetime.datetime):
+      return int(value.timestamp())
+   return int(value)
+
+
+@dataclass(slots=True)
+class Validators:
+   """ETag and Last-Modified (a POSIX timestamp) of one response."""
+   etag: Optional[str] = None
+   last_modified: Optional[int] = None
+
+   def precondition(self, request: HttpRequest) -> Optional[HttpResponseBase]:
+      """304/412 response if the request's conditional headers already settle it."""
+      if self.etag is None and self.last_modified is None:
+         return None
+      if (response := get_conditional_response(request, self.etag, self.last_modified)) is not None:
+         self._set_headers(response)
+      return response
+
+   def finalize(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+      """Add the validator headers, hashing the body when no version was supplied."""
+      if not 200 <= response.status_code < 300 or response.streaming:
+         return response
+      if self.etag is None:
+         self.etag = body_etag(response.content)
+      self._set_headers(response)
+      return get_conditional_response(request, self.etag, self.last_modified, response)
+
+   def _set_headers(self, response: HttpResponseBase) -> None:
+      if self.etag is not None and not response.has_header("ETag"):
+         response.headers["ETag"] = self.etag
+      if self.last_modified is not None and not response.has_header("Last-Modified"):
+         response.headers["Last-Modified"] = http_date(self.last_modified)
+
+
+class ConditionalPolicy:
+   """
+   Conditional GET support of a view.
+
+   `etag` and `last_modified` receive the request and the validated view kwargs and run
+   before the view body, so a matching `If-None-Match`/`If-Modified-Since` returns 304
+   without touching the view or serializer. Without `etag`, the ETag is a hash of the
+   serialized response, which saves bandwidth but not work.
+   """
+
+   def __init__(self, etag: Optional[Callable] = None, last_modified: Optional[Callable] = None):
+      self.etag_func = etag
+      self.last_modified_func = last_modified
+
+   @staticmethod
+   def _call_sync(func: Optional[Callable], request: HttpRequest, data: dict) -> Any:
+      if func is None:
+         return None
+      if inspect.iscoroutinefunction(func):
+         return async_to_sync(func)(request, **data)
+      return func(request, **data)
+
+   @staticmethod
+   async def _call_async(func: Optional[Callable], request: HttpRequest, data: dict) -> Any:
+      if func is None:
+         return None
+      if inspect.iscoroutinefunction(func):
+         return await func(request, **data)
+      # Version functions usually query the database
+      return await sync_to_async(func)(request, **data)
+
+   @staticmethod
+   def _validators(etag: Any, last_modified: Any) -> Validators:
+      return Validators(None if etag is None else quote_etag(str(etag)), _timestamp(last_modified))
+
+   def validators(self, request: HttpRequest, data: dict) -> Optional[Validators]:
+      if request.method not in CONDITIONAL_METHODS:
+         return None
+      return self._validators(
+         self._call_sync(self.etag_func, request, data),
+         self._call_sync(self.last_modified_func, request, data)
+      )
+
+   async def avalidators(self, request: HttpRequest, data: dict) -> Optional[Validators]:
+      if request.method not in CONDITIONAL_METHODS:
+         return None
+      return self._validators(
+         await self._call_async(self.etag_func, request, data),
+         await self._call_async(self.last_modified_func, request, data)
+      )
+
+
+def djapy_condition(
+  etag: Optional[Callable] = None,
+  last_modified: Optional[Callable] = None
+) -> Callable[[ViewFuncT], ViewFuncT]:
+   """
+   Add ETag/Last-Modified headers to a djapified view and answer conditional GETs with 304.
+
+   @djapify
+   @djapy_condition(etag=lambda request, **kwargs: Todo.objects.aggregate(v=Max("updated_at"))["v"])
+   def list_todos(request) -> {200: list[TodoSchema]}:
+       ...
+
+   Set `DJAPY_ETAG = True` to give every djapified GET view body-hash ETags.
+   """
+
+   def decorator(view_func: ViewFuncT) -> ViewFuncT:
+      view_func.djapy_condition = ConditionalPolicy(etag, last_modified)
+      return view_func
+
+   return decorator
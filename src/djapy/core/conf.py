@@ -0,0 +1,84 @@
+__all__ = ['djapy_setting', 'DJAPY_DEFAULTS']
+
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+DJAPY_DEFAULTS = {
+   # Run pure-CPU validation and serialization of async views on the event loop
+   "DJAPY_ASYNC_INLINE": True,
+   # Request bodies larger than this (bytes) are validated in a non thread-sensitive executor
+   "DJAPY_ASYNC_OFFLOAD_BODY_SIZE": 1024 * 1024,
+   # Response lists longer than this are serialized in a non thread-sensitive executor
+   "DJAPY_ASYNC_OFFLOAD_ITEMS": 5000,
+   # Async paginated views count on a separate connection while fetching the page (never on SQLite
+   # or inside a transaction). That connection is opened and closed for every count, so only turn
+   # this on when a count costs more than connecting, e.g. behind a connection pooler
+   "DJAPY_ASYNC_PARALLEL_COUNT": False,
+   # Join/prefetch the relations response schemas read from returned QuerySets
+   "DJAPY_AUTO_RELATED": True,
+   # Most operations accepted by one batch request, falsy for no limit
+   "DJAPY_BATCH_MAX_OPERATIONS": 20,
+   # Django cache alias used by `djapy_cache`
+   "DJAPY_CACHE_ALIAS": "default",
+   # Entries of the in-process LRU kept in front of the cache backend, per cached view
+   "DJAPY_CACHE_LOCAL_SIZE": 256,
+   # Compress every djapified view's responses, see `djapy_compress`
+   "DJAPY_COMPRESSION": False,
+   # Smallest response body (bytes) worth compressing; streams are always compressed
+   "DJAPY_COMPRESSION_MIN_SIZE": 1024,
+   # Content codings offered, by preference; unavailable ones are skipped
+   "DJAPY_COMPRESSION_ENCODINGS": ("zstd", "br", "gzip", "deflate"),
+   # Record per-view, per-stage latency histograms, exposed by `djapy.metrics.urls`
+   "DJAPY_METRICS": False,
+   # Upper bounds (seconds) of the latency histogram buckets
+   "DJAPY_METRICS_BUCKETS": (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+   # Give every djapified GET view an ETag hashed from its serialized response
+   "DJAPY_ETAG": False,
+   # Module whose `handle_*` functions are the process-wide error handlers
+   "DJAPY_ERROR_HANDLER_MODULE": "djapy_ext.errorhandler",
+   # Rows fetched per database round trip when streaming a QuerySet
+   "DJAPY_STREAM_CHUNK_SIZE": 2000,
+   # Serialized bytes buffered before a streamed chunk is sent
+   "DJAPY_STREAM_BUFFER_SIZE": 64 * 1024,
+   # Directory profiles are written to; profiling is off while unset, see `djapy.core.profiling`
+   "DJAPY_PROFILE_DIR": None,
+   # "cprofile" (deterministic, .pstats files) or "sampling" (stack samples, .collapsed files)
+   "DJAPY_PROFILER": "cprofile",
+   # Seconds between two stack samples of the sampling profiler
+   "DJAPY_PROFILE_SAMPLING_INTERVAL": 0.005,
+   # Fraction of requests (0 to 1) profiled
+   "DJAPY_PROFILE_SAMPLE_RATE": 0.0,
+   # Views (dotted paths or function names) whose every request is profiled
+   "DJAPY_PROFILE_VIEWS": (),
+   # Request header carrying a `profile_token()`, which profiles that request
+   "DJAPY_PROFILE_HEADER": "X-Djapy-Profile",
+   # Seconds a profiling token stays valid
+   "DJAPY_PROFILE_TOKEN_MAX_AGE": 3600,
+   # Fraction of requests (0 to 1) whose stages and SQL queries are traced, see `djapy.core.trace`
+   "DJAPY_TRACE_SAMPLE_RATE": 0.0,
+   # A statement repeated this many times within one stage is reported as a possible N+1
+   "DJAPY_TRACE_N_PLUS_ONE_THRESHOLD": 5,
+   # Callables (or dotted paths to them) receiving the `TraceReport` of every traced request
+   "DJAPY_TRACE_SINKS": (),
+}
+
+_cache: dict = {}
+
+
+def djapy_setting(name: str) -> Any:
+   """Read a djapy setting from Django settings, falling back to `DJAPY_DEFAULTS`."""
+   try:
+      return _cache[name]
+   except KeyError:
+      value = _cache[name] = getattr(settings, name, DJAPY_DEFAULTS[name])
+      return value
+
+
+def _clear_cache(*, setting: str, **kwargs) -> None:
+   if setting in DJAPY_DEFAULTS:
+      _cache.pop(setting, None)
+
+
+setting_changed.connect(_clear_cache)
@@ -1,14 +1,70 @@
 import asyncio
-import json
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum
 from functools import wraps
+from typing import Any, Callable
+from uuid import UUID
+
 from asgiref.sync import sync_to_async, markcoroutinefunction
-from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest, HttpResponse, JsonResponse
+from pydantic import BaseModel
 from .base_dec import BaseDjapifyDecorator
-from ..parser import AsyncRequestParser, AsyncResponseParser
+from ..encoders import variant_key
+from ..trace import NULL_TRACE
+from ..conf import djapy_setting
 from ..view_func import WrappedViewT
 
 
+# Values that serialize without reading attributes, so can't reach the ORM
+ORM_FREE_TYPES = (str, int, float, bool, bytes, type(None), Decimal, date, time, timedelta, UUID, Enum)
+
+
+def _touches_orm(data: Any) -> bool:
+   """
+   Check if validating `data` may hit the database, which must not happen on the event loop.
+
+   Only data that provably can't is validated inline: primitives, and lists, tuples, sets,
+   dicts and pydantic models holding only such data, checked all the way down. Anything
+   else, e.g. a model instance whose relations load lazily, may touch the ORM.
+   """
+   if isinstance(data, ORM_FREE_TYPES):
+      return False
+   if isinstance(data, (list, tuple, set, frozenset)):
+      return any(_touches_orm(value) for value in data)
+   if isinstance(data, dict):
+      return any(_touches_orm(value) for value in data.values())
+   if isinstance(data, BaseModel):
+      return any(_touches_orm(value) for value in data.__dict__.values())
+   return True
+
+
+async def _run(func: Callable, *args, orm: bool = False, large: bool = False, **kwargs) -> Any:
+   """
+   Run a pipeline stage inline on the event loop, hopping threads only when required.
+
+   ORM work goes to the shared thread-sensitive executor like any other sync ORM call,
+   large CPU-only payloads go to a thread pool so they don't stall the event loop.
+   """
+   if orm or not djapy_setting("DJAPY_ASYNC_INLINE"):
+      return await sync_to_async(func)(*args, **kwargs)
+   if large:
+      return await sync_to_async(func, thread_sensitive=False)(*args, **kwargs)
+   return func(*args, **kwargs)
+
+
+def _is_large_body(request: HttpRequest) -> bool:
+   try:
+      size = int(request.META.get("CONTENT_LENGTH") or 0)
+   except ValueError:
+      return False
+   return size > djapy_setting("DJAPY_ASYNC_OFFLOAD_BODY_SIZE")
+
+
+def _is_large_result(data: Any) -> bool:
+   return isinstance(data, (list, tuple)) and len(data) > djapy_setting("DJAPY_ASYNC_OFFLOAD_ITEMS")
+
+
 class AsyncDjapifyDecorator(BaseDjapifyDecorator):
    def __call__(self, view_func: WrappedViewT = None):
       if view_func is None:
@@ -17,69 +73,94 @@ class AsyncDjapifyDecorator(BaseDjapifyDecorator):
       if not asyncio.iscoroutinefunction(view_func):
          raise ValueError(f"View function {view_func.__name__} must be async")
 
-      @wraps(view_func)
-      async def wrapped_view(request: HttpRequest, *args, **kwargs):
-         # Lazy preparation - only prepare once
-         if not hasattr(view_func, 'djapy_prepared'):
-            self._prepare(view_func)
-            view_func.djapy_prepared = True
-
-         # Fast access check
-         if msg := await sync_to_async(self.check_access)(request, view_func, *args, **kwargs):
+      async def dispatch(request: HttpRequest, trace, *args, **kwargs):
+         trace.enter("access")
+         # Method checks are pure CPU; only real auth mechanisms (sessions, users) hit the DB
+         if msg := await _run(plan.check_access, request, *args, orm=plan.auth is not None, **kwargs):
             return msg
 
          try:
-            # Use optimized async request parser
-            parser = AsyncRequestParser(request, view_func, kwargs)
-            data = await parser.parse_data()
+            trace.enter("input")
+            data = await _run(plan.parse_request, request, kwargs, large=_is_large_body(request))
+
+            # Conditional GET: version functions run before the view body
+            validators = await policy.avalidators(request, data) if (policy := plan.conditional_policy()) else None
+            if validators and (not_modified := validators.precondition(request)) is not None:
+               return not_modified
+
+            # Cached responses are keyed on the validated input
+            candidates = plan.encoder_candidates(request)
+            cache_key = await plan.cache.akey(request, data, variant_key(candidates)) if plan.cache else None
+            if cache_key and (cached := await plan.cache.aget(cache_key)) is not None:
+               return plan.finalize(request, cached, validators)
 
             # Inject response if needed
-            if view_func.djapy_resp_param:
-               response = HttpResponse(content_type="application/json")
-               data[view_func.djapy_resp_param.name] = response
-            else:
-               response = None
+            response = plan.inject_response(data)
 
             # Execute async view function
+            trace.enter("view")
             content = await view_func(request, *args, **data)
 
+            # Fast path: If already JsonResponse, return it
+            if isinstance(content, JsonResponse):
+               return content
+
             # Determine status and data
+            trace.enter("serialize")
             status = 200 if not isinstance(content, tuple) else content[0]
             response_data = content if not isinstance(content, tuple) else content[1]
 
-            # Fast path: If already JsonResponse, return it
-            if isinstance(content, JsonResponse):
-               return content
+            if status in plan.stream_statuses:
+               streaming = plan.stream_response(request, status, response_data, data, response, is_async=True)
+               return plan.finalize(request, streaming)
 
-            # Use optimized async response parser
-            parser = AsyncResponseParser(
-               request=request,
-               status=status,
-               data=response_data,
-               schemas=view_func.schema,
-               input_data=data
-            )
+            # Apply a `?fields=` selection to the serializer and a returned QuerySet
+            if selection := plan.select_fields(status, data):
+               response_data = selection.narrow(response_data)
+            response_data = plan.load_related(status, response_data, selection)
+            response_data = await plan.apaginate(status, response_data, data)
 
-            # Parse with mode='json' for JSON serialization
-            result = await parser.parse_data()
+            # Validate and serialize straight to bytes of the negotiated format
+            parser = plan.response_parser(request, status, response_data, data, selection)
+            rendered, media_type = await _run(
+               parser.encode,
+               candidates,
+               orm=_touches_orm(response_data),
+               large=_is_large_result(response_data)
+            )
 
             # Build response efficiently
             if response is None:
-               response = HttpResponse(content_type="application/json")
+               response = HttpResponse()
             response.status_code = status
-            # Use orjson if available for better performance, fallback to standard json
-            try:
-               import orjson
-               response.content = orjson.dumps(result)
-            except ImportError:
-               response.content = json.dumps(result, cls=DjangoJSONEncoder)
-            
-            return response
+            response.content = rendered
+            response["Content-Type"] = media_type
+
+            if cache_key:
+               await plan.cache.aset(cache_key, response)
+            return plan.finalize(request, response, validators)
 
          except Exception as exc:
-            return await sync_to_async(self.handle_error)(request, exc)
+            trace.enter("error")
+            return await self.ahandle_error(request, exc)
+
+      async def traced(request: HttpRequest, *args, **kwargs):
+         # Sampled requests are traced, the others get a no-op trace
+         if (trace := plan.start_trace()) is None:
+            return await dispatch(request, NULL_TRACE, *args, **kwargs)
+         async with trace:
+            response = await dispatch(request, trace, *args, **kwargs)
+         return trace.finish(request, response)
+
+      @wraps(view_func)
+      async def wrapped_view(request: HttpRequest, *args, **kwargs):
+         if (profile := plan.start_profile(request)) is None:
+            return await traced(request, *args, **kwargs)
+         with profile:
+            response = await traced(request, *args, **kwargs)
+         return profile.finish(response)
 
-      self._set_common_attributes(wrapped_view, view_func)
+      plan = self._set_common_attributes(wrapped_view, view_func)
       # Mark as coroutine function for proper ASGI detection
       markcoroutinefunction(wrapped_view)
       return wrapped_view
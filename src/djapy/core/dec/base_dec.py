@@ -1,25 +1,32 @@
 import inspect
-import importlib
 import json
 import logging
-from typing import Callable, Dict, Type, List, Optional, Union, Any, TypeVar, Protocol
+from typing import Callable, Dict, Type, List, Optional, Union, Any, TypeVar, Protocol, Annotated
 
+from asgiref.sync import async_to_sync, sync_to_async
 from django.http import HttpRequest, JsonResponse, HttpResponseBase
-from pydantic import ValidationError, create_model
+from pydantic import ValidationError, create_model, AliasPath, AliasChoices, Field
 
 from djapy.core.auth import BaseAuthMechanism, base_auth_obj
 from djapy.core.d_types import dyp
+from djapy.core.error_handlers import (
+   ErrorHandlerIndex,
+   handler_result_to_response,
+   error_handlers as shared_error_handlers
+)
 from djapy.core.defaults import (
    DEFAULT_MESSAGE_ERROR,
    DEFAULT_METHOD_NOT_ALLOWED_MESSAGE
 )
 from djapy.core.parser import get_response_schema_dict
+from djapy.core.plan import ViewPlan, build_view_plan
 from djapy.core.response import create_json_from_validation_error
 from djapy.core.type_check import (
    is_param_query_type,
    is_data_type
 )
 from djapy.core.labels import (
+   REQUEST_INPUT_SCHEMA_NAME,
    REQUEST_INPUT_DATA_SCHEMA_NAME,
    REQUEST_INPUT_QUERY_SCHEMA_NAME,
    REQUEST_INPUT_FORM_SCHEMA_NAME,
@@ -27,11 +34,7 @@ from djapy.core.labels import (
 )
 from djapy.core.view_func import WrappedViewT, ViewFuncT
 from djapy.schema.param_loadable import is_payload_type
-from djapy.schema.schema import Schema, Form, QueryMapperSchema
-
-ERROR_HANDLER_MODULE = "djapy_ext.errorhandler"
-ERROR_HANDLER_PREFIX = "handle_"
-
+from djapy.schema.schema import Schema, Form, QueryMapperSchema, CombinedInputSchema, is_multi_value
 
 class BaseDjapifyDecorator:
    def __init__(
@@ -40,27 +43,24 @@ class BaseDjapifyDecorator:
      method: dyp.methods = "GET",
      openapi: bool = True,
      tags: List[str] = None,
-     auth: dyp.auth = base_auth_obj
+     auth: dyp.auth = base_auth_obj,
+     combined_input: bool = False,
+     error_handlers: Optional[List[Callable]] = None
    ):
       self.view_func: WrappedViewT = view_func
       self.method = method
       self.openapi = openapi
       self.tags = tags
       self.auth = auth
+      self.combined_input = combined_input
       self.app_auth: dyp.auth = None
-      self.handlers = self._get_handlers()
+      # View specific handlers, consulted before the process-wide registry
+      self.handlers = ErrorHandlerIndex(error_handlers) if error_handlers else None
 
-   @staticmethod
-   def _get_handlers() -> List[Callable]:
-      handlers = []
-      try:
-         handler = importlib.import_module(ERROR_HANDLER_MODULE)
-         for name in dir(handler):
-            if name.startswith(ERROR_HANDLER_PREFIX):
-               handlers.append(getattr(handler, name))
-      except ImportError:
-         pass
-      return handlers
+   def _resolve_handler(self, exc: Exception) -> Optional[Callable]:
+      if self.handlers and (handler := self.handlers.resolve(type(exc))):
+         return handler
+      return shared_error_handlers.resolve(type(exc))
 
    @staticmethod
    def check_access(request: HttpRequest, w: WrappedViewT, *args, **kwargs) -> Optional[JsonResponse]:
@@ -178,23 +178,34 @@ class BaseDjapifyDecorator:
 
    def handle_error(self, request: HttpRequest, exc: Exception) -> JsonResponse:
       """Handle errors uniformly"""
-      for handler in self.handlers:
+      if handler := self._resolve_handler(exc):
          try:
-            signature = inspect.signature(handler)
-            exc_param = signature.parameters.get('exception')
-            if exc.__class__ == exc_param.annotation:
+            if inspect.iscoroutinefunction(handler):
+               result = async_to_sync(handler)(request, exc)
+            else:
                result = handler(request, exc)
-               if isinstance(result, JsonResponse):
-                  return result
-               if isinstance(result, tuple):
-                  status, response = result
-               else:
-                  status, response = 400, result
-               if isinstance(response, dict):
-                  return JsonResponse(response, status=status)
+            if (response := handler_result_to_response(result)) is not None:
+               return response
+         except Exception as e:
+            logging.exception(f"Error in custom handler: {e}")
+      return self._default_error_response(exc)
+
+   async def ahandle_error(self, request: HttpRequest, exc: Exception) -> JsonResponse:
+      """Async error handling: async handlers are awaited natively, sync ones run off the event loop"""
+      if handler := self._resolve_handler(exc):
+         try:
+            if inspect.iscoroutinefunction(handler):
+               result = await handler(request, exc)
+            else:
+               result = await sync_to_async(handler)(request, exc)
+            if (response := handler_result_to_response(result)) is not None:
+               return response
          except Exception as e:
             logging.exception(f"Error in custom handler: {e}")
+      return self._default_error_response(exc)
 
+   @staticmethod
+   def _default_error_response(exc: Exception) -> JsonResponse:
       if isinstance(exc, ValidationError):
          return JsonResponse(
             create_json_from_validation_error(exc),
@@ -240,6 +251,11 @@ class BaseDjapifyDecorator:
          )
       }
 
+      if self.combined_input:
+         djapy_inp_schema["combined"] = self._get_combined_schema(
+            {**query, **queries}, data, form, djapy_inp_schema
+         )
+
       if hasattr(w, 'response_wrapper'):
          status, wrapper = w.response_wrapper
          if status in schemas:
@@ -247,8 +263,40 @@ class BaseDjapifyDecorator:
 
       return schemas, djapy_inp_schema
 
-   def _set_common_attributes(self, wf: WrappedViewT, vf: ViewFuncT) -> None:
-      """Set common view attributes"""
+   @staticmethod
+   def _get_combined_schema(query: Dict, data: Dict, form: Dict, inp_schema: dict) -> Type[CombinedInputSchema]:
+      """
+      Build one input model whose fields are routed to their request source.
+
+      Query fields read the query string first and fall back to URL path kwargs.
+      A lone schema parameter receives the whole JSON body or form, mirroring
+      `Schema.validate_via_request`.
+      """
+      fields = {}
+      unwrap = set()
+
+      def routed(name, spec, alias):
+         annotation, default = spec
+         fields[name] = (Annotated[annotation, Field(validation_alias=alias)], default)
+
+      for name, spec in query.items():
+         routed(name, spec, AliasChoices(AliasPath("query", name), AliasPath("path", name)))
+         if not is_multi_value(spec[0]):
+            unwrap.add(name)
+      for source, params in (("body", data), ("form", form)):
+         single = inp_schema["data" if source == "body" else "form"].single()
+         for name, spec in params.items():
+            routed(name, spec, source if single else AliasPath(source, name))
+            if source == "form" and not single and not is_multi_value(spec[0]):
+               unwrap.add(name)
+
+      combined = create_model(REQUEST_INPUT_SCHEMA_NAME, **fields, __base__=CombinedInputSchema)
+      combined.cvar_unwrap_fields = frozenset(unwrap)
+      combined.cvar_reads_body = bool(data)
+      return combined
+
+   def _set_common_attributes(self, wf: WrappedViewT, vf: ViewFuncT) -> ViewPlan:
+      """Set common view attributes and compile the view's execution plan"""
       self._prepare(vf)
       schemas, djapy_inp_schema = self._get_schemas(vf)
 
@@ -266,3 +314,7 @@ class BaseDjapifyDecorator:
       # Set allowed methods
       wf.djapy_methods = [self.method] if isinstance(self.method, str) else self.method
       vf.djapy_methods = wf.djapy_methods
+
+      plan = build_view_plan(vf, wf.djapy_methods, wf.djapy_auth, djapy_inp_schema, schemas)
+      vf.djapy_plan = wf.djapy_plan = plan
+      return plan
@@ -1,11 +1,10 @@
-import json
 from functools import wraps
 
-from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest, HttpResponse, JsonResponse
 
 from .base_dec import BaseDjapifyDecorator
-from ..parser import RequestParser, ResponseParser
+from ..encoders import variant_key
+from ..trace import NULL_TRACE
 from ..view_func import WrappedViewT
 
 
@@ -14,67 +13,86 @@ class SyncDjapifyDecorator(BaseDjapifyDecorator):
       if view_func is None:
          return lambda v: self.__call__(v)
 
-      @wraps(view_func)
-      def wrapped_view(request: HttpRequest, *args, **kwargs):
-         # Lazy preparation - only prepare once
-         if not hasattr(view_func, 'djapy_prepared'):
-            self._prepare(view_func)
-            view_func.djapy_prepared = True
-
+      def dispatch(request: HttpRequest, trace, *args, **kwargs):
+         trace.enter("access")
          # Fast access check
-         if msg := self.check_access(request, view_func, *args, **kwargs):
+         if msg := plan.check_access(request, *args, **kwargs):
             return msg
 
          try:
-            # Use optimized request parser with caching
-            req_p = RequestParser(request, view_func, kwargs)
-            data = req_p.parse_data()
+            trace.enter("input")
+            data = plan.parse_request(request, kwargs)
+
+            # Conditional GET: version functions run before the view body
+            validators = policy.validators(request, data) if (policy := plan.conditional_policy()) else None
+            if validators and (not_modified := validators.precondition(request)) is not None:
+               return not_modified
+
+            # Cached responses are keyed on the validated input
+            candidates = plan.encoder_candidates(request)
+            cache_key = plan.cache.key(request, data, variant_key(candidates)) if plan.cache else None
+            if cache_key and (cached := plan.cache.get(cache_key)) is not None:
+               return plan.finalize(request, cached, validators)
 
             # Inject response if needed
-            if view_func.djapy_resp_param:
-               response = HttpResponse(content_type="application/json")
-               data[view_func.djapy_resp_param.name] = response
-            else:
-               response = None
+            response = plan.inject_response(data)
 
             # Execute view function
+            trace.enter("view")
             content = view_func(request, *args, **data)
 
+            # Fast path: If already JsonResponse, return it
+            if isinstance(content, JsonResponse):
+               return content
+
             # Determine status and data
+            trace.enter("serialize")
             status = 200 if not isinstance(content, tuple) else content[0]
             response_data = content if not isinstance(content, tuple) else content[1]
 
-            # Fast path: If already JsonResponse, return it
-            if isinstance(content, JsonResponse):
-               return content
+            if status in plan.stream_statuses:
+               streaming = plan.stream_response(request, status, response_data, data, response)
+               return plan.finalize(request, streaming)
+
+            # Apply a `?fields=` selection to the serializer and a returned QuerySet
+            if selection := plan.select_fields(status, data):
+               response_data = selection.narrow(response_data)
+            response_data = plan.load_related(status, response_data, selection)
+
+            # Validate and serialize straight to bytes of the negotiated format
+            parser = plan.response_parser(request, status, response_data, data, selection)
+            rendered, media_type = parser.encode(candidates)
 
-            # Use optimized response parser
-            res_p = ResponseParser(
-               request=request,
-               status=status,
-               data=response_data,
-               schemas=view_func.schema,
-               input_data=data
-            )
-
-            # Parse with mode='json' for JSON serialization
-            result = res_p.parse_data(mode='json')
-            
             # Build response efficiently
             if response is None:
-               response = HttpResponse(content_type="application/json")
+               response = HttpResponse()
             response.status_code = status
-            # Use orjson if available for better performance, fallback to standard json
-            try:
-               import orjson
-               response.content = orjson.dumps(result)
-            except ImportError:
-               response.content = json.dumps(result, cls=DjangoJSONEncoder)
-            
-            return response
+            response.content = rendered
+            response["Content-Type"] = media_type
+
+            if cache_key:
+               plan.cache.set(cache_key, response)
+            return plan.finalize(request, response, validators)
 
          except Exception as exc:
+            trace.enter("error")
             return self.handle_error(request, exc)
 
-      self._set_common_attributes(wrapped_view, view_func)
+      def traced(request: HttpRequest, *args, **kwargs):
+         # Sampled requests are traced, the others get a no-op trace
+         if (trace := plan.start_trace()) is None:
+            return dispatch(request, NULL_TRACE, *args, **kwargs)
+         with trace:
+            response = dispatch(request, trace, *args, **kwargs)
+         return trace.finish(request, response)
+
+      @wraps(view_func)
+      def wrapped_view(request: HttpRequest, *args, **kwargs):
+         if (profile := plan.start_profile(request)) is None:
+            return traced(request, *args, **kwargs)
+         with profile:
+            response = traced(request, *args, **kwargs)
+         return profile.finish(response)
+
+      plan = self._set_common_attributes(wrapped_view, view_func)
       return wrapped_view
@@ -0,0 +1,257 @@
+__all__ = [
+   'Encoder', 'JSONEncoder', 'NDJSONEncoder', 'CSVEncoder', 'MsgPackEncoder',
+   'EncoderRegistry', 'encoders', 'register_encoder', 'variant_key'
+]
+
+import csv
+import inspect
+from abc import ABC, abstractmethod
+import io
+import threading
+from collections.abc import Mapping
+from types import UnionType
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, get_args, get_origin, is_typeddict
+
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
+
+from djapy.core.serializers import ResponseSerializer
+
+try:
+   import msgpack
+except ImportError:
+   msgpack = None
+
+
+def _is_list_schema(schema: Any) -> bool:
+   return get_origin(schema) in (list, List, tuple, Tuple, set, frozenset)
+
+
+def _is_record(annotation: Any) -> bool:
+   """Whether values of `annotation` are field/value records, a model or a mapping."""
+   if get_origin(annotation) in (Union, UnionType):
+      return all(_is_record(arg) for arg in get_args(annotation) if arg is not type(None))
+   if is_typeddict(annotation):
+      return True
+   origin = get_origin(annotation) or annotation
+   return inspect.isclass(origin) and issubclass(origin, (BaseModel, Mapping))
+
+
+class Encoder(ABC):
+   """
+   A response body format, and optionally the matching request body format.
+
+   `encode` receives the response serializer and the already validated value; `decode`
+   turns a request body into Python data that is then validated like a decoded JSON body.
+   `decode_errors` are the exceptions `decode` raises for malformed bodies, answered with 400.
+   """
+   media_type: str = "application/octet-stream"
+   aliases: Sequence[str] = ()
+   can_decode: bool = False
+   decode_errors: Tuple[type, ...] = (ValueError,)
+
+   def supports(self, schema: Any) -> bool:
+      """Whether responses or bodies of `schema` can be represented in this format."""
+      return True
+
+   @abstractmethod
+   def encode(self, serializer: ResponseSerializer, value: Any) -> bytes:
+      pass
+
+   @abstractmethod
+   def decode(self, body: bytes) -> Any:
+      pass
+
+   @property
+   def media_types(self) -> Tuple[str, ...]:
+      return (self.media_type, *self.aliases)
+
+
+class JSONEncoder(Encoder):
+   """The default format, serialized by pydantic-core straight to bytes."""
+   media_type = "application/json"
+   can_decode = True
+
+   def encode(self, serializer: ResponseSerializer, value: Any) -> bytes:
+      return serializer.to_json(value)
+
+   def decode(self, body: bytes) -> Any:
+      return from_json(body) if body.strip() else {}
+
+
+class NDJSONEncoder(Encoder):
+   """One JSON document per line, for list responses."""
+   media_type = "application/x-ndjson"
+   aliases = ("application/jsonlines",)
+   can_decode = True
+
+   def supports(self, schema: Any) -> bool:
+      return _is_list_schema(schema)
+
+   def encode(self, serializer: ResponseSerializer, value: Any) -> bytes:
+      return b"".join(to_json(item) + b"\n" for item in serializer.to_python(value, mode="json"))
+
+   def decode(self, body: bytes) -> Any:
+      return [from_json(line) for line in body.splitlines() if line.strip()]
+
+
+class CSVEncoder(Encoder):
+   """Comma separated values for flat list responses, one column per field."""
+   media_type = "text/csv"
+   can_decode = True
+   decode_errors = (ValueError, csv.Error)
+
+   def supports(self, schema: Any) -> bool:
+      # Rows need columns: lists of models or mappings only
+      return _is_list_schema(schema) and all(_is_record(arg) for arg in get_args(schema) if arg is not Ellipsis)
+
+   @staticmethod
+   def _cell(value: Any) -> Any:
+      if value is None:
+         return ""
+      if isinstance(value, bool):
+         # Spelled as in JSON, not as Python's True/False
+         return "true" if value else "false"
+      if isinstance(value, (dict, list)):
+         # Nested values don't flatten, keep them as JSON text
+         return to_json(value).decode()
+      return value
+
+   def encode(self, serializer: ResponseSerializer, value: Any) -> bytes:
+      rows = serializer.to_python(value, mode="json")
+      header: Dict[str, None] = {}
+      for row in rows:
+         header.update(dict.fromkeys(row))
+      out = io.StringIO()
+      writer = csv.DictWriter(out, fieldnames=list(header), lineterminator="\n")
+      writer.writeheader()
+      writer.writerows({key: self._cell(cell) for key, cell in row.items()} for row in rows)
+      return out.getvalue().encode()
+
+   def decode(self, body: bytes) -> Any:
+      return list(csv.DictReader(io.StringIO(body.decode())))
+
+
+class MsgPackEncoder(Encoder):
+   """MessagePack, available when `msgpack` is installed."""
+   media_type = "application/msgpack"
+   aliases = ("application/x-msgpack",)
+   can_decode = True
+   decode_errors = (ValueError, msgpack.UnpackException) if msgpack is not None else (ValueError,)
+
+   def encode(self, serializer: ResponseSerializer, value: Any) -> bytes:
+      return msgpack.packb(serializer.to_python(value, mode="json"))
+
+   def decode(self, body: bytes) -> Any:
+      return msgpack.unpackb(body) if body else {}
+
+
+def _media_ranges(header: str) -> List[Tuple[str, float]]:
+   ranges = []
+   for part in header.split(","):
+      media_range, *params = part.split(";")
+      media_range = media_range.strip().lower()
+      if not media_range:
+         continue
+      q = 1.0
+      for param in params:
+         name, _, value = param.strip().partition("=")
+         if name.lower() == "q":
+            try:
+               q = float(value)
+            except ValueError:
+               q = 0.0
+      ranges.append((media_range, q))
+   return ranges
+
+
+def _quality(media_type: str, ranges: List[Tuple[str, float]]) -> float:
+   """q-value of `media_type`, taken from the most specific matching range."""
+   main_type = media_type.split("/")[0]
+   best, specificity = 0.0, -1
+   for media_range, q in ranges:
+      if media_range == media_type:
+         rank = 2
+      elif media_range == f"{main_type}/*":
+         rank = 1
+      elif media_range == "*/*":
+         rank = 0
+      else:
+         continue
+      if rank > specificity:
+         best, specificity = q, rank
+   return best
+
+
+class EncoderRegistry:
+   """
+   Registered response/request body formats, in server preference order.
+
+   The first registered encoder (JSON) is the default: it answers requests without an
+   `Accept` header and requests whose acceptable formats can't represent the response.
+   """
+
+   def __init__(self):
+      self._encoders: List[Encoder] = []
+      self._by_media_type: Dict[str, Encoder] = {}
+      self._candidates: Dict[str, Tuple[Encoder, ...]] = {}
+      self._lock = threading.Lock()
+
+   def register(self, encoder: Encoder) -> Encoder:
+      """Register an encoder, replacing any registered for the same media type."""
+      with self._lock:
+         self._encoders = [e for e in self._encoders if e.media_type != encoder.media_type] + [encoder]
+         self._by_media_type = {media_type: e for e in self._encoders for media_type in e.media_types}
+         self._candidates.clear()
+      return encoder
+
+   @property
+   def default(self) -> Encoder:
+      return self._encoders[0]
+
+   def __iter__(self):
+      return iter(tuple(self._encoders))
+
+   def get(self, media_type: str) -> Optional[Encoder]:
+      return self._by_media_type.get(media_type.lower())
+
+   def candidates(self, accept: str) -> Tuple[Encoder, ...]:
+      """Encoders acceptable for an `Accept` header, best first."""
+      try:
+         return self._candidates[accept]
+      except KeyError:
+         pass
+      if not accept:
+         result = (self.default,)
+      else:
+         ranges = _media_ranges(accept)
+         scored = [(max(_quality(m, ranges) for m in e.media_types), i, e) for i, e in enumerate(self._encoders)]
+         result = tuple(e for q, i, e in sorted(scored, key=lambda s: (-s[0], s[1])) if q > 0)
+      if len(self._candidates) < 256:
+         self._candidates[accept] = result
+      return result
+
+   def select(self, candidates: Sequence[Encoder], schema: Any) -> Encoder:
+      return next((e for e in candidates if e.supports(schema)), self.default)
+
+   def decoder(self, content_type: Optional[str]) -> Optional[Encoder]:
+      """Decoder for a request body; None for JSON and unknown types, which take the JSON path."""
+      encoder = self.get(content_type or "")
+      if encoder is None or encoder is self.default or not encoder.can_decode:
+         return None
+      return encoder
+
+
+def variant_key(candidates: Sequence[Encoder]) -> str:
+   """Identify a negotiation outcome, e.g. for cache keys."""
+   return ",".join(encoder.media_type for encoder in candidates)
+
+
+encoders = EncoderRegistry()
+register_encoder = encoders.register
+
+encoders.register(JSONEncoder())
+encoders.register(NDJSONEncoder())
+encoders.register(CSVEncoder())
+if msgpack is not None:
+   encoders.register(MsgPackEncoder())
@@ -0,0 +1,171 @@
+__all__ = [
+   'ErrorHandlerIndex', 'ErrorHandlerRegistry', 'error_handlers', 'register_error_handler',
+   'handler_result_to_response'
+]
+
+import importlib
+import inspect
+import logging
+import threading
+import types
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union, get_args, get_origin
+
+from django.core.signals import setting_changed
+from django.http import JsonResponse
+
+from djapy.core.conf import djapy_setting
+
+ERROR_HANDLER_PREFIX = "handle_"
+
+ErrorHandler = Callable[..., Any]
+
+
+def _handled_exceptions(handler: ErrorHandler) -> tuple:
+   """Exception classes a handler declares through its `exception` parameter annotation."""
+   try:
+      exc_param = inspect.signature(handler).parameters.get('exception')
+   except (TypeError, ValueError):
+      return ()
+   if exc_param is None:
+      return ()
+   annotation = exc_param.annotation
+   if get_origin(annotation) is Union or isinstance(annotation, types.UnionType):
+      candidates = get_args(annotation)
+   else:
+      candidates = (annotation,)
+   return tuple(c for c in candidates if inspect.isclass(c) and issubclass(c, BaseException))
+
+
+class ErrorHandlerIndex:
+   """
+   Exception class -> handler index, compiled once from a list of `handle_*` functions.
+
+   Lookups walk the exception's MRO, so a handler for `LookupError` also handles `KeyError`,
+   and the outcome is cached per exception class. When several handlers claim the same
+   class the first one wins.
+   """
+
+   def __init__(self, handlers: Iterable[ErrorHandler] = ()):
+      self._index: Dict[type, ErrorHandler] = {}
+      self._resolved: Dict[type, Optional[ErrorHandler]] = {}
+      for handler in handlers:
+         self.add(handler)
+
+   def add(self, handler: ErrorHandler, override: bool = False) -> None:
+      exc_classes = _handled_exceptions(handler)
+      if not exc_classes:
+         logging.warning(
+            f"Error handler `{getattr(handler, '__name__', handler)}` has no `exception` parameter "
+            f"annotated with an exception class, it will never be called"
+         )
+      for exc_class in exc_classes:
+         if override:
+            self._index[exc_class] = handler
+         else:
+            self._index.setdefault(exc_class, handler)
+      self._resolved.clear()
+
+   def resolve(self, exc_class: type) -> Optional[ErrorHandler]:
+      """Return the handler for the closest class in `exc_class.__mro__`, if any."""
+      try:
+         return self._resolved[exc_class]
+      except KeyError:
+         pass
+      handler = next((self._index[cls] for cls in exc_class.__mro__ if cls in self._index), None)
+      self._resolved[exc_class] = handler
+      return handler
+
+   def __bool__(self) -> bool:
+      return bool(self._index)
+
+   def __len__(self) -> int:
+      return len(self._index)
+
+
+def _load_module_handlers(module_path: Optional[str]) -> List[ErrorHandler]:
+   if not module_path:
+      return []
+   try:
+      module = importlib.import_module(module_path)
+   except ImportError:
+      return []
+   return [getattr(module, name) for name in dir(module) if name.startswith(ERROR_HANDLER_PREFIX)]
+
+
+class ErrorHandlerRegistry:
+   """
+   Process-wide error handlers shared by every djapified view.
+
+   Handlers come from the `handle_*` functions of the `DJAPY_ERROR_HANDLER_MODULE` module
+   (``djapy_ext.errorhandler`` by default), imported lazily on the first error, and from
+   explicit `register` calls, which take precedence over module handlers.
+   """
+
+   def __init__(self):
+      self._registered: List[ErrorHandler] = []
+      self._index: Optional[ErrorHandlerIndex] = None
+      self._lock = threading.Lock()
+
+   @property
+   def index(self) -> ErrorHandlerIndex:
+      if self._index is None:
+         with self._lock:
+            if self._index is None:
+               index = ErrorHandlerIndex(_load_module_handlers(djapy_setting("DJAPY_ERROR_HANDLER_MODULE")))
+               for handler in self._registered:
+                  index.add(handler, override=True)
+               self._index = index
+      return self._index
+
+   def register(self, handler: ErrorHandler) -> ErrorHandler:
+      """Register a handler; usable as a decorator."""
+      with self._lock:
+         self._registered.append(handler)
+         if self._index is not None:
+            self._index.add(handler, override=True)
+      return handler
+
+   def unregister(self, handler: ErrorHandler) -> None:
+      with self._lock:
+         self._registered.remove(handler)
+         self._index = None
+
+   def resolve(self, exc_class: type) -> Optional[ErrorHandler]:
+      return self.index.resolve(exc_class)
+
+   def reset(self) -> None:
+      """Forget the loaded module handlers; they are imported again on next use."""
+      self._index = None
+
+   def __bool__(self) -> bool:
+      return bool(self.index)
+
+
+error_handlers = ErrorHandlerRegistry()
+register_error_handler = error_handlers.register
+
+
+def _reset_on_module_change(*, setting: str, **kwargs) -> None:
+   if setting == "DJAPY_ERROR_HANDLER_MODULE":
+      error_handlers.reset()
+
+
+setting_changed.connect(_reset_on_module_change)
+
+
+def handler_result_to_response(result: Any) -> Optional[JsonResponse]:
+   """
+   Turn a handler's return value into a response.
+
+   Handlers may return a `JsonResponse`, a `(status, dict)` tuple or a dict (sent with
+   status 400). Anything else falls through to djapy's default error handling.
+   """
+   if isinstance(result, JsonResponse):
+      return result
+   if isinstance(result, tuple):
+      status, response = result
+   else:
+      status, response = 400, result
+   if isinstance(response, dict):
+      return JsonResponse(response, status=status)
+   return None
@@ -0,0 +1,213 @@
+__all__ = ['FieldSelection', 'FieldSelector', 'djapy_fields', 'parse_fields', 'prune_schema']
+
+import asyncio
+import inspect
+import types
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Annotated, Any, Callable, Dict, Optional, Tuple, Union, get_args, get_origin
+
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from pydantic import BaseModel, Field, create_model
+from pydantic_core import PydanticCustomError
+
+from djapy.core.orm import narrow_queryset
+from djapy.core.related import is_many, models_in, resource_model
+from djapy.core.response import create_validation_error
+from djapy.core.serializers import ResponseSerializer
+from djapy.core.view_func import ViewFuncT
+
+# Unselected fields read from this attribute, which no object has, so they're never loaded
+UNSELECTED_ALIAS = "__djapy_unselected__"
+
+# {name: True} for whole fields, {name: subtree} for nested selections; frozen to be hashable
+FieldTree = frozenset
+
+
+def parse_fields(spec: str) -> FieldTree:
+   """Parse `title,owner.username` into a field tree."""
+   tree: Dict[str, Any] = {}
+   for path in spec.split(","):
+      if not (path := path.strip()):
+         continue
+      node = tree
+      *parents, leaf = path.split(".")
+      for name in parents:
+         child = node.setdefault(name, {})
+         if child is True:
+            break
+         node = child
+      else:
+         node[leaf] = True
+   return _freeze(tree)
+
+
+def _freeze(tree: dict) -> FieldTree:
+   return frozenset((name, True if sub is True else _freeze(sub)) for name, sub in tree.items())
+
+
+def _unknown_field(name: str, model: type) -> PydanticCustomError:
+   return PydanticCustomError(
+      "unknown_field", "Unknown field `{field}` of {model}", {"field": name, "model": model.__name__}
+   )
+
+
+def _replace(annotation: Any, old: type, new: type) -> Any:
+   """Rebuild a type annotation with `old` swapped for `new`, e.g. `List[old] -> List[new]`."""
+   if annotation is old:
+      return new
+   args = get_args(annotation)
+   if not args:
+      return annotation
+   origin = get_origin(annotation)
+   if origin is Annotated:
+      return Annotated[(_replace(args[0], old, new), *annotation.__metadata__)]
+   replaced = tuple(_replace(arg, old, new) for arg in args)
+   if origin is Union or isinstance(annotation, types.UnionType):
+      return Union[replaced]
+   return origin[replaced if len(replaced) > 1 else replaced[0]]
+
+
+@lru_cache(maxsize=256)
+def _prune_model(model: type, tree: FieldTree) -> Tuple[type, dict]:
+   """
+   Subclass of `model` where unselected fields are neither read, validated nor dumped.
+
+   Returns the subclass and the matching `include` tree for dumping, which also trims
+   computed fields. Selecting a computed field keeps `model` whole, as it may read any
+   field; only the dump is trimmed then.
+   """
+   names = {}
+   for name, field in model.model_fields.items():
+      names[name] = names[field.serialization_alias or field.alias or name] = name
+   for name in model.model_computed_fields:
+      names[name] = name
+
+   computed = any(names.get(key) in model.model_computed_fields for key, _ in tree)
+   overrides, include = {}, {}
+   for key, sub in tree:
+      if (name := names.get(key)) is None:
+         raise create_validation_error("Fields", "fields", _unknown_field(key, model))
+      if sub is True:
+         include[name] = True
+         continue
+      field = model.model_fields.get(name)
+      nested = models_in(field.annotation) if field else []
+      if len(nested) != 1:
+         raise create_validation_error("Fields", "fields", _unknown_field(f"{key}.{next(iter(sub))[0]}", model))
+      pruned, sub_include = _prune_model(nested[0], sub)
+      overrides[name] = (_replace(field.annotation, nested[0], pruned), field)
+      include[name] = {"__all__": sub_include} if is_many(field.annotation) else sub_include
+
+   if computed:
+      return model, include
+   for name in model.model_fields:
+      if name not in include:
+         overrides[name] = (Any, Field(None, validation_alias=UNSELECTED_ALIAS, exclude=True, validate_default=False))
+   pruned = create_model(model.__name__, __base__=model, __module__=model.__module__, **overrides)
+   return pruned, include
+
+
+def prune_schema(schema: Any, tree: FieldTree) -> Tuple[Any, dict]:
+   """Prune a response schema, a model or a type holding one model such as `List[Model]`."""
+   if inspect.isclass(schema) and issubclass(schema, BaseModel):
+      return _prune_model(schema, tree)
+   models = models_in(schema)
+   if len(models) != 1:
+      raise create_validation_error("Fields", "fields", PydanticCustomError(
+         "fields_unsupported", "Field selection isn't supported by this response"
+      ))
+   pruned, include = _prune_model(models[0], tree)
+   return _replace(schema, models[0], pruned), {"__all__": include} if is_many(schema) else include
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSelection:
+   """Serializer of a pruned response schema, and the pruned schema and selection of one object."""
+   serializer: ResponseSerializer
+   resource_schema: Optional[type]
+   resource_include: dict
+
+   def narrow(self, data: Any) -> Any:
+      """Narrow a returned QuerySet to the selected columns and relations."""
+      if isinstance(data, QuerySet):
+         return narrow_queryset(data, self.resource_include)
+      return data
+
+
+class FieldSelector:
+   """
+   Per-view `?fields=` support, compiled lazily per status and field selection.
+
+   For paginated views the selection applies to the page `items`, the pagination fields are
+   always sent.
+   """
+
+   max_selections = 256
+
+   def __init__(self, param: str, response_schemas: dict, wrapped_status: Optional[int] = None):
+      self.param = param
+      self.response_schemas = response_schemas
+      self.wrapped_status = wrapped_status
+      self._selections: Dict[tuple, FieldSelection] = {}
+
+   def select(self, status: int, input_data: dict) -> Optional[FieldSelection]:
+      if not (spec := input_data.get(self.param)) or status not in self.response_schemas:
+         return None
+      try:
+         return self._selections[(status, spec)]
+      except KeyError:
+         pass
+      selection = self._build(status, parse_fields(spec))
+      if len(self._selections) >= self.max_selections:
+         self._selections.clear()
+      self._selections[(status, spec)] = selection
+      return selection
+
+   def _build(self, status: int, tree: FieldTree) -> FieldSelection:
+      schema = self.response_schemas[status]
+      if status == self.wrapped_status:
+         # Keep every pagination field, select inside `items`
+         keep = {*schema.model_fields, *schema.model_computed_fields} - {"items"}
+         pruned, include = prune_schema(schema, frozenset({*((name, True) for name in keep), ("items", tree)}))
+         resource_include = include["items"]
+      else:
+         pruned, include = prune_schema(schema, tree)
+         resource_include = include
+      resource_include = resource_include.get("__all__", resource_include)
+      return FieldSelection(
+         ResponseSerializer(pruned, include=include),
+         resource_model(pruned, wrapped=status == self.wrapped_status),
+         resource_include
+      )
+
+
+def djapy_fields(param: str = "fields") -> Callable[[ViewFuncT], ViewFuncT]:
+   """
+   Let clients pick response fields with `?fields=title,owner.username`.
+
+   Unselected fields are skipped by validation and serialization, and a returned QuerySet is
+   narrowed with `.only()` and stripped of unused `select_related`/`prefetch_related`.
+   """
+
+   def decorator(view_func: ViewFuncT):
+      if asyncio.iscoroutinefunction(view_func):
+         @wraps(view_func)
+         async def _wrapped_view(request: HttpRequest, *args, **kwargs):
+            kwargs.pop(param, None)
+            return await view_func(request, *args, **kwargs)
+      else:
+         @wraps(view_func)
+         def _wrapped_view(request: HttpRequest, *args, **kwargs):
+            kwargs.pop(param, None)
+            return view_func(request, *args, **kwargs)
+
+      _wrapped_view.extra_query_dict = {
+         **getattr(view_func, "extra_query_dict", {}),
+         param: (Optional[str], None),
+      }
+      _wrapped_view.djapy_fields = param
+      return _wrapped_view
+
+   return decorator
@@ -0,0 +1,129 @@
+__all__ = ['MetricsRegistry', 'metrics']
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from django.http import HttpRequest, HttpResponse
+from django.urls import path
+
+from djapy.core.conf import djapy_setting
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shard:
+   """Metrics recorded by one thread; only that thread writes to it."""
+   __slots__ = ("buckets", "sums", "responses")
+
+   def __init__(self):
+      self.buckets: Dict[Tuple[str, str], List[int]] = {}
+      self.sums: Dict[Tuple[str, str], float] = {}
+      self.responses: Counter = Counter()
+
+
+def _label(value: str) -> str:
+   return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+   """
+   Per-view, per-stage latency histograms of djapified views, enabled by `DJAPY_METRICS`.
+
+   Every thread records into its own shard without locking; shards are merged when scraped.
+   Mount `metrics.urls` next to `openapi.urls` to expose them in Prometheus text format, and
+   protect that route like any other internal endpoint.
+   """
+
+   def __init__(self):
+      self._local = threading.local()
+      self._shards: List[_Shard] = []
+      self._lock = threading.Lock()
+      self._bounds: Tuple[float, ...] = ()
+
+   @property
+   def bounds(self) -> Tuple[float, ...]:
+      """Histogram bucket upper bounds in seconds, fixed on first use until `clear`."""
+      if not self._bounds:
+         self._bounds = tuple(sorted(djapy_setting("DJAPY_METRICS_BUCKETS")))
+      return self._bounds
+
+   def _shard(self) -> _Shard:
+      try:
+         return self._local.shard
+      except AttributeError:
+         shard = self._local.shard = _Shard()
+         with self._lock:
+            self._shards.append(shard)
+         return shard
+
+   def observe(self, view: str, status: int, stages: Dict) -> None:
+      """Record one response and the duration (a `StageStats`, in milliseconds) of its stages."""
+      shard, bounds = self._shard(), self.bounds
+      for stage, stats in stages.items():
+         seconds = stats.duration / 1000
+         key = (view, stage)
+         if (counts := shard.buckets.get(key)) is None:
+            counts = shard.buckets[key] = [0] * (len(bounds) + 1)
+            shard.sums[key] = 0.0
+         counts[bisect_left(bounds, seconds)] += 1
+         shard.sums[key] += seconds
+      shard.responses[(view, status)] += 1
+
+   def collect(self) -> Tuple[Dict[Tuple[str, str], List[int]], Dict[Tuple[str, str], float], Counter]:
+      """Merge every thread's shard into (bucket counts, sums, response counts)."""
+      with self._lock:
+         shards = list(self._shards)
+      buckets, sums, responses = {}, {}, Counter()
+      for shard in shards:
+         for key, counts in list(shard.buckets.items()):
+            merged = buckets.setdefault(key, [0] * len(counts))
+            for i, count in enumerate(counts):
+               merged[i] += count
+            sums[key] = sums.get(key, 0.0) + shard.sums.get(key, 0.0)
+         responses.update(dict(shard.responses))
+      return buckets, sums, responses
+
+   def clear(self) -> None:
+      with self._lock:
+         self._shards = []
+         self._local = threading.local()
+         self._bounds = ()
+
+   def render(self) -> str:
+      """The metrics in Prometheus text exposition format."""
+      buckets, sums, responses = self.collect()
+      bounds = [*(repr(float(bound)) for bound in self.bounds), "+Inf"]
+      lines = [
+         "# HELP djapy_stage_duration_seconds Time spent in each stage of the djapy request pipeline.",
+         "# TYPE djapy_stage_duration_seconds histogram",
+      ]
+      for (view, stage), counts in sorted(buckets.items()):
+         labels = f'view="{_label(view)}",stage="{_label(stage)}"'
+         cumulative = 0
+         for bound, count in zip(bounds, counts):
+            cumulative += count
+            lines.append(f'djapy_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+         lines.append(f"djapy_stage_duration_seconds_sum{{{labels}}} {sums[(view, stage)]!r}")
+         lines.append(f"djapy_stage_duration_seconds_count{{{labels}}} {cumulative}")
+      lines += [
+         "# HELP djapy_responses_total Responses of djapified views by status code.",
+         "# TYPE djapy_responses_total counter",
+      ]
+      for (view, status), count in sorted(responses.items()):
+         lines.append(f'djapy_responses_total{{view="{_label(view)}",status="{status}"}} {count}')
+      return "\n".join(lines) + "\n"
+
+   def metrics_view(self, request: HttpRequest) -> HttpResponse:
+      return HttpResponse(self.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+   def get_urls(self):
+      return [path('', self.metrics_view, name='metrics')]
+
+   @property
+   def urls(self):
+      return self.get_urls(), "djapy-metrics", "djapy-metrics"
+
+
+metrics = MetricsRegistry()
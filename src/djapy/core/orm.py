@@ -0,0 +1,67 @@
+__all__ = ['narrow_queryset', 'related_paths']
+
+from typing import Any, Iterator
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+
+
+def related_paths(select_related: Any, prefix: str = "") -> Iterator[str]:
+   """Flatten `Query.select_related` (a nested dict) into `a__b` lookups."""
+   for name, nested in select_related.items():
+      path = f"{prefix}{name}"
+      if nested:
+         yield from related_paths(nested, f"{path}__")
+      else:
+         yield path
+
+
+def _prefetch_path(lookup: Any) -> str:
+   return getattr(lookup, "prefetch_through", lookup)
+
+
+def narrow_queryset(queryset: QuerySet, include: dict) -> QuerySet:
+   """
+   Restrict a QuerySet to what a field selection needs.
+
+   Relations outside the selection are dropped from `select_related`/`prefetch_related`.
+   Columns are narrowed with `.only()` when every selected name is a model field; selecting
+   a property or computed field keeps all columns, as it may read any of them. Sliced,
+   fetched and combined (`union()` and co.) querysets can't be narrowed and are left as is.
+   """
+   if queryset.query.is_sliced or queryset.query.combinator or queryset._result_cache is not None:
+      return queryset
+
+   opts = queryset.model._meta
+   columns, relations, exact = [], set(), True
+   for name in include:
+      try:
+         field = opts.get_field(name)
+      except FieldDoesNotExist:
+         exact = False
+         continue
+      if not field.is_relation:
+         columns.append(name)
+      else:
+         relations.add(name)
+         if field.concrete and (field.many_to_one or field.one_to_one):
+            # The foreign key column, needed to follow the relation
+            columns.append(name)
+
+   select_related = queryset.query.select_related
+   if select_related is True:
+      # Every non-null foreign key is followed, none of them may be deferred
+      exact = False
+   elif isinstance(select_related, dict):
+      kept = [path for path in related_paths(select_related) if path.split("__")[0] in relations]
+      queryset = queryset.select_related(None)
+      if kept:
+         queryset = queryset.select_related(*kept)
+   lookups = queryset._prefetch_related_lookups
+   if lookups:
+      kept = [lookup for lookup in lookups if _prefetch_path(lookup).split("__")[0] in relations]
+      queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+   if exact and columns:
+      queryset = queryset.only(*columns)
+   return queryset
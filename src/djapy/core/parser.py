@@ -2,19 +2,21 @@ import inspect
 import types
 import typing
 from multiprocessing.spawn import prepare
-from typing import Dict, Any, Union, Type, Optional, get_origin, get_args, Generic
+from typing import Dict, Any, Union, Type, Optional, Hashable, Tuple, get_origin, get_args, Generic
 from abc import ABC, abstractmethod
-from functools import lru_cache
 import json
 
 from asgiref.sync import sync_to_async
 from pydantic import create_model, BaseModel, TypeAdapter
+from pydantic_core import PydanticCustomError, from_json
 from django.http import HttpRequest
 from django.http.request import RawPostDataException
 
 from djapy.schema import Schema
 from .d_types import dyp
 from .response import create_validation_error
+from .encoders import Encoder, encoders
+from .serializers import ResponseSerializer, response_serializers
 from .labels import (
    RESPONSE_OUTPUT_SCHEMA_NAME,
    JSON_OUTPUT_PARSE_NAME,
@@ -23,7 +25,33 @@ from .labels import (
 )
 from .type_check import schema_type
 from .view_func import WrappedViewT
-from ..schema.schema import get_json_dict
+from ..schema.schema import CombinedInputSchema
+
+
+_json_adapter = TypeAdapter(Any)
+
+
+def load_json_body(body: bytes) -> Any:
+   """Decode a JSON request body, an empty body being an empty object."""
+   if not body.strip():
+      return {}
+   try:
+      return from_json(body)
+   except ValueError:
+      # Re-run through pydantic for a `json_invalid` error that carries a printable input
+      return _json_adapter.validate_json(body.decode(errors="replace"))
+
+
+def decode_body(decoder: Encoder, body: bytes) -> Any:
+   """Decode a request body of a non-JSON format, malformed bodies being validation errors."""
+   if not body.strip():
+      return {}
+   try:
+      return decoder.decode(body)
+   except decoder.decode_errors:
+      raise create_validation_error("Body", "body", PydanticCustomError(
+         "body_invalid", "Invalid {media_type} body", {"media_type": decoder.media_type}
+      )) from None
 
 
 class BaseParser(ABC):
@@ -34,13 +62,13 @@ class BaseParser(ABC):
       self._context = {"request": request}
       self._body = None
 
-   def _get_body(self) -> str:
-      """Safely get request body."""
+   def _get_body(self) -> bytes:
+      """Safely get the raw request body, without decoding or copying it."""
       if self._body is None:
          try:
-            self._body = self.request.body.decode()
+            self._body = self.request.body
          except RawPostDataException:
-            self._body = "{}"
+            self._body = b""
       return self._body
 
    def _validate_schema(self, schema: Type[Schema], data: dict, extra_context: dict = None) -> dict:
@@ -59,21 +87,17 @@ class BaseParser(ABC):
 class RequestParser(BaseParser):
    """Optimized request parser with Pydantic V2 performance features."""
 
-   def __init__(self, request: HttpRequest, view_func: WrappedViewT, view_kwargs: dict):
+   def __init__(
+     self,
+     request: HttpRequest,
+     view_func: WrappedViewT,
+     view_kwargs: dict,
+     schemas: Optional[dyp.inp_schema] = None
+   ):
       super().__init__(request)
       self.view_func = view_func
       self.view_kwargs = view_kwargs
-      self.schemas = view_func.djapy_inp_schema
-      self._type_adapters = self._get_type_adapters()
-
-   @lru_cache(maxsize=1)
-   def _get_type_adapters(self) -> dict:
-      """Cache TypeAdapters for better performance."""
-      return {
-         "query": TypeAdapter(self.schemas["query"]),
-         "data": TypeAdapter(self.schemas["data"]),
-         "form": TypeAdapter(self.schemas["form"])
-      }
+      self.schemas = schemas if schemas is not None else view_func.djapy_inp_schema
 
    def parse_data(self) -> dict:
       """Parse and validate request data with optimizations."""
@@ -83,28 +107,18 @@ class RequestParser(BaseParser):
          dict(self.request.POST),
       )
 
-      # Then handle JSON body - use fast JSON parsing
+      # Then handle JSON body, handing the raw bytes to pydantic-core exactly once
       body_data = {}
-      if not self.schemas["data"].is_empty():
-         body_str = self._get_body()
-         if not body_str or not body_str.strip():
-            # Empty body but schema expects data — validate empty dict to get proper error
-            body_data = self._validate_schema(self.schemas["data"], {})
-         elif body_str and body_str.strip():  # Check for non-empty
-            try:
-               # Fast path: use model_validate_json for better performance
-               body_bytes = body_str.encode('utf-8')
-               validated = self.schemas["data"].model_validate_json(
-                  body_bytes,
-                  context=self._context
-               )
-               body_data = validated.__dict__
-            except Exception:
-               # Fallback to dict parsing
-               body_data = self._validate_schema(
-                  self.schemas["data"],
-                  get_json_dict(body_str),
-               )
+      data_schema = self.schemas["data"]
+      if not data_schema.is_empty():
+         body = self._get_body()
+         if decoder := encoders.decoder(self.request.content_type):
+            body_data = self._validate_schema(data_schema, decode_body(decoder, body))
+         elif data_schema._single() or not body.strip():
+            # A single schema param takes the whole body, so it's decoded once and wrapped
+            body_data = self._validate_schema(data_schema, load_json_body(body))
+         else:
+            body_data = data_schema.model_validate_json(body, context=self._context).__dict__
 
       # Finally handle query params
       query = self.schemas["query"].model_validate({
@@ -118,6 +132,22 @@ class RequestParser(BaseParser):
          **form,
       }
 
+   def parse_combined(self, schema: Type[CombinedInputSchema]) -> dict:
+      """Validate every input source of the request in a single pass."""
+      # Every value of a repeated key; fields taking one value are unwrapped by the schema
+      source = {
+         "query": dict(self.request.GET.lists()),
+         "path": self.view_kwargs,
+         "form": dict(self.request.POST.lists()),
+      }
+      if schema.cvar_reads_body:
+         body = self._get_body()
+         if decoder := encoders.decoder(self.request.content_type):
+            source["body"] = decode_body(decoder, body)
+         else:
+            source["body"] = load_json_body(body)
+      return schema.model_validate(source, context=self._context).__dict__
+
 
 class ResponseParser(BaseParser):
    """Optimized response parser with multiple serialization modes."""
@@ -128,31 +158,36 @@ class ResponseParser(BaseParser):
      status: int,
      data: Any,
      schemas: dyp.schema,
-     input_data: Optional[Dict[str, Any]] = None
+     input_data: Optional[Dict[str, Any]] = None,
+     owner: Optional[Hashable] = None,
+     serializer: Optional[ResponseSerializer] = None,
+     context: Optional[Dict[str, Any]] = None
    ):
       super().__init__(request)
+      if context:
+         self._context.update(context)
       self.status = status
       self.data = data
       self.input_data = input_data
+      self.owner = owner
+      self.serializer = serializer
 
       if not isinstance(schemas, dict):
          raise create_validation_error("Response", "schemas", "invalid_type")
       self.schemas = schemas
-      self._model_cache = {}
-
-   def _create_model(self) -> Type[BaseModel]:
-      """Create response model from schema (cached)."""
-      if self.status in self._model_cache:
-         return self._model_cache[self.status]
 
+   def _get_serializer(self) -> ResponseSerializer:
+      """Get the shared serializer for this status from the process-wide registry."""
+      if self.serializer is not None:
+         return self.serializer
       schema = self.schemas[self.status]
-      model = create_model(
-         RESPONSE_OUTPUT_SCHEMA_NAME,
-         **{JSON_OUTPUT_PARSE_NAME: (schema, ...)},
-         __base__=Schema
-      )
-      self._model_cache[self.status] = model
-      return model
+      owner = self.owner
+      if owner is None:
+         # Standalone parsers are keyed by the schema itself
+         if not isinstance(schema, Hashable):
+            return ResponseSerializer(schema)
+         owner = schema
+      return response_serializers.get(owner, self.status, schema)
 
    def parse_data(self, mode: str = "json") -> Dict[str, Any]:
       """Parse and validate response data with specified serialization mode.
@@ -161,7 +196,7 @@ class ResponseParser(BaseParser):
           mode: Serialization mode - 'json' or 'python' (default: 'json')
       """
       # Fast path: Direct Pydantic model
-      if isinstance(self.data, BaseModel):
+      if isinstance(self.data, BaseModel) and self.serializer is None:
          return self.data.model_dump(
             mode=mode,
             by_alias=True,
@@ -170,16 +205,27 @@ class ResponseParser(BaseParser):
          )
 
       # Standard validation path
-      model = self._create_model()
-      validated = model.model_validate(
-         {JSON_OUTPUT_PARSE_NAME: self.data},
-         context={**self._context, "input_data": self.input_data}
-      )
-      return validated.model_dump(
-         mode=mode,
-         by_alias=True,
-         exclude_unset=False
-      )[JSON_OUTPUT_PARSE_NAME]
+      serializer = self._get_serializer()
+      return serializer.to_python(self._validate(serializer), mode=mode)
+
+   def render(self, serializer: Optional[ResponseSerializer] = None) -> bytes:
+      """Validate the response data and serialize it directly to JSON bytes."""
+      if isinstance(self.data, BaseModel) and self.serializer is None:
+         return self.data.__pydantic_serializer__.to_json(self.data, by_alias=True)
+
+      serializer = serializer or self._get_serializer()
+      return serializer.to_json(self._validate(serializer))
+
+   def encode(self, candidates: Tuple[Encoder, ...] = ()) -> Tuple[bytes, str]:
+      """Render with the first acceptable encoder able to represent the schema, JSON otherwise."""
+      serializer = self._get_serializer()
+      encoder = encoders.select(candidates, serializer.schema)
+      if encoder is encoders.default:
+         return self.render(serializer), encoder.media_type
+      return encoder.encode(serializer, self._validate(serializer)), encoder.media_type
+
+   def _validate(self, serializer: ResponseSerializer) -> Any:
+      return serializer.validate(self.data, context={**self._context, "input_data": self.input_data})
 
 
 class AsyncRequestParser(RequestParser):
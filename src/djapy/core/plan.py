@@ -0,0 +1,249 @@
+__all__ = ['ViewPlan', 'build_view_plan']
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional, Tuple, Type, Union
+
+import django
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBase, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from djapy.core.auth import BaseAuthMechanism
+from djapy.core.cache import ViewCache
+from djapy.core.compression import CompressionPolicy
+from djapy.core.conditional import ConditionalPolicy, Validators
+from djapy.core.conf import djapy_setting
+from djapy.core.encoders import Encoder, encoders
+from djapy.core.fields import FieldSelection, FieldSelector
+from djapy.core.d_types import dyp
+from djapy.core.defaults import DEFAULT_METHOD_NOT_ALLOWED_MESSAGE
+from djapy.core.parser import RequestParser, ResponseParser
+from djapy.core.profiling import RequestProfile, start_profile
+from djapy.core.related import RelatedLoader
+from djapy.core.serializers import response_serializers
+from djapy.core.streaming import streaming_response
+from djapy.core.trace import RequestTrace, start_trace
+from djapy.core.view_func import ViewFuncT
+from djapy.schema.schema import CombinedInputSchema
+from djapy.schema.stream import is_stream_type
+
+# QuerySet.aiterator() refuses prefetch_related() before Django 5.0
+ASYNC_ITERATOR_PREFETCH = django.VERSION >= (5, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class ViewPlan:
+   """
+   Everything a djapified view needs at request time, compiled once at decoration time.
+
+   The decorators only read from the plan, so per-request work is limited to what the
+   request itself requires: no signature inspection, no schema or model creation.
+   """
+   view_func: ViewFuncT
+   view_id: str
+   methods: Optional[frozenset]
+   auth: Optional[BaseAuthMechanism]
+   authorize: bool
+   inp_schema: dyp.inp_schema
+   combined_input: Optional[Type[CombinedInputSchema]]
+   resp_param: Optional[str]
+   response_schemas: dyp.schema
+   response_context: MappingProxyType
+   stream_statuses: frozenset
+   cache: Optional[ViewCache]
+   conditional: Optional[ConditionalPolicy]
+   compression: Union[CompressionPolicy, bool, None]
+   fields: Optional[FieldSelector]
+   related: RelatedLoader
+
+   def check_access(self, request: HttpRequest, *args, **kwargs) -> Optional[JsonResponse]:
+      """Reject disallowed methods, then run authentication and authorization."""
+      if self.methods and request.method not in self.methods:
+         return JsonResponse(DEFAULT_METHOD_NOT_ALLOWED_MESSAGE, status=405)
+      if self.auth is None:
+         return None
+      if r := self.auth.authenticate(request, *args, **kwargs):
+         return JsonResponse(r[1], status=r[0])
+      if self.authorize:
+         if r := self.auth.authorize(request, *args, **kwargs):
+            return JsonResponse(r[1], status=r[0])
+      return None
+
+   def start_trace(self) -> Optional[RequestTrace]:
+      """Trace of this request when it's sampled, see `djapy.core.trace`."""
+      return start_trace(self.view_id)
+
+   def start_profile(self, request: HttpRequest) -> Optional[RequestProfile]:
+      """Profile of this request when it's selected, see `djapy.core.profiling`."""
+      return start_profile(self.view_id, self.view_func.__name__, request)
+
+   def conditional_policy(self) -> Optional[ConditionalPolicy]:
+      """The view's `djapy_condition`, or body-hash ETags when `DJAPY_ETAG` is on."""
+      if self.conditional is not None:
+         return self.conditional
+      return BODY_ETAG_POLICY if djapy_setting("DJAPY_ETAG") else None
+
+   def compression_policy(self) -> Optional[CompressionPolicy]:
+      """The view's `djapy_compress`, or the global policy when `DJAPY_COMPRESSION` is on."""
+      if self.compression is not None:
+         return self.compression or None
+      return DEFAULT_COMPRESSION_POLICY if djapy_setting("DJAPY_COMPRESSION") else None
+
+   @staticmethod
+   def encoder_candidates(request: HttpRequest) -> Tuple[Encoder, ...]:
+      """Response formats acceptable to the client, best first."""
+      return encoders.candidates(request.META.get("HTTP_ACCEPT", ""))
+
+   def finalize(
+     self,
+     request: HttpRequest,
+     response: HttpResponseBase,
+     validators: Optional[Validators] = None
+   ) -> HttpResponseBase:
+      """Apply conditional headers, then compression, to an outgoing response."""
+      if not response.streaming:
+         # The format was negotiated from Accept
+         patch_vary_headers(response, ("Accept",))
+      if validators is not None:
+         response = validators.finalize(request, response)
+      if policy := self.compression_policy():
+         response = policy.compress(request, response)
+      return response
+
+   def parse_request(self, request: HttpRequest, view_kwargs: dict) -> dict:
+      """Validate query, body and form input into view keyword arguments."""
+      parser = RequestParser(request, self.view_func, view_kwargs, schemas=self.inp_schema)
+      if self.combined_input is not None:
+         return parser.parse_combined(self.combined_input)
+      return parser.parse_data()
+
+   def inject_response(self, data: dict) -> Optional[HttpResponse]:
+      """Create the response object requested by the view signature, if any."""
+      if self.resp_param is None:
+         return None
+      response = HttpResponse(content_type="application/json")
+      data[self.resp_param] = response
+      return response
+
+   def select_fields(self, status: int, input_data: dict) -> Optional[FieldSelection]:
+      """The `?fields=` selection of this request, if the view supports one and it was sent."""
+      return self.fields.select(status, input_data) if self.fields is not None else None
+
+   def load_related(
+     self,
+     status: int,
+     data: Any,
+     selection: Optional[FieldSelection] = None,
+     prefetch_many: bool = True
+   ) -> Any:
+      """Join and prefetch the relations the response schema reads from a returned QuerySet."""
+      schema = selection.resource_schema if selection is not None else None
+      return self.related.load(status, data, schema, prefetch_many=prefetch_many)
+
+   async def apaginate(self, status: int, data: Any, input_data: dict) -> Any:
+      """Fetch the page of a paginated async view's QuerySet with the async ORM, before validation."""
+      pagination_class = self.response_context.get("pagination_class")
+      if pagination_class is None or not isinstance(data, QuerySet) or status != _wrapped_status(self.view_func):
+         return data
+      return await pagination_class.apaginate(data, input_data) or data
+
+   def response_parser(
+     self,
+     request: HttpRequest,
+     status: int,
+     data: Any,
+     input_data: dict,
+     selection: Optional[FieldSelection] = None
+   ) -> ResponseParser:
+      """Build a response parser using this view's prebuilt serializers."""
+      return ResponseParser(
+         request=request,
+         status=status,
+         data=data,
+         schemas=self.response_schemas,
+         input_data=input_data,
+         owner=self.view_func,
+         serializer=selection.serializer if selection is not None else None,
+         context=self.response_context
+      )
+
+   def stream_response(
+     self,
+     request: HttpRequest,
+     status: int,
+     data: Any,
+     input_data: dict,
+     response: Optional[HttpResponse] = None,
+     is_async: bool = False
+   ) -> StreamingHttpResponse:
+      """Stream a `Stream[...]` response item by item, from an async iterator for async views."""
+      serializer = response_serializers.get(self.view_func, status, self.response_schemas[status])
+      context = {**self.response_context, "request": request, "input_data": input_data}
+      data = self.load_related(status, data, prefetch_many=not is_async or ASYNC_ITERATOR_PREFETCH)
+      return streaming_response(serializer, data, context, status, response, is_async=is_async)
+
+
+BODY_ETAG_POLICY = ConditionalPolicy()
+DEFAULT_COMPRESSION_POLICY = CompressionPolicy()
+
+
+def _wrapped_status(view_func: ViewFuncT) -> Optional[int]:
+   wrapper = getattr(view_func, "response_wrapper", None)
+   return wrapper[0] if wrapper else None
+
+
+def _field_selector(view_func: ViewFuncT, response_schemas: dyp.schema) -> Optional[FieldSelector]:
+   if not (param := getattr(view_func, "djapy_fields", None)):
+      return None
+   return FieldSelector(param, response_schemas, wrapped_status=_wrapped_status(view_func))
+
+
+def _response_context(view_func: ViewFuncT) -> MappingProxyType:
+   """Extra validation context of response schemas, e.g. the pagination class for its wrapper."""
+   context = {}
+   if (pagination_class := getattr(view_func, "pagination_class", None)) is not None:
+      context["pagination_class"] = pagination_class
+   return MappingProxyType(context)
+
+
+def _stream_statuses(response_schemas: dyp.schema) -> frozenset:
+   return frozenset(status for status, schema in response_schemas.items() if is_stream_type(schema))
+
+
+def build_view_plan(
+  view_func: ViewFuncT,
+  methods: dyp.methods,
+  auth: BaseAuthMechanism,
+  inp_schema: dyp.inp_schema,
+  response_schemas: dyp.schema,
+) -> ViewPlan:
+   """Compile the per-view execution plan."""
+   response_serializers.warm(view_func, response_schemas)
+   resp_param = view_func.djapy_resp_param
+   cache = getattr(view_func, "djapy_cache", None)
+   if cache is not None and resp_param is not None:
+      raise TypeError(
+         f"View `{view_func.__name__}` can't use djapy_cache together with an injected response, "
+         f"its headers and cookies would not be cached"
+      )
+   # The bare base mechanism never rejects anything, so skip calling it at all
+   has_auth = type(auth) is not BaseAuthMechanism
+   return ViewPlan(
+      view_func=view_func,
+      view_id=f"{view_func.__module__}.{view_func.__qualname__}",
+      methods=frozenset(methods) if methods else None,
+      auth=auth if has_auth else None,
+      authorize=bool(auth.permissions),
+      inp_schema=MappingProxyType(dict(inp_schema)),
+      combined_input=inp_schema.get("combined"),
+      resp_param=resp_param.name if resp_param else None,
+      response_schemas=response_schemas,
+      response_context=_response_context(view_func),
+      stream_statuses=_stream_statuses(response_schemas),
+      cache=cache,
+      conditional=getattr(view_func, "djapy_condition", None),
+      compression=getattr(view_func, "djapy_compress", None),
+      fields=_field_selector(view_func, response_schemas),
+      related=RelatedLoader(response_schemas, wrapped_status=_wrapped_status(view_func)),
+   )
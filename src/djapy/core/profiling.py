@@ -0,0 +1,207 @@
+__all__ = [
+   'RequestProfile', 'start_profile', 'profile_token', 'profile_summary', 'summarize_profiles'
+]
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.core import signing
+from django.http import HttpRequest, HttpResponseBase
+
+from djapy.core.conf import djapy_setting
+
+logger = logging.getLogger("djapy.profile")
+
+TOKEN_SALT = "djapy.profile"
+PSTATS_SUFFIX = ".pstats"
+COLLAPSED_SUFFIX = ".collapsed"
+
+
+def profile_token(view: str = "*") -> str:
+   """
+   Signed `DJAPY_PROFILE_HEADER` value asking to profile `view` (its dotted path or
+   name), or any view with `*`. Tokens expire after `DJAPY_PROFILE_TOKEN_MAX_AGE` seconds.
+   """
+   return signing.TimestampSigner(salt=TOKEN_SALT).sign(view)
+
+
+def _token_view(token: str) -> Optional[str]:
+   try:
+      return signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+         token, max_age=djapy_setting("DJAPY_PROFILE_TOKEN_MAX_AGE")
+      )
+   except signing.BadSignature:
+      logger.debug("Ignoring invalid profiling token")
+      return None
+
+
+class _SamplingProfiler:
+   """Samples the stack of one thread every `interval` seconds from a background thread."""
+
+   def __init__(self, interval: float):
+      self.interval = interval
+      self.stacks: Counter = Counter()
+      self._thread_id = threading.get_ident()
+      self._stop = threading.Event()
+      self._sampler = threading.Thread(target=self._run, name="djapy-profiler", daemon=True)
+
+   def _run(self) -> None:
+      while not self._stop.wait(self.interval):
+         if (frame := sys._current_frames().get(self._thread_id)) is None:
+            continue
+         stack = []
+         while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+         self.stacks[";".join(reversed(stack))] += 1
+
+   def enable(self) -> None:
+      self._sampler.start()
+
+   def disable(self) -> None:
+      self._stop.set()
+      self._sampler.join()
+
+   def dump(self, path: Path) -> None:
+      path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+
+class _ViewSummary:
+   __slots__ = ("count", "total", "max", "last_file")
+
+   def __init__(self):
+      self.count = 0
+      self.total = 0.0
+      self.max = 0.0
+      self.last_file = ""
+
+   def as_dict(self) -> dict:
+      return {"count": self.count, "total": self.total, "max": self.max, "last_file": self.last_file}
+
+
+_summaries: Dict[str, _ViewSummary] = {}
+_summaries_lock = threading.Lock()
+
+
+def profile_summary() -> Dict[str, dict]:
+   """Profiled requests of this process per view: count, total and max seconds, last file."""
+   with _summaries_lock:
+      return {view: summary.as_dict() for view, summary in _summaries.items()}
+
+
+class RequestProfile:
+   """
+   Runs one request under `cProfile` or the sampling profiler and stores the result.
+
+   cProfile results are written as `.pstats` files, sampling results as collapsed stacks
+   (one `frame;frame;frame count` line per stack, the flame graph input format). Profiling an
+   async view also records whatever else runs on the event loop meanwhile.
+   """
+
+   def __init__(self, view: str, directory: str, trigger: str):
+      self.view = view
+      self.directory = Path(directory)
+      self.trigger = trigger
+      self.path: Optional[Path] = None
+      if djapy_setting("DJAPY_PROFILER") == "sampling":
+         self._profiler = _SamplingProfiler(djapy_setting("DJAPY_PROFILE_SAMPLING_INTERVAL"))
+         self._suffix = COLLAPSED_SUFFIX
+      else:
+         self._profiler = cProfile.Profile()
+         self._suffix = PSTATS_SUFFIX
+      self._started = 0.0
+
+   def __enter__(self) -> "RequestProfile":
+      self._started = time.perf_counter()
+      try:
+         self._profiler.enable()
+      except ValueError:
+         # Only one cProfile may run at a time, skip requests overlapping a profiled one
+         logger.info("Skipped profiling %s, another profile is running", self.view)
+         self._profiler = None
+      return self
+
+   def __exit__(self, *exc_info) -> None:
+      if self._profiler is None:
+         return
+      self._profiler.disable()
+      elapsed = time.perf_counter() - self._started
+      try:
+         self.directory.mkdir(parents=True, exist_ok=True)
+         name = f"{self.view}.{int(time.time() * 1000)}.{os.getpid()}.{uuid.uuid4().hex[:8]}{self._suffix}"
+         self.path = self.directory / name
+         if isinstance(self._profiler, cProfile.Profile):
+            self._profiler.dump_stats(self.path)
+         else:
+            self._profiler.dump(self.path)
+      except OSError:
+         logger.exception("Could not store the profile of %s", self.view)
+         self.path = None
+         return
+      with _summaries_lock:
+         summary = _summaries.setdefault(self.view, _ViewSummary())
+         summary.count += 1
+         summary.total += elapsed
+         summary.max = max(summary.max, elapsed)
+         summary.last_file = self.path.name
+      logger.info("Profiled %s in %.1fms (%s): %s", self.view, elapsed * 1000, self.trigger, self.path)
+
+   def finish(self, response: HttpResponseBase) -> HttpResponseBase:
+      """Point whoever asked for the profile with a signed header to its file."""
+      if self.trigger == "header" and self.path is not None:
+         response.headers["X-Djapy-Profile"] = self.path.name
+      return response
+
+
+def start_profile(view: str, name: str, request: HttpRequest) -> Optional[RequestProfile]:
+   """
+   A profile of this request when `DJAPY_PROFILE_DIR` is set and the request is selected:
+   by a valid signed `DJAPY_PROFILE_HEADER`, by `DJAPY_PROFILE_VIEWS` or by
+   `DJAPY_PROFILE_SAMPLE_RATE`.
+   """
+   if not (directory := djapy_setting("DJAPY_PROFILE_DIR")):
+      return None
+   if (token := request.headers.get(djapy_setting("DJAPY_PROFILE_HEADER"))) is not None:
+      if _token_view(token) in ("*", view, name):
+         return RequestProfile(view, directory, "header")
+   views = djapy_setting("DJAPY_PROFILE_VIEWS")
+   if view in views or name in views:
+      return RequestProfile(view, directory, "view")
+   rate = djapy_setting("DJAPY_PROFILE_SAMPLE_RATE")
+   if rate and (rate >= 1 or random.random() < rate):
+      return RequestProfile(view, directory, "sample")
+   return None
+
+
+def summarize_profiles(view: str, directory: Optional[str] = None, limit: int = 30) -> str:
+   """
+   Merge every stored profile of `view`, from all processes writing to the directory.
+
+   cProfile results come back as a `pstats` report sorted by cumulative time, sampled ones
+   as collapsed stacks with their counts added up.
+   """
+   directory = Path(directory or djapy_setting("DJAPY_PROFILE_DIR"))
+   out = io.StringIO()
+   if pstats_files := sorted(directory.glob(f"{view}.*{PSTATS_SUFFIX}")):
+      stats = pstats.Stats(*map(str, pstats_files), stream=out)
+      stats.sort_stats("cumulative").print_stats(limit)
+   if collapsed_files := sorted(directory.glob(f"{view}.*{COLLAPSED_SUFFIX}")):
+      stacks = Counter()
+      for path in collapsed_files:
+         for line in path.read_text().splitlines():
+            stack, _, count = line.rpartition(" ")
+            stacks[stack] += int(count)
+      out.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+   return out.getvalue()
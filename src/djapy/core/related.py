@@ -0,0 +1,182 @@
+__all__ = ['RelatedLoader', 'load_related', 'models_in', 'is_many', 'resource_model']
+
+import inspect
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, get_args, get_origin
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from django.db.models.query import ModelIterable
+from pydantic import BaseModel
+
+from djapy.core.conf import djapy_setting
+from djapy.schema.stream import is_stream_type
+
+MANY_ORIGINS = (list, List, tuple, Tuple, set, frozenset)
+
+
+def models_in(annotation: Any) -> List[type]:
+   """Pydantic models found in a type annotation, e.g. `[Item]` for `Optional[List[Item]]`."""
+   if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+      return [annotation]
+   return [model for arg in get_args(annotation) for model in models_in(arg)]
+
+
+def is_many(annotation: Any) -> bool:
+   if get_origin(annotation) in MANY_ORIGINS:
+      return True
+   return any(is_many(arg) for arg in get_args(annotation))
+
+
+def resource_model(schema: Any, wrapped: bool = False) -> Optional[type]:
+   """
+   The schema describing a single returned object, None if there isn't exactly one.
+
+   `wrapped` responses (pagination) hold the objects in their `items` field.
+   """
+   if (stream := is_stream_type(schema)) is not None:
+      schema = stream.item_type
+   if wrapped and inspect.isclass(schema) and issubclass(schema, BaseModel):
+      if (items := schema.model_fields.get("items")) is None:
+         return None
+      schema = items.annotation
+   models = models_in(schema)
+   return models[0] if len(models) == 1 else None
+
+
+def _attribute(name: str, field) -> str:
+   """The attribute a `from_attributes` schema field reads."""
+   alias = field.validation_alias
+   return alias if isinstance(alias, str) else field.alias or name
+
+
+# (select_related paths, ((prefetch path, related model, only() columns or None, nested lookups), ...))
+Lookups = Tuple[Tuple[str, ...], tuple]
+
+
+@lru_cache(maxsize=512)
+def _lookups(model: type, schema: type, seen: frozenset = frozenset()) -> Lookups:
+   select, prefetch = [], []
+   _walk(model, schema, "", select, prefetch, seen | {(model, schema)})
+   return tuple(select), tuple(prefetch)
+
+
+def _walk(model: type, schema: type, prefix: str, select: list, prefetch: list, seen: frozenset) -> None:
+   """Collect the relations `schema` reads; `seen` holds the (model, schema) pairs on the path."""
+   opts = model._meta
+   for name, field in schema.model_fields.items():
+      if field.exclude:
+         continue
+      nested = models_in(field.annotation)
+      if len(nested) != 1:
+         continue
+      try:
+         model_field = opts.get_field(_attribute(name, field))
+      except FieldDoesNotExist:
+         continue
+      related = model_field.related_model
+      if not model_field.is_relation or not isinstance(related, type):
+         continue
+      if (related, nested[0]) in seen:
+         # Recursive schemas would load relations forever, stop where the path repeats
+         continue
+      path = f"{prefix}{model_field.name}"
+      if model_field.many_to_many or model_field.one_to_many:
+         prefetch.append((path, related, _columns(related, nested[0], model_field), _lookups(related, nested[0], seen)))
+      else:
+         select.append(path)
+         _walk(related, nested[0], f"{path}__", select, prefetch, seen | {(related, nested[0])})
+
+
+def _columns(model: type, schema: type, relation) -> Optional[Tuple[str, ...]]:
+   """Columns a prefetched queryset needs for `schema`, None when they can't be known."""
+   if schema.model_computed_fields:
+      # Computed fields may read any attribute
+      return None
+   opts = model._meta
+   columns = {opts.pk.name}
+   if relation.one_to_many:
+      # The foreign key joining the rows back to their parent
+      columns.add(relation.field.name)
+   for name, field in schema.model_fields.items():
+      if field.exclude:
+         continue
+      try:
+         model_field = opts.get_field(_attribute(name, field))
+      except FieldDoesNotExist:
+         return None
+      if model_field.concrete and not model_field.many_to_many:
+         columns.add(model_field.name)
+   return tuple(sorted(columns))
+
+
+def _prefetch(path: str, model: type, columns: Optional[tuple], nested: Lookups) -> Prefetch:
+   select, prefetch = nested
+   queryset = model._default_manager.all()
+   if select:
+      queryset = queryset.select_related(*select)
+   if prefetch:
+      queryset = queryset.prefetch_related(*(_prefetch(*spec) for spec in prefetch))
+   if columns is not None:
+      queryset = queryset.only(*columns)
+   return Prefetch(path, queryset=queryset)
+
+
+def _root(lookup: Any) -> str:
+   return getattr(lookup, "prefetch_through", lookup).split("__")[0]
+
+
+def load_related(queryset: QuerySet, schema: type, prefetch_many: bool = True) -> QuerySet:
+   """
+   Add the `select_related`/`prefetch_related` a QuerySet needs to be validated by `schema`.
+
+   Forward foreign keys and one-to-one relations are joined, many relations are prefetched
+   with `Prefetch` querysets limited to the nested schema's columns, unless `prefetch_many`
+   is off. Relations the QuerySet already loads, defers or prefetches are left to the view,
+   and combined querysets (`union()` and co.) support neither, so they're left as they are.
+   """
+   if (
+     queryset._result_cache is not None
+     or queryset._fields is not None
+     or queryset.query.combinator
+     or not issubclass(queryset._iterable_class, ModelIterable)
+   ):
+      return queryset
+   select, prefetch = _lookups(queryset.model, schema)
+
+   query = queryset.query
+   if select and query.select_related is not True:
+      names, defer = query.deferred_loading
+      # Deferred relations can't be joined
+      select = [path for path in select if (path.split("__")[0] in names) != defer]
+      if select:
+         queryset = queryset.select_related(*select)
+   if prefetch and prefetch_many:
+      seen = {_root(lookup) for lookup in queryset._prefetch_related_lookups}
+      if lookups := [_prefetch(*spec) for spec in prefetch if spec[0].split("__")[0] not in seen]:
+         queryset = queryset.prefetch_related(*lookups)
+   return queryset
+
+
+class RelatedLoader:
+   """
+   Loads the relations a view's response schemas read, sparing it N+1 queries.
+
+   The resource schema of every status is found at decoration time, the relations of
+   each (model, schema) pair on first use. Turned off by `DJAPY_AUTO_RELATED = False`.
+   """
+
+   def __init__(self, response_schemas: dict, wrapped_status: Optional[int] = None):
+      self.schemas = {
+         status: model
+         for status, schema in response_schemas.items()
+         if (model := resource_model(schema, wrapped=status == wrapped_status)) is not None
+      }
+
+   def load(self, status: int, data: Any, schema: Optional[type] = None, prefetch_many: bool = True) -> Any:
+      """`data` with its relations loaded, for QuerySets; `schema` overrides the status schema."""
+      if not isinstance(data, QuerySet) or not djapy_setting("DJAPY_AUTO_RELATED"):
+         return data
+      if (schema := schema or self.schemas.get(status)) is None:
+         return data
+      return load_related(data, schema, prefetch_many=prefetch_many)
@@ -0,0 +1,107 @@
+__all__ = ['ResponseSerializer', 'ResponseSerializerRegistry', 'response_serializers']
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from pydantic import ConfigDict, TypeAdapter, PydanticUserError
+
+from djapy.schema.stream import is_stream_type
+
+RESPONSE_ADAPTER_CONFIG = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
+
+
+class ResponseSerializer:
+   """
+   Validator and serializer for one response schema, with its core schema compiled once.
+
+   For `Stream[...]` schemas the adapter works on single items, see `djapy.core.streaming`.
+   `include` restricts dumped fields, see `djapy.core.fields`.
+   """
+
+   __slots__ = ('schema', 'adapter', 'stream', 'include')
+
+   def __init__(self, schema: Any, include: Optional[dict] = None):
+      self.schema = schema
+      self.include = include
+      self.stream = is_stream_type(schema)
+      if self.stream is not None:
+         schema = self.stream.item_type
+      try:
+         self.adapter = TypeAdapter(schema, config=RESPONSE_ADAPTER_CONFIG)
+      except PydanticUserError:
+         # Models, dataclasses and TypedDicts carry their own config
+         self.adapter = TypeAdapter(schema)
+
+   def validate(self, data: Any, context: Optional[dict] = None) -> Any:
+      return self.adapter.validate_python(data, from_attributes=True, context=context)
+
+   def to_python(self, value: Any, mode: str = "json") -> Any:
+      return self.adapter.dump_python(value, mode=mode, by_alias=True, include=self.include)
+
+   def to_json(self, value: Any) -> bytes:
+      """Serialize straight to JSON bytes, without building an intermediate Python tree."""
+      return self.adapter.dump_json(value, by_alias=True, include=self.include)
+
+
+class ResponseSerializerRegistry:
+   """
+   Process-wide registry of response serializers keyed by `(view, status)`.
+
+   Entries are built at decoration time (see `warm`) or on first use and shared by every
+   request afterward. Hit/miss counters are plain integers, exact enough for monitoring.
+   """
+
+   def __init__(self):
+      self._entries: Dict[tuple, ResponseSerializer] = {}
+      self._build_times: Dict[tuple, float] = {}
+      self._lock = threading.Lock()
+      self.hits = 0
+      self.misses = 0
+
+   def get(self, owner: Hashable, status: int, schema: Any) -> ResponseSerializer:
+      """Return the serializer for `owner`'s `status` response, building it if needed."""
+      key = (owner, status)
+      try:
+         serializer = self._entries[key]
+      except KeyError:
+         self.misses += 1
+         return self._build(key, schema)
+      self.hits += 1
+      return serializer
+
+   def warm(self, owner: Hashable, schemas: Dict[int, Any]) -> None:
+      """Build serializers for every status of a view ahead of its first request."""
+      for status, schema in schemas.items():
+         if (owner, status) not in self._entries:
+            self._build((owner, status), schema)
+
+   def _build(self, key: tuple, schema: Any) -> ResponseSerializer:
+      with self._lock:
+         if key in self._entries:
+            return self._entries[key]
+         started = time.perf_counter()
+         serializer = ResponseSerializer(schema)
+         self._build_times[key] = time.perf_counter() - started
+         self._entries[key] = serializer
+         return serializer
+
+   def stats(self) -> dict:
+      """Registry statistics: entry count, hits, misses and build times in seconds."""
+      build_times = list(self._build_times.values())
+      return {
+         "entries": len(self._entries),
+         "hits": self.hits,
+         "misses": self.misses,
+         "build_time_total": sum(build_times),
+         "build_time_max": max(build_times, default=0.0),
+      }
+
+   def clear(self) -> None:
+      with self._lock:
+         self._entries.clear()
+         self._build_times.clear()
+         self.hits = self.misses = 0
+
+
+response_serializers = ResponseSerializerRegistry()
@@ -0,0 +1,132 @@
+__all__ = ['iter_stream', 'aiter_stream', 'streaming_response']
+
+import logging
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
+
+from django.db.models import QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+
+from djapy.core.conf import djapy_setting
+from djapy.core.serializers import ResponseSerializer
+from djapy.schema.stream import NDJSONStream
+
+
+class _StreamEncoder:
+   """Frames serialized items as a JSON array or as NDJSON lines, buffering small writes."""
+
+   def __init__(self, serializer: ResponseSerializer, context: dict):
+      self.validate = serializer.adapter.validate_python
+      self.dump = serializer.adapter.dump_json
+      self.context = context
+      self.ndjson = isinstance(serializer.stream, NDJSONStream)
+      self.buffer_size = djapy_setting("DJAPY_STREAM_BUFFER_SIZE")
+      self.buffer = bytearray() if self.ndjson else bytearray(b"[")
+      self.first = True
+
+   def add(self, item: Any) -> Optional[bytes]:
+      """Add one item, returning a chunk to send once the buffer is full."""
+      encoded = self.dump(self.validate(item, from_attributes=True, context=self.context))
+      if self.ndjson:
+         self.buffer += encoded
+         self.buffer += b"\n"
+      else:
+         if not self.first:
+            self.buffer += b","
+         self.buffer += encoded
+      self.first = False
+      if len(self.buffer) >= self.buffer_size:
+         return self.flush()
+      return None
+
+   def flush(self) -> bytes:
+      chunk = bytes(self.buffer)
+      self.buffer.clear()
+      return chunk
+
+   def close(self) -> bytes:
+      if not self.ndjson:
+         self.buffer += b"]"
+      return self.flush()
+
+
+def _rows(data: Any) -> Iterable:
+   if isinstance(data, QuerySet):
+      return data.iterator(chunk_size=djapy_setting("DJAPY_STREAM_CHUNK_SIZE"))
+   return data
+
+
+def iter_stream(serializer: ResponseSerializer, data: Any, context: dict) -> Iterator[bytes]:
+   """
+   Validate and serialize `data` item by item.
+
+   Once the first bytes are out the status can't change anymore, so an error mid-stream is
+   logged and ends the body early; a JSON array is then left unterminated on purpose.
+   """
+   encoder = _StreamEncoder(serializer, context)
+   try:
+      for item in _rows(data):
+         if chunk := encoder.add(item):
+            yield chunk
+   except Exception as exc:
+      logging.exception(f"Error while streaming response: {exc}")
+      if chunk := encoder.flush():
+         yield chunk
+      return
+   yield encoder.close()
+
+
+async def _arows(data: Any) -> AsyncIterator:
+   if isinstance(data, QuerySet):
+      async for row in data.aiterator(chunk_size=djapy_setting("DJAPY_STREAM_CHUNK_SIZE")):
+         yield row
+   elif hasattr(data, "__aiter__"):
+      async for row in data:
+         yield row
+   else:
+      for row in data:
+         yield row
+
+
+async def aiter_stream(serializer: ResponseSerializer, data: Any, context: dict) -> AsyncIterator[bytes]:
+   """
+   Async version of `iter_stream` for async views.
+
+   Accepts async generators, `QuerySet` (consumed with `aiterator()`) and in-memory
+   iterables. Items are validated on the event loop, so they must not lazily load relations;
+   prefetch them or stream plain values. The ASGI server pulls the next chunk only once the
+   previous one is sent, which gives natural backpressure.
+   """
+   encoder = _StreamEncoder(serializer, context)
+   try:
+      async for item in _arows(data):
+         if chunk := encoder.add(item):
+            yield chunk
+   except Exception as exc:
+      logging.exception(f"Error while streaming response: {exc}")
+      if chunk := encoder.flush():
+         yield chunk
+      return
+   yield encoder.close()
+
+
+def streaming_response(
+  serializer: ResponseSerializer,
+  data: Any,
+  context: dict,
+  status: int,
+  response: Optional[HttpResponse] = None,
+  is_async: bool = False
+) -> StreamingHttpResponse:
+   """Build a streaming response, carrying over headers and cookies of the injected response."""
+   stream = aiter_stream if is_async else iter_stream
+   streaming = StreamingHttpResponse(
+      stream(serializer, data, context),
+      status=status,
+      content_type=serializer.stream.media_type
+   )
+   if response is not None:
+      for header, value in response.items():
+         if header.lower() != "content-type":
+            streaming[header] = value
+      streaming.cookies = response.cookies
+   return streaming
@@ -0,0 +1,231 @@
+__all__ = ['StageTimer', 'RequestTrace', 'TraceReport', 'StageStats', 'NULL_TRACE', 'start_trace', 'fingerprint']
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.module_loading import import_string
+
+from djapy.core.conf import djapy_setting
+from djapy.core.metrics import metrics
+
+logger = logging.getLogger("djapy.trace")
+
+_PLACEHOLDER_LIST = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+def fingerprint(sql: str) -> str:
+   """SQL with parameter lists collapsed, so `IN (%s, %s)` and `IN (%s)` group together."""
+   return _PLACEHOLDER_LIST.sub("%s", sql)
+
+
+@dataclass(slots=True)
+class StageStats:
+   """Wall time and SQL of one pipeline stage, times in milliseconds."""
+   duration: float = 0.0
+   queries: int = 0
+   query_time: float = 0.0
+
+
+@dataclass(slots=True)
+class TraceReport:
+   """
+   What one sampled request did, handed to every `DJAPY_TRACE_SINKS` callable.
+
+   `repeated` lists `(stage, sql, count)` for statements run at least
+   `DJAPY_TRACE_N_PLUS_ONE_THRESHOLD` times, the shape of an N+1 query.
+   """
+   view: str
+   method: str
+   path: str
+   status: int
+   stages: Dict[str, StageStats]
+   repeated: List[Tuple[str, str, int]] = field(default_factory=list)
+
+   @property
+   def queries(self) -> int:
+      return sum(stats.queries for stats in self.stages.values())
+
+   @property
+   def query_time(self) -> float:
+      return sum(stats.query_time for stats in self.stages.values())
+
+
+class _NullTrace:
+   """Stand-in for requests that are neither traced nor measured, every call is a no-op."""
+   __slots__ = ()
+
+   def enter(self, stage: str) -> None:
+      pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class StageTimer:
+   """
+   Times the pipeline stages of one request for the `DJAPY_METRICS` histograms.
+
+   `enter` starts the next stage, ending the current one. Used as a context manager, sync or
+   async, around the request.
+   """
+
+   def __init__(self, view: str):
+      self.view = view
+      self.stages: Dict[str, StageStats] = {}
+      self._stage: Optional[str] = None
+      self._stats: Optional[StageStats] = None
+      self._started = 0.0
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc_info) -> None:
+      self._close_stage()
+
+   async def __aenter__(self):
+      return self
+
+   async def __aexit__(self, *exc_info) -> None:
+      self._close_stage()
+
+   def enter(self, stage: str) -> None:
+      self._close_stage()
+      self._stage = stage
+      self._stats = self.stages.setdefault(stage, StageStats())
+      self._started = time.perf_counter()
+
+   def _close_stage(self) -> None:
+      if self._stats is not None:
+         self._stats.duration += (time.perf_counter() - self._started) * 1000
+         self._stats = None
+
+   def finish(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+      if djapy_setting("DJAPY_METRICS"):
+         metrics.observe(self.view, response.status_code, self.stages)
+      return response
+
+
+class RequestTrace(StageTimer):
+   """
+   Times the pipeline stages of one request and records the SQL each one runs.
+
+   Entering it installs a database execute wrapper on every connection. Queries made while
+   a streaming response is consumed happen after the trace ends and aren't counted.
+   """
+
+   def __init__(self, view: str):
+      super().__init__(view)
+      self.statements: Counter = Counter()
+      self._exit_stack = ExitStack()
+
+   def _install(self) -> None:
+      for connection in connections.all():
+         self._exit_stack.enter_context(connection.execute_wrapper(self._record))
+
+   def __enter__(self) -> "RequestTrace":
+      self._install()
+      return self
+
+   def __exit__(self, *exc_info) -> None:
+      self._close_stage()
+      self._exit_stack.close()
+
+   async def __aenter__(self) -> "RequestTrace":
+      # Connections are thread-local: wrap those of the thread running the view's ORM calls
+      await sync_to_async(self._install)()
+      return self
+
+   async def __aexit__(self, *exc_info) -> None:
+      self._close_stage()
+      await sync_to_async(self._exit_stack.close)()
+
+   def _record(self, execute: Callable, sql: str, params, many: bool, context: dict):
+      started = time.perf_counter()
+      try:
+         return execute(sql, params, many, context)
+      finally:
+         if (stats := self._stats) is not None:
+            stats.queries += 1
+            stats.query_time += (time.perf_counter() - started) * 1000
+         self.statements[(self._stage, fingerprint(sql))] += 1
+
+   def report(self, request: HttpRequest, response: HttpResponseBase) -> TraceReport:
+      threshold = djapy_setting("DJAPY_TRACE_N_PLUS_ONE_THRESHOLD")
+      repeated = [
+         (stage, sql, count)
+         for (stage, sql), count in self.statements.most_common()
+         if count >= threshold
+      ]
+      return TraceReport(self.view, request.method, request.path, response.status_code, self.stages, repeated)
+
+   def finish(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+      """Report the trace to the log and sinks, and to response headers when DEBUG is on."""
+      super().finish(request, response)
+      report = self.report(request, response)
+      if report.repeated:
+         stage, sql, count = report.repeated[0]
+         logger.warning(
+            "Possible N+1 in %s: %d similar queries during %s: %s",
+            report.view, count, stage, sql,
+            extra={"djapy_trace": report}
+         )
+      else:
+         logger.debug(
+            "%s ran %d queries in %.1fms", report.view, report.queries, report.query_time,
+            extra={"djapy_trace": report}
+         )
+      for sink in _sinks():
+         try:
+            sink(report)
+         except Exception:
+            logger.exception("Trace sink %r failed", sink)
+      if settings.DEBUG:
+         _set_headers(response, report)
+      return response
+
+
+def _set_headers(response: HttpResponseBase, report: TraceReport) -> None:
+   response.headers["Server-Timing"] = ", ".join(
+      f'{stage};dur={stats.duration:.2f};desc="{stats.queries} queries"'
+      for stage, stats in report.stages.items()
+   )
+   response.headers["X-Djapy-Queries"] = str(report.queries)
+   if report.repeated:
+      response.headers["X-Djapy-N-Plus-One"] = str(len(report.repeated))
+
+
+_resolved_sinks: Dict[tuple, Tuple[Callable, ...]] = {}
+
+
+def _sinks() -> Tuple[Callable, ...]:
+   configured = tuple(djapy_setting("DJAPY_TRACE_SINKS"))
+   try:
+      return _resolved_sinks[configured]
+   except KeyError:
+      sinks = _resolved_sinks[configured] = tuple(
+         import_string(sink) if isinstance(sink, str) else sink for sink in configured
+      )
+      return sinks
+
+
+def start_trace(view: str) -> Optional[StageTimer]:
+   """
+   A `RequestTrace` if this request is sampled by `DJAPY_TRACE_SAMPLE_RATE`, else a
+   `StageTimer` when `DJAPY_METRICS` is on, else None.
+   """
+   rate = djapy_setting("DJAPY_TRACE_SAMPLE_RATE")
+   if rate and (rate >= 1 or random.random() < rate):
+      return RequestTrace(view)
+   if djapy_setting("DJAPY_METRICS"):
+      return StageTimer(view)
+   return None
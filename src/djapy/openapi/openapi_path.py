@@ -6,8 +6,10 @@ from django.urls import URLPattern
 from pydantic import create_model
 
 from .defaults import REF_MODAL_TEMPLATE
+from djapy.core.encoders import encoders
 from djapy.core.type_check import schema_type, basic_query_schema
 from djapy.schema import Schema
+from djapy.schema.stream import is_stream_type
 
 __all__ = ['OpenAPI_Path']
 
@@ -86,6 +88,10 @@ class OpenAPI_Path:
             self.request_body["content"] = {}
 
          self.request_body["content"][content_type] = {"schema": prepared_schema}
+         if content_type == encoders.default.media_type:
+            for decoder in encoders:
+               if decoder.can_decode and decoder is not encoders.default and decoder.supports(schema):
+                  self.request_body["content"][decoder.media_type] = {"schema": prepared_schema}
 
    @staticmethod
    def make_parameters(name, schema, required, in_="query"):
@@ -145,6 +151,13 @@ class OpenAPI_Path:
 
    def set_responses(self):
       for status, schema in self.url_pattern.callback.schema.items():
+         if stream := is_stream_type(schema):
+            media_types = [stream.media_type]
+            schema = stream.openapi_schema
+         else:
+            # Every registered format able to represent the schema may be negotiated
+            media_types = [encoder.media_type for encoder in encoders if encoder.supports(schema)]
+
          description = (isinstance(schema, Schema)
                         and schema.Info.cvar_describe
                         and schema.Info.cvar_describe.get(status)) \
@@ -167,9 +180,9 @@ class OpenAPI_Path:
          self.responses[str(status)] = {
             "description": description,
             "content": {
-               "application/json": {
+               media_type: {
                   "schema": prepared_schema['properties']['response']
-               }
+               } for media_type in media_types
             }
          }
 
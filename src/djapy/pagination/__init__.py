@@ -1,8 +1,11 @@
-from .base_pagination import BasePagination
+from .base_pagination import BasePagination, Page
 from .offset_pagination import OffsetLimitPagination
 from .page_number_pagination import PageNumberPagination
+from .light_page_number_pagination import LightPageNumberPagination
 from .cursor_pagination import CursorPagination
+from .count import CountStrategy, ExactCount, CachedCount, EstimatedCount, CappedCount, NoCount
 from .dec import paginate
 
-__all__ = ["OffsetLimitPagination", "PageNumberPagination", "CursorPagination", "BasePagination",
-           "paginate"]
+__all__ = ["OffsetLimitPagination", "PageNumberPagination", "LightPageNumberPagination", "CursorPagination", "BasePagination", "Page",
+           "paginate", "CountStrategy", "ExactCount", "CachedCount", "EstimatedCount", "CappedCount",
+           "NoCount"]
@@ -1,8 +1,33 @@
-from typing import Generic, ClassVar, Optional, Any
+import asyncio
+from typing import Generic, ClassVar, Optional, Any, Union
 from functools import lru_cache
 
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import QuerySet
+
 from djapy.schema import Schema
 from djapy.core.typing_utils import G_TYPE
+from djapy.core.conf import djapy_setting
+from djapy.pagination.count import Count, CountStrategy, get_count_strategy
+
+
+class Page(dict):
+   """Response data of a page fetched before validation, passed through by `make_data`."""
+
+
+def _count_apart(db: str) -> bool:
+   # Another connection can't see the rows of an open transaction, nor write-lock SQLite
+   connection = connections[db]
+   return connection.vendor != "sqlite" and not connection.in_atomic_block
+
+
+def _count_on_own_connection(pagination_class: type, queryset: QuerySet) -> tuple[Count, str]:
+   try:
+      return pagination_class.count(queryset)
+   finally:
+      # Executor threads are idle between counts, they mustn't hold on to connections
+      connections[queryset.db].close()
 
 
 class BasePagination:
@@ -20,9 +45,52 @@ class BasePagination:
    - Passing QuerySet result to response validator
    
    Views don't need **kwargs - pagination parameters are auto-consumed!
+
+   Paginators reporting a total find it with `count_strategy`: "exact", "cached",
+   "estimated", "capped", "none" or a `CountStrategy` instance.
+
+   Paginators implementing `paginate` serve async views with `apaginate`, which fetches the
+   page with the async ORM before validation instead of inside the response validator.
    """
 
    query: ClassVar[list] = []
+   count_strategy: ClassVar[Union[str, CountStrategy]] = "exact"
+
+   @classmethod
+   def count(cls, queryset: QuerySet) -> tuple[Count, str]:
+      """Total of `queryset` by this class's count strategy, and the strategy's name."""
+      strategy = get_count_strategy(cls.count_strategy)
+      return strategy.count(queryset), strategy.name
+
+   @classmethod
+   async def acount(cls, queryset: QuerySet) -> tuple[Count, str]:
+      strategy = get_count_strategy(cls.count_strategy)
+      return await strategy.acount(queryset), strategy.name
+
+   @classmethod
+   async def acount_and_fetch(cls, queryset: QuerySet, page: QuerySet) -> tuple[tuple[Count, str], list]:
+      """
+      The count of `queryset` and the rows of `page`. With `DJAPY_ASYNC_PARALLEL_COUNT` the
+      count runs concurrently with the fetch on a connection of its own, opened and closed
+      for it, when the database and transaction state allow it.
+      """
+      if djapy_setting("DJAPY_ASYNC_PARALLEL_COUNT") and await sync_to_async(_count_apart)(queryset.db):
+         return await asyncio.gather(
+            sync_to_async(_count_on_own_connection, thread_sensitive=False)(cls, queryset),
+            _fetch(page),
+         )
+      return await cls.acount(queryset), await _fetch(page)
+
+   @classmethod
+   def paginate(cls, queryset: QuerySet, input_data: dict) -> Optional[dict]:
+      """Response data of one page of `queryset`, None if this paginator validates QuerySets itself."""
+      return None
+
+   @classmethod
+   async def apaginate(cls, queryset: QuerySet, input_data: dict) -> Optional[Page]:
+      """`paginate` for async views."""
+      data = await sync_to_async(cls.paginate)(queryset, input_data)
+      return Page(data) if data is not None else None
 
    @classmethod
    @lru_cache(maxsize=32)
@@ -42,3 +110,7 @@ class BasePagination:
    class response(Schema, Generic[G_TYPE]):
       """Base response schema for pagination."""
       pass
+
+
+async def _fetch(queryset: QuerySet) -> list:
+   return [row async for row in queryset]
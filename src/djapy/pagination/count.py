@@ -0,0 +1,237 @@
+import hashlib
+import json
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional, Union
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import DatabaseError, connections
+from django.db.models import Max, Min, QuerySet
+
+from djapy.core.conf import djapy_setting
+
+__all__ = [
+   "Count", "CountStrategy", "ExactCount", "CachedCount", "EstimatedCount", "CappedCount", "NoCount",
+   "get_count_strategy"
+]
+
+INTEGER_PK_TYPES = frozenset({
+   "AutoField", "BigAutoField", "SmallAutoField", "IntegerField", "BigIntegerField", "SmallIntegerField",
+   "PositiveIntegerField", "PositiveBigIntegerField", "PositiveSmallIntegerField",
+})
+
+
+class Count(NamedTuple):
+   """A pagination total; None when not counted, and whether it's the exact current count."""
+   total: Optional[int]
+   exact: bool
+
+
+class CountStrategy(ABC):
+   """
+   How a paginator finds the total of a QuerySet.
+
+   Set one as `count_strategy` on a pagination class, by name or as an instance:
+
+       class TodoPagination(PageNumberPagination):
+           count_strategy = CappedCount(cap=10_000)
+   """
+   name: str = "exact"
+
+   @abstractmethod
+   def count(self, queryset: QuerySet) -> Count:
+      pass
+
+   async def acount(self, queryset: QuerySet) -> Count:
+      """`count` for async views, run on the ORM thread unless a strategy has a native version."""
+      return await sync_to_async(self.count)(queryset)
+
+
+class ExactCount(CountStrategy):
+   """`COUNT(*)` on every request."""
+   name = "exact"
+
+   def count(self, queryset: QuerySet) -> Count:
+      return Count(queryset.count(), True)
+
+   async def acount(self, queryset: QuerySet) -> Count:
+      return Count(await queryset.acount(), True)
+
+
+def _unordered(queryset: QuerySet) -> QuerySet:
+   """`queryset` without its ordering, which doesn't change a count; slices keep theirs."""
+   return queryset if queryset.query.is_sliced else queryset.order_by()
+
+
+def _sql(queryset: QuerySet) -> tuple:
+   """SQL and parameters of `queryset`, raising `EmptyResultSet` when it can't match any row."""
+   return queryset.query.get_compiler(using=queryset.db).as_sql()
+
+
+def _sql_key(queryset: QuerySet) -> str:
+   sql, params = _sql(_unordered(queryset))
+   digest = hashlib.blake2b(f"{sql}\x00{params!r}".encode(), digest_size=16).hexdigest()
+   return f"djapy:count:{queryset.db}:{digest}"
+
+
+class CachedCount(CountStrategy):
+   """
+   Exact count memoized per SQL statement and parameters in the Django cache for `ttl`
+   seconds; cached totals are reported as not exact, they may be stale.
+   """
+   name = "cached"
+
+   def __init__(self, ttl: int = 60, cache_alias: Optional[str] = None):
+      self.ttl = ttl
+      self.cache_alias = cache_alias
+
+   def count(self, queryset: QuerySet) -> Count:
+      backend = caches[self.cache_alias or djapy_setting("DJAPY_CACHE_ALIAS")]
+      try:
+         key = _sql_key(queryset)
+      except EmptyResultSet:
+         return Count(0, True)
+      if (total := backend.get(key)) is not None:
+         return Count(total, False)
+      total = queryset.count()
+      backend.set(key, total, self.ttl)
+      return Count(total, True)
+
+   async def acount(self, queryset: QuerySet) -> Count:
+      backend = caches[self.cache_alias or djapy_setting("DJAPY_CACHE_ALIAS")]
+      try:
+         # Compiling SQL may ask the database for its version, keep it off the event loop
+         key = await sync_to_async(_sql_key)(queryset)
+      except EmptyResultSet:
+         return Count(0, True)
+      if (total := await backend.aget(key)) is not None:
+         return Count(total, False)
+      total = await queryset.acount()
+      await backend.aset(key, total, self.ttl)
+      return Count(total, True)
+
+
+def _is_unfiltered(queryset: QuerySet) -> bool:
+   query = queryset.query
+   return not query.where and not query.distinct and not query.is_sliced and not query.combinator
+
+
+class EstimatedCount(CountStrategy):
+   """
+   Row estimate instead of a count.
+
+   PostgreSQL reports the planner's estimate for the query; SQLite reads `sqlite_stat1` (kept
+   by `ANALYZE`) for unfiltered querysets. Otherwise the total is extrapolated from counting
+   one `sample_size` wide window of an integer primary key. Estimates below `exact_below`
+   are replaced by an exact count, which is cheap at that size.
+   """
+   name = "estimated"
+
+   def __init__(self, exact_below: int = 1000, sample_size: int = 10_000):
+      self.exact_below = exact_below
+      self.sample_size = sample_size
+
+   def count(self, queryset: QuerySet) -> Count:
+      try:
+         estimate = self.estimate(queryset)
+      except EmptyResultSet:
+         return Count(0, True)
+      if estimate is None or estimate < self.exact_below:
+         return Count(queryset.count(), True)
+      return Count(estimate, False)
+
+   def estimate(self, queryset: QuerySet) -> Optional[int]:
+      if queryset.query.combinator:
+         # union() and co. can't be filtered to a sample, nor explained as a single table
+         return None
+      vendor = connections[queryset.db].vendor
+      try:
+         if vendor == "postgresql":
+            return self._planner_rows(queryset)
+         if vendor == "sqlite" and _is_unfiltered(queryset):
+            if (rows := self._sqlite_stat(queryset)) is not None:
+               return rows
+      except DatabaseError:
+         return None
+      return self._sampled(queryset)
+
+   @staticmethod
+   def _planner_rows(queryset: QuerySet) -> int:
+      sql, params = _sql(_unordered(queryset))
+      with connections[queryset.db].cursor() as cursor:
+         cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+         plan = cursor.fetchone()[0]
+      if isinstance(plan, str):
+         plan = json.loads(plan)
+      return int(plan[0]["Plan"]["Plan Rows"])
+
+   @staticmethod
+   def _sqlite_stat(queryset: QuerySet) -> Optional[int]:
+      with connections[queryset.db].cursor() as cursor:
+         # The first number of every row is the table's row count
+         cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [queryset.model._meta.db_table])
+         row = cursor.fetchone()
+      return int(row[0].split()[0]) if row else None
+
+   def _sampled(self, queryset: QuerySet) -> Optional[int]:
+      if queryset.query.is_sliced or queryset.model._meta.pk.get_internal_type() not in INTEGER_PK_TYPES:
+         return None
+      bounds = queryset.model._default_manager.using(queryset.db).aggregate(low=Min("pk"), high=Max("pk"))
+      if bounds["low"] is None:
+         return 0
+      span = bounds["high"] - bounds["low"] + 1
+      if span <= self.sample_size:
+         return None
+      start = bounds["low"] + random.randrange(span - self.sample_size + 1)
+      matched = queryset.filter(pk__gte=start, pk__lt=start + self.sample_size).count()
+      return math.ceil(matched * span / self.sample_size)
+
+
+class CappedCount(CountStrategy):
+   """Counts at most `cap` rows, a bigger total is reported as `cap` and not exact ("cap+")."""
+   name = "capped"
+
+   def __init__(self, cap: int = 1000):
+      self.cap = cap
+
+   def count(self, queryset: QuerySet) -> Count:
+      return self._capped(_unordered(queryset)[:self.cap + 1].count())
+
+   async def acount(self, queryset: QuerySet) -> Count:
+      return self._capped(await _unordered(queryset)[:self.cap + 1].acount())
+
+   def _capped(self, total: int) -> Count:
+      if total > self.cap:
+         return Count(self.cap, False)
+      return Count(total, True)
+
+
+class NoCount(CountStrategy):
+   """No total at all; pages still know whether a next one exists."""
+   name = "none"
+
+   def count(self, queryset: QuerySet) -> Count:
+      return Count(None, False)
+
+   async def acount(self, queryset: QuerySet) -> Count:
+      return Count(None, False)
+
+
+COUNT_STRATEGIES = {
+   strategy.name: strategy
+   for strategy in (ExactCount(), CachedCount(), EstimatedCount(), CappedCount(), NoCount())
+}
+
+
+def get_count_strategy(strategy: Union[str, CountStrategy]) -> CountStrategy:
+   if isinstance(strategy, CountStrategy):
+      return strategy
+   try:
+      return COUNT_STRATEGIES[strategy]
+   except KeyError:
+      raise ValueError(
+         f"Unknown count strategy {strategy!r}, use one of {', '.join(COUNT_STRATEGIES)} or a CountStrategy"
+      ) from None
@@ -1,8 +1,9 @@
-from typing import Generic, Literal, Optional
+from typing import Generic, Literal, Optional, Tuple
 from django.db.models import QuerySet
 from pydantic import model_validator, conint, computed_field, Field
 
-from djapy.pagination.base_pagination import BasePagination
+from djapy.pagination.base_pagination import BasePagination, Page
+from djapy.pagination.keyset import Keyset, cursor_keyset, decode_cursor, encode_cursor
 from djapy.core.typing_utils import G_TYPE
 from djapy.schema import Schema
 
@@ -11,29 +12,39 @@ __all__ = ["CursorPagination"]
 
 class CursorPagination(BasePagination):
    """
-   Cursor-based pagination using a field as the cursor position.
-   
-   By default uses 'id' field. Override `cursor_field` to use a different field:
-   
+   Keyset pagination: each page continues after the last row of the previous one.
+
+   Rows are ordered by `cursor_fields` (`-` for descending), completed with the primary key
+   as a tie-breaker, and `ordering=desc` reverses every direction. `cursor` and
+   `prev_cursor` are opaque signed tokens of the last and first row of the page, so clients
+   can't forge positions, and pass either back as `cursor` to page forward or back. Every
+   page is a single query of `limit + 1` rows. Cursor fields must not be nullable; a
+   composite index over them lets the database seek to the page.
+
    Example:
-       class TimestampCursorPagination(CursorPagination):
-           cursor_field = 'created_at'
+       class FeedCursorPagination(CursorPagination):
+           cursor_fields = ('-created_at', 'id')
+
+   A single `cursor_field` is still honoured when `cursor_fields` is empty.
    """
 
    cursor_field: str = 'id'  # Field to use for cursor position
-   
+   cursor_fields: Tuple[str, ...] = ()
+
    query = [
-      ('cursor', conint(ge=0) | Literal['null'] | None, None),
+      ('cursor', Optional[str], None),
       ('limit', conint(ge=1), 1),
       ('ordering', Literal['asc', 'desc'], 'asc'),
    ]
 
    class response(Schema, Generic[G_TYPE]):
       items: G_TYPE
-      cursor: Optional[int] = Field(None, description="Next cursor position")
+      cursor: Optional[str] = Field(None, description="Opaque cursor of the next page")
+      prev_cursor: Optional[str] = Field(None, description="Opaque cursor of the previous page")
       limit: int = Field(gt=0, description="Items per page")
       ordering: Literal['asc', 'desc'] = Field(description="Sort order")
       has_next: bool = Field(description="More items available")
+      has_previous: bool = Field(False, description="Items available before this page")
 
       @computed_field
       @property
@@ -45,7 +56,7 @@ class CursorPagination(BasePagination):
       @property
       def is_first_page(self) -> bool:
          """Check if this is the first page."""
-         return self.cursor is None or not self.has_next
+         return not self.has_previous
 
       @computed_field
       @property
@@ -55,77 +66,74 @@ class CursorPagination(BasePagination):
 
       @model_validator(mode="before")
       def make_data(cls, queryset, info):
-         """Optimized cursor pagination with better performance."""
+         """One `limit + 1` query per page, forward or backward from the cursor."""
+         if isinstance(queryset, Page):
+            return queryset
          if not isinstance(queryset, QuerySet):
             raise ValueError("The result should be a QuerySet")
 
-         cursor = info.context['input_data']['cursor']
-         limit = info.context['input_data']['limit']
-         ordering = info.context['input_data']['ordering']
-         
-         # Normalize cursor
-         if cursor == 'null':
-            cursor = None
-
-         is_cursor_empty = cursor is None
-         
-         # Get cursor field - can be customized by subclassing
          # Access from the pagination class that was passed to @paginate()
          pagination_class = info.context.get('pagination_class', CursorPagination)
-         order_field = getattr(pagination_class, 'cursor_field', 'id')
-         
-         # Apply ordering
-         if ordering == 'desc':
-            queryset = queryset.order_by(f'-{order_field}')
-         else:
-            queryset = queryset.order_by(order_field)
-
-         # Early return for empty queryset
-         if not queryset.exists():
-            return {
-               "items": [],
-               "cursor": None,
-               "limit": limit,
-               "has_next": False,
-               "ordering": ordering
-            }
-
-         # Set initial cursor if not provided
-         if is_cursor_empty:
-            first_obj = queryset.first()
-            cursor = getattr(first_obj, order_field)
-
-         # Build cursor filter (optimized)
-         if is_cursor_empty and ordering == 'desc':
-            query_search = {f'{order_field}__lte': cursor}
-         elif is_cursor_empty and ordering == 'asc':
-            query_search = {f'{order_field}__gte': cursor}
-         elif ordering == 'desc':
-            query_search = {f'{order_field}__lt': cursor}
-         else:
-            query_search = {f'{order_field}__gt': cursor}
-
-         queryset_with_cursor = queryset.filter(**query_search)
-         
-         # Fetch limit + 1 to check for next page (single query)
-         queryset_subset = list(queryset_with_cursor[:limit + 1])
-         has_next = len(queryset_subset) > limit
-         
-         # Trim to actual limit
-         if has_next:
-            queryset_subset = queryset_subset[:limit]
-
-         # Set new cursor
-         if queryset_subset and has_next:
-            new_cursor = getattr(queryset_subset[-1], order_field)
-            cursor = new_cursor
-         else:
-            cursor = None
-
-         return {
-            "items": queryset_subset,
-            "cursor": cursor,
-            "limit": limit,
-            "has_next": has_next,
-            "ordering": ordering
-         }
+         return pagination_class.paginate(queryset, info.context['input_data'])
+
+   @classmethod
+   def paginate(cls, queryset: QuerySet, input_data: dict) -> dict:
+      keyset, page, backwards = cls.seek(queryset, input_data)
+      limit = input_data['limit']
+      # Fetch limit + 1 to know whether another page follows, in a single query
+      rows = list(page[:limit + 1])
+      if backwards and not rows:
+         # Everything before the cursor is gone, start over from the first page
+         return cls.page_data(input_data, keyset, list(queryset.order_by(*keyset.order_by)[:limit + 1]))
+      return cls.page_data(input_data, keyset, rows, bool(backwards), from_cursor=backwards is not None)
+
+   @classmethod
+   async def apaginate(cls, queryset: QuerySet, input_data: dict) -> Page:
+      keyset, page, backwards = cls.seek(queryset, input_data)
+      limit = input_data['limit']
+      rows = [row async for row in page[:limit + 1]]
+      if backwards and not rows:
+         rows = [row async for row in queryset.order_by(*keyset.order_by)[:limit + 1]]
+         return Page(cls.page_data(input_data, keyset, rows))
+      return Page(cls.page_data(input_data, keyset, rows, bool(backwards), from_cursor=backwards is not None))
+
+   @classmethod
+   def seek(cls, queryset: QuerySet, input_data: dict) -> Tuple[Keyset, QuerySet, Optional[bool]]:
+      """
+      The keyset of the requested ordering, the ordered rows the page starts with and whether
+      it's walked backwards, None for the first page.
+      """
+      cursor, ordering = input_data['cursor'], input_data['ordering']
+      keyset = cursor_keyset(cls, queryset.model, reverse=ordering == 'desc')
+      if cursor in (None, '', 'null'):
+         return keyset, queryset.order_by(*keyset.order_by), None
+      position, backwards = decode_cursor(cursor, len(keyset))
+      # Walk back from the cursor in the reverse order, the page is flipped afterwards
+      walk = cursor_keyset(cls, queryset.model, reverse=(ordering == 'desc') != backwards)
+      return keyset, walk.after(queryset, position).order_by(*walk.order_by), backwards
+
+   @staticmethod
+   def page_data(
+     input_data: dict,
+     keyset: Keyset,
+     rows: list,
+     backwards: bool = False,
+     from_cursor: bool = False
+   ) -> dict:
+      limit = input_data['limit']
+      has_more = len(rows) > limit
+      rows = rows[:limit]
+      if backwards:
+         rows.reverse()
+         has_next, has_previous = True, has_more
+      else:
+         has_next, has_previous = has_more, from_cursor
+      return {
+         "items": rows,
+         "cursor": encode_cursor(keyset.values(rows[-1])) if rows and has_next else None,
+         "prev_cursor": encode_cursor(keyset.values(rows[0]), backwards=True) if rows and has_previous else None,
+         "limit": limit,
+         "has_next": has_next,
+         "has_previous": has_previous,
+         "ordering": input_data['ordering']
+      }
@@ -57,7 +57,7 @@ def paginate(pagination_class: Type[BasePagination] | None = None) -> Callable:
          }
 
       _wrapped_view.response_wrapper = (200, pagination_class.response)
-      _wrapped_view.extra_query_dict = extra_query_dict
+      _wrapped_view.extra_query_dict = {**getattr(view_func, 'extra_query_dict', {}), **extra_query_dict}
       _wrapped_view.pagination_class = pagination_class  # Store for response validator
 
       # Preserve the async nature of the view
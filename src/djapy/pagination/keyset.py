@@ -0,0 +1,126 @@
+import datetime
+import decimal
+import uuid
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core import signing
+from django.db import connections
+from django.db.models import BooleanField, Expression, F, Model, Q, QuerySet, Value
+from pydantic_core import PydanticCustomError
+
+from djapy.core.response import create_validation_error
+
+__all__ = ["Keyset", "RowCompare", "encode_cursor", "decode_cursor"]
+
+CURSOR_SALT = "djapy.pagination.cursor"
+
+
+def _dump_value(value: Any) -> Any:
+   if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+      # Full precision: a truncated timestamp would skip or repeat rows
+      return value.isoformat()
+   if isinstance(value, (decimal.Decimal, uuid.UUID)):
+      return str(value)
+   return value
+
+
+def encode_cursor(values: Sequence[Any], backwards: bool = False) -> str:
+   """
+   Opaque, signed, URL-safe base64 token of a keyset position, pointing at the rows after
+   it, or before it when `backwards`.
+   """
+   payload = {"p": [_dump_value(value) for value in values]}
+   if backwards:
+      payload["b"] = 1
+   return signing.dumps(payload, salt=CURSOR_SALT)
+
+
+def decode_cursor(token: str, size: int) -> Tuple[List[Any], bool]:
+   """Position and direction of a cursor token, a validation error for forged or foreign tokens."""
+   try:
+      payload = signing.loads(token, salt=CURSOR_SALT)
+   except signing.BadSignature:
+      payload = None
+   values = payload.get("p") if isinstance(payload, dict) else None
+   if not isinstance(values, list) or len(values) != size:
+      raise create_validation_error("Cursor", "cursor", PydanticCustomError("invalid_cursor", "Invalid cursor"))
+   return values, bool(payload.get("b"))
+
+
+class RowCompare(Expression):
+   """`(a, b, c) > (x, y, z)`, the row value comparison a composite index serves directly."""
+   conditional = True
+
+   def __init__(self, columns: Sequence[str], values: Sequence[Any], operator: str):
+      super().__init__(output_field=BooleanField())
+      self.columns = [F(column) for column in columns]
+      self.values = list(values)
+      self.operator = operator
+
+   def get_source_expressions(self):
+      return self.columns
+
+   def set_source_expressions(self, exprs):
+      self.columns = list(exprs)
+
+   def as_sql(self, compiler, connection):
+      lhs, rhs, lhs_params, rhs_params = [], [], [], []
+      for column, value in zip(self.columns, self.values):
+         sql, params = compiler.compile(column)
+         lhs.append(sql)
+         lhs_params.extend(params)
+         sql, params = compiler.compile(Value(value, output_field=column.output_field))
+         rhs.append(sql)
+         rhs_params.extend(params)
+      return f"({', '.join(lhs)}) {self.operator} ({', '.join(rhs)})", (*lhs_params, *rhs_params)
+
+
+class Keyset:
+   """
+   Ordering of a keyset paginated QuerySet: the cursor fields, `-` marking descending ones,
+   completed with the primary key so every position is unique.
+   """
+
+   def __init__(self, fields: Sequence[str], model: type, reverse: bool = False):
+      fields = list(fields)
+      names = {field.lstrip("-") for field in fields}
+      pk = model._meta.pk
+      if not names & {"pk", pk.name, pk.attname}:
+         fields.append("-pk" if fields and fields[-1].startswith("-") else "pk")
+      if reverse:
+         fields = [field[1:] if field.startswith("-") else f"-{field}" for field in fields]
+      self.order_by: Tuple[str, ...] = tuple(fields)
+      self.columns: Tuple[str, ...] = tuple(field.lstrip("-") for field in fields)
+      self.descending: Tuple[bool, ...] = tuple(field.startswith("-") for field in fields)
+
+   def __len__(self) -> int:
+      return len(self.columns)
+
+   def values(self, obj: Model) -> List[Any]:
+      """The keyset position of a fetched row."""
+      values = []
+      for column in self.columns:
+         value = obj
+         for part in column.split("__"):
+            value = getattr(value, part)
+         values.append(value)
+      return values
+
+   def after(self, queryset: QuerySet, values: Sequence[Any]) -> QuerySet:
+      """Rows of `queryset` past the position `values`, in this ordering."""
+      uniform = len(set(self.descending)) == 1
+      if uniform and connections[queryset.db].vendor != "oracle":
+         return queryset.filter(RowCompare(self.columns, values, "<" if self.descending[0] else ">"))
+      # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+      condition = Q()
+      for i, (column, descending) in enumerate(zip(self.columns, self.descending)):
+         equal = {self.columns[j]: values[j] for j in range(i)}
+         condition |= Q(**equal, **{f"{column}__{'lt' if descending else 'gt'}": values[i]})
+      return queryset.filter(condition)
+
+
+def cursor_keyset(pagination_class: Any, model: type, reverse: bool) -> Keyset:
+   fields: Optional[Sequence[str]] = getattr(pagination_class, "cursor_fields", None)
+   if not fields:
+      fields = (getattr(pagination_class, "cursor_field", "id"),)
+   return Keyset(fields, model, reverse=reverse)
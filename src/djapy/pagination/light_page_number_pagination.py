@@ -0,0 +1,95 @@
+from typing import Generic
+
+from django.db.models import QuerySet
+from pydantic import model_validator, computed_field, Field
+
+from djapy.pagination.base_pagination import Page
+from djapy.pagination.page_number_pagination import PageNumberPagination
+from djapy.core.typing_utils import G_TYPE
+from djapy.schema import Schema
+
+__all__ = ["LightPageNumberPagination"]
+
+
+class LightPageNumberPagination(PageNumberPagination):
+   """
+   Page number pagination without a total: `page_size + 1` rows tell whether a next page
+   exists, and no COUNT query is ever run. Suits next/previous navigation over big or
+   heavily filtered tables, where counting costs as much as the page itself.
+   """
+
+   count_strategy = "none"
+
+   class response(Schema, Generic[G_TYPE]):
+      items: G_TYPE = Field(default_factory=list)
+      current_page: int = Field(ge=1, description="Current page number")
+      page_size: int = Field(gt=0, description="Items per page")
+      has_next: bool = Field(default=False, description="Has next page")
+      has_previous: bool = Field(default=False, description="Has previous page")
+
+      @computed_field
+      @property
+      def items_count(self) -> int:
+         """Count of items in current page."""
+         return len(self.items) if isinstance(self.items, list) else 0
+
+      @computed_field
+      @property
+      def start_index(self) -> int:
+         """1-indexed start position."""
+         if not self.items_count:
+            return 0
+         return ((self.current_page - 1) * self.page_size) + 1
+
+      @computed_field
+      @property
+      def end_index(self) -> int:
+         """1-indexed end position."""
+         return max(self.start_index + self.items_count - 1, 0)
+
+      @computed_field
+      @property
+      def is_first_page(self) -> bool:
+         """Check if this is the first page."""
+         return self.current_page == 1
+
+      @computed_field
+      @property
+      def is_last_page(self) -> bool:
+         """Check if this is the last page."""
+         return not self.has_next
+
+      @model_validator(mode="before")
+      def make_data(cls, queryset, info):
+         if isinstance(queryset, Page):
+            return queryset
+         if not isinstance(queryset, QuerySet):
+            raise ValueError("The result should be a QuerySet")
+
+         pagination_class = info.context.get('pagination_class', LightPageNumberPagination)
+         return pagination_class.paginate(queryset, info.context['input_data'])
+
+   @classmethod
+   def paginate(cls, queryset: QuerySet, input_data: dict) -> dict:
+      return cls.light_page_data(input_data, list(queryset[cls._window(input_data)]))
+
+   @classmethod
+   async def apaginate(cls, queryset: QuerySet, input_data: dict) -> Page:
+      return Page(cls.light_page_data(input_data, [row async for row in queryset[cls._window(input_data)]]))
+
+   @staticmethod
+   def _window(input_data: dict) -> slice:
+      # One extra row tells whether a next page exists
+      offset = (input_data['page_number'] - 1) * input_data['page_size']
+      return slice(offset, offset + input_data['page_size'] + 1)
+
+   @staticmethod
+   def light_page_data(input_data: dict, rows: list) -> dict:
+      page_number, page_size = input_data['page_number'], input_data['page_size']
+      return {
+         "items": rows[:page_size],
+         "current_page": page_number,
+         "page_size": page_size,
+         "has_next": len(rows) > page_size,
+         "has_previous": page_number > 1,
+      }
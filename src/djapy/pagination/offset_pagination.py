@@ -1,11 +1,12 @@
 import math
-from typing import Generic
+from typing import Generic, Optional
 from functools import lru_cache
 
 from django.db.models import QuerySet
-from pydantic import model_validator, conint, computed_field
+from pydantic import model_validator, conint, computed_field, Field
 
-from djapy.pagination import BasePagination
+from djapy.pagination.base_pagination import BasePagination, Page
+from djapy.pagination.count import Count
 from djapy.core.typing_utils import G_TYPE
 from djapy.schema import Schema
 
@@ -27,10 +28,14 @@ class OffsetLimitPagination(BasePagination):
       items: G_TYPE
       offset: int
       limit: int
-      total: int  # Add total count
+      total: Optional[int] = Field(None, description="Total items count, None when not counted")
+      total_is_exact: bool = Field(True, description="Whether `total` is the exact current count")
+      count_strategy: str = Field(
+         "exact", description="Strategy that produced `total`: exact, cached, estimated, capped or none"
+      )
       has_next: bool
       has_previous: bool
-      total_pages: int
+      total_pages: Optional[int] = Field(None, description="Total pages, None when not counted")
 
       def __repr__(self):
          return f"{G_TYPE.__name__} with offset {self.offset} and limit {self.limit}"
@@ -53,47 +58,55 @@ class OffsetLimitPagination(BasePagination):
       @property
       def start_index(self) -> int:
          """1-indexed start position."""
-         return self.offset + 1 if self.total > 0 else 0
+         return self.offset + 1 if (self.total or self.items_count) else 0
 
       @computed_field
       @property
       def end_index(self) -> int:
          """1-indexed end position."""
-         return min(self.offset + self.items_count, self.total)
+         end = self.offset + self.items_count
+         if self.total is None or not self.total_is_exact:
+            return end
+         return min(end, self.total)
 
       @model_validator(mode="before")
       def make_data(cls, queryset, info):
+         if isinstance(queryset, Page):
+            return queryset
          if not isinstance(queryset, QuerySet):
             raise ValueError("The result should be a QuerySet")
 
-         input_data = info.context['input_data']
-         offset = input_data['offset']
-         limit = input_data['limit']
-         
-         # Optimized: single count query with caching hint
-         count = queryset.count()
-
-         if count == 0 or offset > count:
-            return {
-               "items": [],
-               "offset": offset,
-               "limit": limit,
-               "total": count,
-               "has_next": False,
-               "has_previous": False,
-               "total_pages": 0,
-            }
-
-         # Get subset - use list() to avoid multiple queries
-         queryset_subset = list(queryset[offset:offset + limit])
-         items_count = len(queryset_subset)
-
-         return {
-            "items": queryset_subset,
-            "offset": offset,
-            "limit": limit,
-            "total": count,
-            "has_next": offset + items_count < count,
-            "has_previous": offset > 0,
-            "total_pages": math.ceil(count / limit) if limit > 0 else 0,
-         }
+         pagination_class = info.context.get('pagination_class', OffsetLimitPagination)
+         return pagination_class.paginate(queryset, info.context['input_data'])
+
+   @classmethod
+   def paginate(cls, queryset: QuerySet, input_data: dict) -> dict:
+      offset, limit = input_data['offset'], input_data['limit']
+      count, strategy = cls.count(queryset)
+      if count.exact and (count.total == 0 or offset > count.total):
+         return cls.page_data(input_data, [], count, strategy)
+      # One extra row tells whether a next page exists, whatever the count strategy
+      return cls.page_data(input_data, list(queryset[offset:offset + limit + 1]), count, strategy)
+
+   @classmethod
+   async def apaginate(cls, queryset: QuerySet, input_data: dict) -> Page:
+      offset, limit = input_data['offset'], input_data['limit']
+      (count, strategy), rows = await cls.acount_and_fetch(queryset, queryset[offset:offset + limit + 1])
+      return Page(cls.page_data(input_data, rows, count, strategy))
+
+   @staticmethod
+   def page_data(input_data: dict, rows: list, count: Count, strategy: str) -> dict:
+      offset, limit = input_data['offset'], input_data['limit']
+      total, exact = count
+      past_end = exact and (total == 0 or offset > total)
+      return {
+         "items": rows[:limit],
+         "offset": offset,
+         "limit": limit,
+         "total": total,
+         "total_is_exact": exact,
+         "count_strategy": strategy,
+         "has_next": len(rows) > limit,
+         "has_previous": offset > 0 and not past_end,
+         "total_pages": 0 if past_end else math.ceil(total / limit) if total is not None else None,
+      }
@@ -1,10 +1,11 @@
-from typing import Generic
+import math
+from typing import Generic, Optional
 
-from django.core.paginator import Paginator, EmptyPage
 from django.db.models import QuerySet
 from pydantic import model_validator, conint, computed_field, Field
 
-from djapy.pagination import BasePagination
+from djapy.pagination.base_pagination import BasePagination, Page
+from djapy.pagination.count import Count
 from djapy.core.typing_utils import G_TYPE
 from djapy.schema import Schema
 
@@ -23,8 +24,12 @@ class PageNumberPagination(BasePagination):
       items: G_TYPE = Field(default_factory=list)
       current_page: int = Field(ge=1, description="Current page number")
       page_size: int = Field(gt=0, description="Items per page")
-      total: int = Field(ge=0, description="Total items count")
-      num_pages: int = Field(ge=0, description="Total pages")
+      total: Optional[int] = Field(None, ge=0, description="Total items count, None when not counted")
+      total_is_exact: bool = Field(True, description="Whether `total` is the exact current count")
+      count_strategy: str = Field(
+         "exact", description="Strategy that produced `total`: exact, cached, estimated, capped or none"
+      )
+      num_pages: Optional[int] = Field(None, ge=0, description="Total pages, None when not counted")
       has_next: bool = Field(default=False, description="Has next page")
       has_previous: bool = Field(default=False, description="Has previous page")
 
@@ -38,7 +43,7 @@ class PageNumberPagination(BasePagination):
       @property
       def start_index(self) -> int:
          """1-indexed start position."""
-         if self.total == 0:
+         if not (self.total or self.items_count):
             return 0
          return ((self.current_page - 1) * self.page_size) + 1
 
@@ -46,7 +51,10 @@ class PageNumberPagination(BasePagination):
       @property
       def end_index(self) -> int:
          """1-indexed end position."""
-         return min(self.start_index + self.items_count - 1, self.total)
+         end = self.start_index + self.items_count - 1
+         if self.total is None or not self.total_is_exact:
+            return max(end, 0)
+         return min(end, self.total)
 
       @computed_field
       @property
@@ -58,41 +66,57 @@ class PageNumberPagination(BasePagination):
       @property
       def is_last_page(self) -> bool:
          """Check if this is the last page."""
+         if self.num_pages is None or not self.total_is_exact:
+            return not self.has_next
          return self.current_page == self.num_pages or self.num_pages == 0
 
       @model_validator(mode="before")
       def make_data(cls, queryset, info):
          """Optimized page number pagination."""
+         if isinstance(queryset, Page):
+            return queryset
          if not isinstance(queryset, QuerySet):
             raise ValueError("The result should be a QuerySet")
 
-         page_number = info.context['input_data']['page_number']
-         page_size = info.context['input_data']['page_size']
-
-         # Use Django's efficient Paginator
-         paginator = Paginator(queryset, page_size)
-         total = paginator.count  # Cached count
-
-         try:
-            page_obj = paginator.page(page_number)
-            items = list(page_obj.object_list)  # Evaluate queryset once
-         except EmptyPage:
-            return {
-               "items": [],
-               "current_page": page_number,
-               "page_size": page_size,
-               "total": total,
-               "num_pages": paginator.num_pages,
-               "has_next": False,
-               "has_previous": False,
-            }
-
-         return {
-            "items": items,
-            "current_page": page_number,
-            "page_size": page_size,
-            "total": total,
-            "num_pages": paginator.num_pages,
-            "has_next": page_obj.has_next(),
-            "has_previous": page_obj.has_previous(),
-         }
+         pagination_class = info.context.get('pagination_class', PageNumberPagination)
+         return pagination_class.paginate(queryset, info.context['input_data'])
+
+   @classmethod
+   def paginate(cls, queryset: QuerySet, input_data: dict) -> dict:
+      page_number, page_size = input_data['page_number'], input_data['page_size']
+      count, strategy = cls.count(queryset)
+      if count.exact and page_number > _num_pages(count.total, page_size):
+         return cls.page_data(input_data, [], count, strategy)
+      # One extra row tells whether a next page exists, whatever the count strategy
+      offset = (page_number - 1) * page_size
+      return cls.page_data(input_data, list(queryset[offset:offset + page_size + 1]), count, strategy)
+
+   @classmethod
+   async def apaginate(cls, queryset: QuerySet, input_data: dict) -> Page:
+      page_number, page_size = input_data['page_number'], input_data['page_size']
+      offset = (page_number - 1) * page_size
+      (count, strategy), rows = await cls.acount_and_fetch(queryset, queryset[offset:offset + page_size + 1])
+      return Page(cls.page_data(input_data, rows, count, strategy))
+
+   @staticmethod
+   def page_data(input_data: dict, rows: list, count: Count, strategy: str) -> dict:
+      page_number, page_size = input_data['page_number'], input_data['page_size']
+      total, exact = count
+      num_pages = _num_pages(total, page_size)
+      past_end = exact and page_number > num_pages
+      return {
+         "items": rows[:page_size],
+         "current_page": page_number,
+         "page_size": page_size,
+         "total": total,
+         "total_is_exact": exact,
+         "count_strategy": strategy,
+         "num_pages": num_pages,
+         "has_next": len(rows) > page_size,
+         "has_previous": page_number > 1 and not past_end,
+      }
+
+
+def _num_pages(total: Optional[int], page_size: int) -> Optional[int]:
+   # Like Django's Paginator, an empty result still has one (empty) page
+   return math.ceil(max(total, 1) / page_size) if total is not None else None
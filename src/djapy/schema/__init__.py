@@ -1,5 +1,6 @@
-__all__ = ['Schema', 'Form', 'QueryList', 'Outsource', 'uni_schema', 'as_json', 'as_form']
+__all__ = ['Schema', 'Form', 'QueryList', 'Outsource', 'uni_schema', 'as_json', 'as_form', 'Stream', 'NDJSONStream']
 
 from djapy.schema.handle import uni_schema
 from djapy.schema.param_loadable import as_json, as_form
 from djapy.schema.schema import Schema, Outsource, Form, QueryList
+from djapy.schema.stream import Stream, NDJSONStream
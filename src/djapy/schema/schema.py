@@ -1,4 +1,5 @@
-__all__ = ['Schema', 'Outsource', 'QueryList', 'ImageUrl', 'get_json_dict', 'Form', 'QueryMapperSchema']
+__all__ = ['Schema', 'Outsource', 'QueryList', 'ImageUrl', 'get_json_dict', 'Form', 'QueryMapperSchema',
+           'CombinedInputSchema']
 
 import inspect
 import typing
@@ -129,6 +130,13 @@ def get_json_dict(to_jsonify_text: str):
    }).model_dump().get(JSON_BODY_PARSE_NAME)
 
 
+def is_multi_value(annotation: Any) -> bool:
+   """Check if a query/form annotation takes every value of a QueryDict key, e.g. `list[int]`."""
+   origin = get_origin(annotation)
+   return (inspect.isclass(origin) and issubclass(origin, typing.Iterable)
+           and typing.get_args(annotation) != ())
+
+
 class QueryMapperSchema(Schema):
    """
    Multiple query or formdata like data can be validated using this model.
@@ -138,9 +146,7 @@ class QueryMapperSchema(Schema):
    @field_validator("*", mode="before")
    def __field_validator__(cls, value: Any, info: ValidationInfo):
       field_type = cls.model_fields.get(info.field_name)
-      origin = get_origin(field_type.annotation)
-      if (inspect.isclass(origin) and issubclass(origin, typing.Iterable)
-        and typing.get_args(field_type.annotation) != ()):
+      if is_multi_value(field_type.annotation):
          return value
       if isinstance(value, list):  # Django's QueryDict {key: [value]} is converted to list.
          return value[0]
@@ -154,6 +160,24 @@ class Form(QueryMapperSchema):
    cvar_c_type = "application/x-www-form-urlencoded"
 
 
+class CombinedInputSchema(Schema):
+   """
+   One model for every input of a view: query, path, JSON body and form.
+
+   Each field is routed to its source through a validation alias (``query``, ``path``,
+   ``body`` or ``form``), so a whole request is validated in a single pydantic-core call.
+   """
+   cvar_c_type = "_combined"
+   cvar_unwrap_fields: ClassVar[frozenset] = frozenset()  # fields fed by a QueryDict
+   cvar_reads_body: ClassVar[bool] = False
+
+   @field_validator("*", mode="before")
+   def __unwrap_field__(cls, value: Any, info: ValidationInfo):
+      if isinstance(value, list) and info.field_name in cls.cvar_unwrap_fields:
+         return value[0]
+      return value
+
+
 class Outsource(Schema):
    """
    Allows the model to have a source object, info object and context object.
@@ -0,0 +1,50 @@
+__all__ = ['Stream', 'NDJSONStream', 'is_stream_type']
+
+from typing import Any, Generic, List, get_args, get_origin
+
+from djapy.core.typing_utils import G_TYPE
+
+
+def _stream_instance(cls, item: Any):
+   if get_origin(item) in (list, List):
+      item = get_args(item)[0] if get_args(item) else Any
+   instance = cls()
+   instance.item_type = item
+   return instance
+
+
+class Stream(Generic[G_TYPE]):
+   """
+   Streaming response marker, e.g. `-> Stream[List[TodoSchema]]` or `{200: Stream[TodoSchema]}`.
+
+   The view may return a QuerySet (iterated in chunks), a generator or any iterable; each
+   item is validated and serialized on its own and sent as one JSON array through a
+   `StreamingHttpResponse`, so the whole result is never held in memory.
+   """
+   media_type = "application/json"
+   item_type: Any = None
+
+   def __class_getitem__(cls, item: G_TYPE) -> G_TYPE:
+      return _stream_instance(cls, item)
+
+   @property
+   def openapi_schema(self) -> Any:
+      """Type documenting the whole streamed body."""
+      return List[self.item_type]
+
+   def __repr__(self):
+      return f"{type(self).__name__}[{getattr(self.item_type, '__name__', self.item_type)}]"
+
+
+class NDJSONStream(Stream):
+   """Like `Stream`, but sends newline-delimited JSON: one item per line."""
+   media_type = "application/x-ndjson"
+
+   @property
+   def openapi_schema(self) -> Any:
+      return self.item_type
+
+
+def is_stream_type(schema: Any) -> Stream | None:
+   """Return the stream marker if `schema` is one, else None."""
+   return schema if isinstance(schema, Stream) else None
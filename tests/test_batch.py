@@ -0,0 +1,86 @@
+import gzip
+import json
+
+import pytest
+
+from tests.testapp.models import Item
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", price=i + 1) for i in range(3)]
+
+
+def _batch(client, operations):
+    return client.post("/batch/", data=json.dumps({"operations": operations}), content_type="application/json")
+
+
+class TestBatchView:
+    def test_runs_operations_in_order(self, client, items):
+        response = _batch(client, [
+            {"path": "/items/"},
+            {"path": f"/items/{items[0].pk}/"},
+            {"path": "/items/search/", "query": {"q": "Item 2"}},
+            {"method": "POST", "path": "/items/async/echo/", "body": {"title": "Echo", "price": 5}},
+        ])
+        assert response.status_code == 200
+        results = json.loads(response.content)
+        assert [r["status"] for r in results] == [200, 200, 200, 200]
+        assert len(results[0]["body"]) == 3
+        assert results[1]["body"]["title"] == items[0].title
+        assert [i["title"] for i in results[2]["body"]] == ["Item 2"]
+        assert results[3]["body"]["title"] == "Echo"
+
+    def test_per_operation_status(self, client, items):
+        response = _batch(client, [
+            {"method": "POST", "path": "/items/create/", "body": {"title": "Bad", "price": -1}},
+            {"path": "/items/create/"},
+            {"path": "/nowhere/"},
+        ])
+        results = json.loads(response.content)
+        assert [r["status"] for r in results] == [400, 405, 404]
+
+    def test_reuses_authenticated_request(self, client, auth_client, items):
+        operation = [{"path": "/items/protected/"}]
+        assert json.loads(_batch(client, operation).content)[0]["status"] == 403
+        assert json.loads(_batch(auth_client, operation).content)[0]["status"] == 200
+
+    def test_rejects_nested_batch(self, client, db):
+        results = json.loads(_batch(client, [{"method": "POST", "path": "/batch/", "body": {"operations": []}}]).content)
+        assert results[0]["status"] == 400
+        assert results[0]["body"]["alias"] == "nested_batch"
+
+    def test_operation_limit(self, client, db, settings):
+        settings.DJAPY_BATCH_MAX_OPERATIONS = 2
+        response = _batch(client, [{"path": "/items/"}] * 3)
+        assert response.status_code == 400
+        assert json.loads(response.content)["errors"][0]["type"] == "too_many_operations"
+
+    def test_operations_ignore_negotiation_headers(self, client, items, settings):
+        settings.DJAPY_COMPRESSION = True
+        settings.DJAPY_COMPRESSION_ENCODINGS = ("gzip",)
+        settings.DJAPY_COMPRESSION_MIN_SIZE = 0
+        etag = client.get(f"/items/{items[0].pk}/").get("ETag", "*")
+        response = client.post(
+            "/batch/",
+            data=json.dumps({"operations": [{"path": "/items/"}, {"path": f"/items/{items[0].pk}/"}]}),
+            content_type="application/json",
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_ACCEPT="application/json, text/csv;q=0.9",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        # Only the batch response itself is compressed
+        assert response["Content-Encoding"] == "gzip"
+        results = json.loads(gzip.decompress(response.content))
+        assert [r["status"] for r in results] == [200, 200]
+        assert [i["title"] for i in results[0]["body"]] == [item.title for item in reversed(items)]
+        assert results[1]["body"]["title"] == items[0].title
+        assert all("Content-Encoding" not in r["headers"] for r in results)
+        assert all(r["headers"]["Content-Type"] == "application/json" for r in results)
+
+    def test_documented_in_openapi(self):
+        from djapy.openapi import OpenAPI
+        from django.test import RequestFactory
+
+        schema = OpenAPI(cache_enabled=False).dict(RequestFactory().get("/"), use_cache=False)
+        assert "post" in schema["paths"]["/batch/"]
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from django.core.cache import cache
+
+from djapy import djapify, djapy_cache, invalidate_cache
+from tests.testapp import views
+from tests.testapp.models import Item, Tag
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    for view in (views.cached_items, views.async_cached_items):
+        view.djapy_plan.cache.local.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", price=i + 1) for i in range(3)]
+
+
+class TestDjapyCache:
+    def test_hit_skips_view(self, client, items, django_assert_num_queries):
+        first = client.get("/items/cached/")
+        with django_assert_num_queries(0):
+            second = client.get("/items/cached/")
+        assert second.status_code == 200
+        assert second.content == first.content
+
+    def test_keyed_on_validated_input(self, client, items):
+        Item.objects.filter(pk=items[0].pk).update(is_active=False)
+        assert len(json.loads(client.get("/items/cached/?active=true").content)) == 2
+        assert len(json.loads(client.get("/items/cached/?active=false").content)) == 1
+        # Same validated input, different raw query string
+        assert len(json.loads(client.get("/items/cached/?active=1").content)) == 2
+
+    def test_invalidated_by_model_signal(self, client, items):
+        assert len(json.loads(client.get("/items/cached/").content)) == 3
+        Item.objects.create(title="New", price=1)
+        assert len(json.loads(client.get("/items/cached/").content)) == 4
+        items[0].delete()
+        assert len(json.loads(client.get("/items/cached/").content)) == 3
+
+    def test_invalidate_cache(self, client, items):
+        client.get("/items/cached/")
+        Item.objects.filter(pk=items[0].pk).update(title="Renamed")
+        assert "Renamed" not in client.get("/items/cached/").content.decode()
+        invalidate_cache(Item)
+        assert "Renamed" in client.get("/items/cached/").content.decode()
+
+    def test_keyed_on_user(self, client, auth_client, items):
+        plan_cache = views.cached_items.djapy_plan.cache
+        client.get("/items/cached/")
+        auth_client.get("/items/cached/")
+        assert len(plan_cache.local._entries) == 2
+
+    def test_shared_backend_tier(self, client, items, django_assert_num_queries):
+        client.get("/items/cached/")
+        views.cached_items.djapy_plan.cache.local.clear()
+        with django_assert_num_queries(0):
+            assert client.get("/items/cached/").status_code == 200
+
+    def test_async_view(self, client, items, django_assert_num_queries):
+        first = client.get("/items/async/cached/")
+        with django_assert_num_queries(0):
+            assert client.get("/items/async/cached/").content == first.content
+        Item.objects.create(title="New", price=1)
+        assert len(json.loads(client.get("/items/async/cached/").content)) == 4
+
+    def test_async_view_invalidated_by_m2m_change(self, client, items, django_assert_num_queries):
+        from django.db.models.signals import m2m_changed
+        from djapy.core.cache import _connect_invalidation
+
+        # Only the "testapp.Item" string of the async view connects the m2m receiver
+        m2m_changed.disconnect(sender=Item.tags.through, dispatch_uid="djapy:cache:testapp.item:tags")
+        _connect_invalidation("testapp.Item")
+        client.get("/items/async/cached/")
+        items[0].tags.add(Tag.objects.create(name="new"))
+        with django_assert_num_queries(1):
+            assert client.get("/items/async/cached/").status_code == 200
+
+    def test_rejects_injected_response(self):
+        from django.http import HttpResponse
+
+        with pytest.raises(TypeError):
+            @djapify
+            @djapy_cache(ttl=10)
+            def view(request, response: HttpResponse) -> {200: dict}:
+                return {}
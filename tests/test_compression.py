@@ -0,0 +1,100 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from djapy.core.compression import negotiate_encoding
+from tests.testapp.models import Item
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", description="x" * 100, price=i + 1) for i in range(20)]
+
+
+@pytest.fixture
+def compression(settings):
+    settings.DJAPY_COMPRESSION = True
+    settings.DJAPY_COMPRESSION_ENCODINGS = ("gzip", "deflate")
+    return settings
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize("header, expected", [
+        ("", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("gzip;q=0, deflate;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("compress, br", None),
+    ])
+    def test_accept_encoding(self, header, expected):
+        assert negotiate_encoding(header, ("gzip", "deflate")) == expected
+
+
+class TestResponseCompression:
+    def test_disabled_by_default(self, client, items):
+        response = client.get("/items/", HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
+
+    def test_gzip(self, client, items, compression):
+        plain = client.get("/items/")
+        response = client.get("/items/", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == plain.content
+
+    def test_deflate(self, client, items, compression):
+        response = client.get("/items/", HTTP_ACCEPT_ENCODING="deflate")
+        assert response["Content-Encoding"] == "deflate"
+        assert json.loads(zlib.decompress(response.content))
+
+    def test_below_threshold(self, client, db, compression):
+        response = client.get("/items/", HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_weakens_etag(self, client, items, compression):
+        compression.DJAPY_ETAG = True
+        response = client.get("/items/", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["ETag"].startswith('W/"')
+        assert client.get("/items/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+    def test_streaming_chunks(self, client, items, compression):
+        compression.DJAPY_STREAM_BUFFER_SIZE = 256
+        response = client.get("/items/stream/", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 2
+        assert len(json.loads(gzip.decompress(b"".join(chunks)))) == 20
+
+    def test_async_streaming(self, client, items, compression):
+        response = client.get("/items/async/stream/", HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+
+        async def collect():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        assert len(json.loads(gzip.decompress(async_to_sync(collect)()))) == 20
+
+    def test_per_view_policy(self, rf, settings):
+        from djapy import djapify, djapy_compress
+
+        @djapify
+        @djapy_compress(min_size=0, encodings=["deflate"])
+        def compressed(request) -> {200: dict}:
+            return {"value": "y" * 64}
+
+        @djapify
+        @djapy_compress(enabled=False)
+        def opted_out(request) -> {200: dict}:
+            return {"value": "y" * 64}
+
+        settings.DJAPY_COMPRESSION = True
+        request = rf.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        assert compressed(request)["Content-Encoding"] == "deflate"
+        assert not opted_out(request).has_header("Content-Encoding")
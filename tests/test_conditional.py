@@ -0,0 +1,52 @@
+import pytest
+
+from djapy.core.conditional import body_etag
+from tests.testapp.models import Item
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", price=i + 1) for i in range(3)]
+
+
+class TestBodyETag:
+    def test_disabled_by_default(self, client, items):
+        assert not client.get("/items/").has_header("ETag")
+
+    def test_etag_from_body(self, client, items, settings):
+        settings.DJAPY_ETAG = True
+        response = client.get("/items/")
+        assert response["ETag"] == body_etag(response.content)
+        not_modified = client.get("/items/", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == response["ETag"]
+
+    def test_changed_body_is_sent(self, client, items, settings):
+        settings.DJAPY_ETAG = True
+        etag = client.get("/items/")["ETag"]
+        Item.objects.create(title="New", price=1)
+        assert client.get("/items/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_only_safe_methods(self, client, db, settings):
+        settings.DJAPY_ETAG = True
+        response = client.post("/items/multi-method/")
+        assert not response.has_header("ETag")
+
+
+class TestVersionFunction:
+    @pytest.mark.parametrize("url", ["/items/versioned/", "/items/async/versioned/"])
+    def test_not_modified_skips_view(self, client, items, url, django_assert_num_queries):
+        response = client.get(url)
+        assert response["ETag"] == f'"{items[-1].pk}"'
+        # Only the version query runs
+        with django_assert_num_queries(1):
+            not_modified = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == 304
+        assert not_modified["ETag"] == response["ETag"]
+
+    def test_new_version_is_sent(self, client, items):
+        etag = client.get("/items/versioned/")["ETag"]
+        Item.objects.create(title="New", price=1)
+        response = client.get("/items/versioned/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
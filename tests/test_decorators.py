@@ -1,8 +1,9 @@
 import json
+from decimal import Decimal
 import pytest
 from django.test import Client
 
-from tests.testapp.models import Item
+from tests.testapp.models import Category, Item
 
 
 @pytest.fixture
@@ -129,3 +130,78 @@ class TestAsyncDjapify:
             @async_djapify
             def not_async(request):
                 pass
+
+
+class TestViewPlan:
+    def test_plan_compiled_at_decoration(self):
+        from tests.testapp.views import create_item
+        plan = create_item.djapy_plan
+        assert plan.methods == frozenset({"POST"})
+        assert plan.auth is None
+        assert set(plan.response_schemas) == {200, 400}
+
+    def test_plan_is_immutable(self):
+        import dataclasses
+        from tests.testapp.views import list_items
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            list_items.djapy_plan.methods = frozenset({"PUT"})
+
+    def test_plan_keeps_auth_mechanism(self):
+        from tests.testapp.views import permission_view
+        plan = permission_view.djapy_plan
+        assert plan.auth is not None
+        assert plan.authorize is True
+
+
+class TestAsyncPipeline:
+    def test_cpu_only_request_runs_inline(self, client, db, monkeypatch):
+        from djapy.core.dec import async_dec
+
+        def no_thread_hop(*args, **kwargs):
+            raise AssertionError("unexpected sync_to_async hop")
+
+        monkeypatch.setattr(async_dec, "sync_to_async", no_thread_hop)
+        response = client.post(
+            "/items/async/echo/",
+            data=json.dumps({"title": "Echo", "price": 3}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        assert json.loads(response.content)["title"] == "Echo"
+
+    def test_validation_error_runs_inline(self, client, db, monkeypatch):
+        from djapy.core.dec import async_dec
+
+        monkeypatch.setattr(async_dec, "sync_to_async", None)
+        response = client.post(
+            "/items/async/echo/",
+            data=json.dumps({"title": "Echo", "price": -3}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+
+    def test_orm_results_detected(self, items):
+        from djapy.core.dec.async_dec import _touches_orm
+        assert _touches_orm(Item.objects.all())
+        assert _touches_orm(list(Item.objects.all()))
+        assert _touches_orm({"item": items[0]})
+        assert _touches_orm([{"item": items[0]}])
+        assert _touches_orm({"page": [[items[0]]]})
+        assert not _touches_orm([{"title": "plain", "price": Decimal("1.5")}])
+        assert not _touches_orm([])
+
+    def test_nested_model_with_lazy_relation(self, client, db):
+        category = Category.objects.create(name="Books")
+        Item.objects.create(title="Novel", price=5, category=category)
+        response = client.get("/items/async/catalog-entries/")
+        assert response.status_code == 200
+        assert json.loads(response.content)[0]["item"]["category"] == {"id": category.id, "name": "Books"}
+
+    def test_inline_can_be_disabled(self, client, db, settings):
+        settings.DJAPY_ASYNC_INLINE = False
+        response = client.post(
+            "/items/async/echo/",
+            data=json.dumps({"title": "Echo", "price": 3}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+
+from typing import Dict, List, Optional
+
+import pytest
+
+from djapy.core.encoders import CSVEncoder, encoders, msgpack
+from tests.testapp.models import Item
+from tests.testapp.schemas import ItemSchema
+
+needs_msgpack = pytest.mark.skipif(msgpack is None, reason="msgpack is not installed")
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", price=i + 1) for i in range(3)]
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize("accept, expected", [
+        ("", "application/json"),
+        ("*/*", "application/json"),
+        ("application/x-ndjson", "application/x-ndjson"),
+        ("text/*", "text/csv"),
+        ("application/json;q=0.5, text/csv", "text/csv"),
+        ("text/csv;q=0, */*;q=0.1", "application/json"),
+    ])
+    def test_candidates(self, accept, expected):
+        assert encoders.candidates(accept)[0].media_type == expected
+
+    def test_unacceptable_falls_back_to_json(self):
+        assert encoders.select(encoders.candidates("image/png"), list) is encoders.default
+
+    def test_list_only_formats(self):
+        assert encoders.select(encoders.candidates("text/csv"), dict) is encoders.default
+
+    @pytest.mark.parametrize("schema, supported", [
+        (list[ItemSchema], True),
+        (List[Optional[ItemSchema]], True),
+        (tuple[ItemSchema, ...], True),
+        (list[dict], True),
+        (List[Dict[str, int]], True),
+        (list[int], False),
+        (List[str], False),
+        (list[list[int]], False),
+    ])
+    def test_csv_needs_records(self, schema, supported):
+        assert CSVEncoder().supports(schema) is supported
+
+
+class TestResponseFormats:
+    def test_json_default(self, client, items):
+        response = client.get("/items/")
+        assert response["Content-Type"] == "application/json"
+        assert "Accept" in response["Vary"]
+
+    def test_ndjson(self, client, items):
+        response = client.get("/items/", HTTP_ACCEPT="application/x-ndjson")
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = response.content.decode().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == [item.title for item in reversed(items)]
+
+    def test_csv(self, client, items):
+        response = client.get("/items/", HTTP_ACCEPT="text/csv")
+        assert response["Content-Type"] == "text/csv"
+        rows = list(csv.DictReader(io.StringIO(response.content.decode())))
+        assert len(rows) == 3
+        assert rows[0]["title"] == items[-1].title
+        assert rows[0]["is_active"] == "true"
+
+    def test_csv_scalar_list_falls_back_to_json(self, client, items):
+        response = client.get("/items/ids/", HTTP_ACCEPT="text/csv")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        assert json.loads(response.content) == [item.pk for item in items]
+
+    def test_csv_unsupported_schema(self, client, items):
+        response = client.get(f"/items/{items[0].pk}/", HTTP_ACCEPT="text/csv")
+        assert response["Content-Type"] == "application/json"
+
+    @needs_msgpack
+    def test_msgpack(self, client, items):
+        response = client.get("/items/", HTTP_ACCEPT="application/msgpack")
+        assert response["Content-Type"] == "application/msgpack"
+        assert len(msgpack.unpackb(response.content)) == 3
+
+    def test_encoder_must_implement_encode_and_decode(self):
+        from djapy.core.encoders import Encoder
+
+        class EncodeOnly(Encoder):
+            def encode(self, serializer, value):
+                return b""
+
+        with pytest.raises(TypeError):
+            EncodeOnly()
+
+    def test_csv_nested_values(self):
+        from djapy.core.serializers import ResponseSerializer
+
+        serializer = ResponseSerializer(list[dict])
+        content = CSVEncoder().encode(serializer, [{"a": 1, "b": {"c": None}}, {"a": None}])
+        assert content.decode().splitlines() == ["a,b", '1,"{""c"":null}"', ","]
+
+
+class TestRequestDecoders:
+    @needs_msgpack
+    def test_msgpack_body(self, client, db):
+        response = client.post(
+            "/items/create/",
+            data=msgpack.packb({"title": "Packed", "price": 3}),
+            content_type="application/msgpack",
+        )
+        assert response.status_code == 200
+        assert json.loads(response.content)["title"] == "Packed"
+
+    @needs_msgpack
+    def test_msgpack_body_combined(self, client, items):
+        response = client.post(
+            f"/items/{items[0].pk}/combined/",
+            data=msgpack.packb({"title": "Packed", "price": 3}),
+            content_type="application/msgpack",
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("content_type, body", [
+        ("application/x-ndjson", b"{bad\n"),
+        ("text/csv", b"\xff\xfe,title\n"),
+        pytest.param("application/msgpack", b"\xc1", marks=needs_msgpack),
+    ])
+    def test_malformed_body(self, client, items, content_type, body):
+        for url in ("/items/create/", f"/items/{items[0].pk}/combined/"):
+            response = client.post(url, data=body, content_type=content_type)
+            assert response.status_code == 400
+            error = json.loads(response.content)["errors"][0]
+            assert error["type"] == "body_invalid"
+            assert content_type in error["msg"]
+
+
+class TestOpenAPIContent:
+    def test_response_and_body_media_types(self):
+        from django.test import RequestFactory
+        from djapy.openapi import OpenAPI
+
+        schema = OpenAPI(cache_enabled=False).dict(RequestFactory().get("/"), use_cache=False)
+        list_content = schema["paths"]["/items/"]["get"]["responses"]["200"]["content"]
+        assert {"application/json", "application/x-ndjson", "text/csv"} <= set(list_content)
+        detail_content = schema["paths"]["/items/{pk}/"]["get"]["responses"]["200"]["content"]
+        assert "text/csv" not in detail_content
+        if msgpack is not None:
+            body = schema["paths"]["/items/create/"]["post"]["requestBody"]["content"]
+            assert "application/msgpack" in body
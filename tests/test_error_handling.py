@@ -45,3 +45,117 @@ class TestMethodNotAllowed:
     def test_delete_on_get_only(self, client, db):
         response = client.delete("/items/")
         assert response.status_code == 405
+
+
+def handle_lookup(request, exception: LookupError):
+    return 404, {"message": str(exception), "alias": "lookup"}
+
+
+async def handle_permission(request, exception: PermissionError | TimeoutError):
+    return {"message": "async handled", "alias": "async"}
+
+
+def handle_nothing(request, error):
+    return {"message": "never"}
+
+
+class TestErrorHandlerIndex:
+    def test_resolves_through_mro(self):
+        from djapy.core.error_handlers import ErrorHandlerIndex
+        index = ErrorHandlerIndex([handle_lookup, handle_permission])
+        assert index.resolve(KeyError) is handle_lookup
+        assert index.resolve(LookupError) is handle_lookup
+        assert index.resolve(TimeoutError) is handle_permission
+        assert index.resolve(ValueError) is None
+
+    def test_resolution_is_cached(self):
+        from djapy.core.error_handlers import ErrorHandlerIndex
+        index = ErrorHandlerIndex([handle_lookup])
+        index.resolve(IndexError)
+        assert index._resolved[IndexError] is handle_lookup
+
+    def test_ignores_handlers_without_exception_annotation(self):
+        from djapy.core.error_handlers import ErrorHandlerIndex
+        index = ErrorHandlerIndex([handle_nothing])
+        assert not index
+
+
+class TestCustomErrorHandlers:
+    def _view(self, decorator_class, exc):
+        decorator = decorator_class(None, error_handlers=[handle_lookup, handle_permission])
+        if decorator_class.__name__.startswith("Async"):
+            async def failing(request) -> {200: dict}:
+                raise exc
+        else:
+            def failing(request) -> {200: dict}:
+                raise exc
+        return decorator(failing)
+
+    def test_sync_view_subclass_exception(self, rf):
+        from djapy.core.dec.sync_dec import SyncDjapifyDecorator
+        response = self._view(SyncDjapifyDecorator, KeyError("missing"))(rf.get("/"))
+        assert response.status_code == 404
+        assert json.loads(response.content)["alias"] == "lookup"
+
+    def test_sync_view_async_handler(self, rf):
+        from djapy.core.dec.sync_dec import SyncDjapifyDecorator
+        response = self._view(SyncDjapifyDecorator, PermissionError())(rf.get("/"))
+        assert response.status_code == 400
+        assert json.loads(response.content)["alias"] == "async"
+
+    async def test_async_view_async_handler(self, rf):
+        from djapy.core.dec.async_dec import AsyncDjapifyDecorator
+        response = await self._view(AsyncDjapifyDecorator, TimeoutError())(rf.get("/"))
+        assert json.loads(response.content)["alias"] == "async"
+
+    def test_unhandled_falls_back_to_500(self, rf):
+        from djapy.core.dec.sync_dec import SyncDjapifyDecorator
+        response = self._view(SyncDjapifyDecorator, RuntimeError("boom"))(rf.get("/"))
+        assert response.status_code == 500
+
+
+class TestSharedErrorHandlerRegistry:
+    def test_registered_handler_applies_to_all_views(self, rf):
+        from djapy import djapify, register_error_handler
+        from djapy.core.error_handlers import error_handlers
+
+        @djapify
+        def failing(request) -> {200: dict}:
+            raise ZeroDivisionError("nope")
+
+        register_error_handler(handle_zero_division)
+        try:
+            response = failing(rf.get("/"))
+        finally:
+            error_handlers.unregister(handle_zero_division)
+        assert response.status_code == 418
+        assert failing(rf.get("/")).status_code == 500
+
+    def test_view_handlers_take_precedence(self, rf):
+        from djapy import djapify, register_error_handler
+        from djapy.core.error_handlers import error_handlers
+
+        def handle_view_zero_division(request, exception: ZeroDivisionError):
+            return 409, {"message": "view", "alias": "view"}
+
+        @djapify(error_handlers=[handle_view_zero_division])
+        def failing(request) -> {200: dict}:
+            raise ZeroDivisionError("nope")
+
+        register_error_handler(handle_zero_division)
+        try:
+            response = failing(rf.get("/"))
+        finally:
+            error_handlers.unregister(handle_zero_division)
+        assert response.status_code == 409
+
+    def test_module_from_settings(self, settings):
+        from djapy.core.error_handlers import error_handlers
+        settings.DJAPY_ERROR_HANDLER_MODULE = "tests.test_error_handling"
+        assert error_handlers.resolve(KeyError) is handle_lookup
+        settings.DJAPY_ERROR_HANDLER_MODULE = "djapy_ext.errorhandler"
+        assert error_handlers.resolve(KeyError) is None
+
+
+def handle_zero_division(request, exception: ZeroDivisionError):
+    return 418, {"message": "teapot", "alias": "teapot"}
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from djapy.core.fields import parse_fields
+from tests.testapp.models import Category, Item, Tag
+
+
+@pytest.fixture
+def catalog(db):
+    books = Category.objects.create(name="Books")
+    tag = Tag.objects.create(name="new")
+    items = [Item.objects.create(title=f"Item {i}", price=i + 1, category=books) for i in range(3)]
+    for item in items:
+        item.tags.add(tag)
+    return items
+
+
+def test_parse_fields():
+    assert parse_fields("title, category.name,category.id") == frozenset({
+        ("title", True), ("category", frozenset({("name", True), ("id", True)}))
+    })
+    # A whole field wins over a nested selection of it
+    assert parse_fields("category,category.name") == frozenset({("category", True)})
+
+
+class TestFieldSelection:
+    def test_without_fields_sends_everything(self, client, catalog):
+        data = json.loads(client.get("/items/catalog/").content)
+        assert set(data[0]) == {"id", "title", "description", "price", "category", "tags"}
+
+    def test_selects_fields(self, client, catalog):
+        data = json.loads(client.get("/items/catalog/?fields=id,title").content)
+        assert data == [{"id": item.pk, "title": item.title} for item in catalog]
+
+    def test_nested_selection(self, client, catalog):
+        data = json.loads(client.get("/items/catalog/?fields=title,category.name,tags.name").content)
+        assert data[0] == {"title": "Item 0", "category": {"name": "Books"}, "tags": [{"name": "new"}]}
+
+    def test_unselected_relations_are_not_queried(self, client, catalog, django_assert_num_queries):
+        # No prefetch of tags, no join of category
+        with django_assert_num_queries(1) as ctx:
+            response = client.get("/items/catalog/?fields=id,title")
+        assert response.status_code == 200
+        sql = ctx.captured_queries[0]["sql"]
+        assert "testapp_category" not in sql
+        assert "description" not in sql
+
+    def test_selected_relation_stays_joined(self, client, catalog, django_assert_num_queries):
+        with django_assert_num_queries(1) as ctx:
+            client.get("/items/catalog/?fields=title,category.name")
+        assert "testapp_category" in ctx.captured_queries[0]["sql"]
+
+    def test_unknown_field(self, client, catalog):
+        response = client.get("/items/catalog/?fields=title,secret")
+        assert response.status_code == 400
+        assert "secret" in response.content.decode()
+
+    def test_paginated_keeps_page_fields(self, client, catalog):
+        data = json.loads(client.get("/items/catalog/paginated/?fields=title&page_size=2").content)
+        assert data["items"] == [{"title": "Item 0"}, {"title": "Item 1"}]
+        assert data["has_next"] is True
+
+    @pytest.mark.parametrize("fields, expected", [
+        ("tag_count", {"tag_count": 1}),
+        ("title,tag_count", {"title": "Item 0", "tag_count": 1}),
+    ])
+    def test_computed_field_keeps_its_sources(self, client, catalog, fields, expected):
+        response = client.get(f"/items/detailed/?fields={fields}")
+        assert response.status_code == 200
+        assert json.loads(response.content)[0] == expected
+
+    def test_union(self, client, catalog):
+        data = json.loads(client.get("/items/catalog/union/?fields=title").content)
+        assert data == [{"title": "Item 0"}, {"title": "Item 2"}]
+
+    def test_async_view(self, client, catalog):
+        response = client.get("/items/async/catalog/?fields=category.name")
+        assert json.loads(response.content)[0] == {"category": {"name": "Books"}}
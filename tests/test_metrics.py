@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from djapy import metrics
+from djapy.core.trace import StageStats
+from tests.testapp.models import Item
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(settings):
+    settings.DJAPY_METRICS = True
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+def _line(body, prefix):
+    return next(line for line in body.splitlines() if line.startswith(prefix))
+
+
+class TestMetrics:
+    def test_records_stages(self, client, db):
+        Item.objects.create(title="Item", price=1)
+        client.get("/items/")
+        client.get("/items/")
+        buckets, sums, responses = metrics.collect()
+        view = "tests.testapp.views.list_items"
+        assert {stage for v, stage in buckets if v == view} == {"access", "input", "view", "serialize"}
+        assert sum(buckets[(view, "serialize")]) == 2
+        assert responses[(view, 200)] == 2
+
+    def test_error_stage(self, client, db):
+        client.get("/items/search/")
+        buckets, _, responses = metrics.collect()
+        assert ("tests.testapp.views.search_items", "error") in buckets
+        assert responses[("tests.testapp.views.search_items", 400)] == 1
+
+    def test_disabled(self, client, db, settings):
+        settings.DJAPY_METRICS = False
+        client.get("/items/")
+        assert metrics.collect() == ({}, {}, {})
+
+    def test_prometheus_endpoint(self, client, db):
+        client.get("/items/")
+        response = client.get("/metrics/")
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.content.decode()
+        labels = 'view="tests.testapp.views.list_items",stage="view"'
+        assert "# TYPE djapy_stage_duration_seconds histogram" in body
+        assert _line(body, f'djapy_stage_duration_seconds_bucket{{{labels},le="+Inf"}}').endswith(" 1")
+        assert _line(body, f"djapy_stage_duration_seconds_count{{{labels}}}").endswith(" 1")
+        assert 'djapy_responses_total{view="tests.testapp.views.list_items",status="200"} 1' in body
+
+    def test_buckets_are_cumulative(self, settings):
+        settings.DJAPY_METRICS_BUCKETS = (0.01, 0.1)
+        metrics.clear()
+        for ms in (5, 50, 500):
+            metrics.observe("v", 200, {"view": StageStats(duration=ms)})
+        body = metrics.render()
+        assert 'djapy_stage_duration_seconds_bucket{view="v",stage="view",le="0.01"} 1' in body
+        assert 'djapy_stage_duration_seconds_bucket{view="v",stage="view",le="0.1"} 2' in body
+        assert 'djapy_stage_duration_seconds_bucket{view="v",stage="view",le="+Inf"} 3' in body
+
+    def test_merges_thread_shards(self):
+        def record():
+            for _ in range(100):
+                metrics.observe("v", 200, {"view": StageStats(duration=1)})
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        buckets, _, responses = metrics.collect()
+        assert sum(buckets[("v", "view")]) == 400
+        assert responses[("v", 200)] == 400
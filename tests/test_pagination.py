@@ -1,6 +1,14 @@
 import json
+import threading
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
 
+from djapy.pagination import CachedCount, CappedCount, EstimatedCount, ExactCount, base_pagination
+from djapy.pagination.count import Count
 from tests.testapp.models import Item
 
 
@@ -131,3 +139,307 @@ class TestCursorPagination:
         data = json.loads(response.content)
         assert len(data["items"]) == 0
         assert data["has_next"] is False
+
+
+def walk_cursor(client, url, **params):
+    """Every page of a cursor paginated endpoint, following the returned cursors."""
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        data = json.loads(client.get(url, query).content)
+        pages.append(data)
+        if not (cursor := data["cursor"]):
+            return pages
+
+
+class TestKeysetCursors:
+    def test_ties_are_neither_skipped_nor_repeated(self, client, db):
+        items = [Item.objects.create(title=f"Item {i}", price=i % 3) for i in range(20)]
+        pages = walk_cursor(client, "/items/paginated/cursor/price/", limit=4)
+        ids = [item["id"] for page in pages for item in page["items"]]
+        expected = sorted(items, key=lambda item: (item.price, item.pk))
+        assert ids == [item.pk for item in expected]
+
+    def test_desc_reverses_every_field(self, client, db):
+        items = [Item.objects.create(title=f"Item {i}", price=i % 3) for i in range(10)]
+        pages = walk_cursor(client, "/items/paginated/cursor/price/", limit=3, ordering="desc")
+        ids = [item["id"] for page in pages for item in page["items"]]
+        expected = sorted(items, key=lambda item: (item.price, item.pk), reverse=True)
+        assert ids == [item.pk for item in expected]
+
+    def test_mixed_directions(self, client, db):
+        items = [Item.objects.create(title=f"Item {i:02}") for i in range(12)]
+        now = timezone.now()
+        Item.objects.filter(pk__in=[item.pk for item in items[1::2]]).update(created_at=now)
+        Item.objects.filter(pk__in=[item.pk for item in items[::2]]).update(created_at=now - timedelta(days=1))
+        pages = walk_cursor(client, "/items/paginated/cursor/newest/", limit=5)
+        titles = [item["title"] for page in pages for item in page["items"]]
+        assert titles == [item.title for item in items[1::2]] + [item.title for item in items[::2]]
+
+    def test_cursor_is_opaque(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/cursor/price/?limit=5").content)
+        assert not data["cursor"].isdigit()
+        assert str(many_items[4].pk) not in data["cursor"].split(":")[0]
+
+    def test_forged_cursor_is_rejected(self, client, many_items):
+        response = client.get("/items/paginated/cursor/price/", {"cursor": "WzEwMCwgNV0:forged", "limit": 5})
+        assert response.status_code == 400
+
+    def test_cursor_of_another_keyset_is_rejected(self, client, many_items):
+        cursor = json.loads(client.get("/items/paginated/cursor/newest/?limit=5").content)["cursor"]
+        response = client.get("/items/paginated/cursor/price/", {"cursor": cursor, "limit": 5})
+        assert response.status_code == 400
+
+
+class TestBidirectionalCursors:
+    def test_every_page_is_one_query(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            first = json.loads(client.get("/items/paginated/cursor/price/?limit=5").content)
+        with django_assert_num_queries(1):
+            client.get("/items/paginated/cursor/price/", {"cursor": first["cursor"], "limit": 5})
+
+    def test_first_page_has_no_previous(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/cursor/price/?limit=5").content)
+        assert data["has_previous"] is False
+        assert data["prev_cursor"] is None
+        assert data["is_first_page"] is True
+
+    def test_back_and_forth(self, client, many_items):
+        url = "/items/paginated/cursor/price/"
+        first = json.loads(client.get(url, {"limit": 5}).content)
+        second = json.loads(client.get(url, {"cursor": first["cursor"], "limit": 5}).content)
+        assert second["has_previous"] is True
+        back = json.loads(client.get(url, {"cursor": second["prev_cursor"], "limit": 5}).content)
+        assert back["items"] == first["items"]
+        assert back["has_previous"] is False
+        assert back["prev_cursor"] is None
+        again = json.loads(client.get(url, {"cursor": back["cursor"], "limit": 5}).content)
+        assert again["items"] == second["items"]
+
+    def test_backwards_from_the_last_page(self, client, db):
+        items = [Item.objects.create(title=f"Item {i:02}") for i in range(12)]
+        now = timezone.now()
+        Item.objects.filter(pk__in=[item.pk for item in items[1::2]]).update(created_at=now)
+        Item.objects.filter(pk__in=[item.pk for item in items[::2]]).update(created_at=now - timedelta(days=1))
+        pages = walk_cursor(client, "/items/paginated/cursor/newest/", limit=5)
+        prev_cursor, walked_back = pages[-1]["prev_cursor"], [pages[-1]]
+        while prev_cursor:
+            data = json.loads(
+                client.get("/items/paginated/cursor/newest/", {"cursor": prev_cursor, "limit": 5}).content
+            )
+            walked_back.insert(0, data)
+            prev_cursor = data["prev_cursor"]
+        titles = [item["title"] for page in walked_back for item in page["items"]]
+        assert titles == [item["title"] for page in pages for item in page["items"]]
+
+    def test_previous_page_emptied_restarts(self, client, many_items):
+        url = "/items/paginated/cursor/price/"
+        first = json.loads(client.get(url, {"limit": 5}).content)
+        second = json.loads(client.get(url, {"cursor": first["cursor"], "limit": 5}).content)
+        Item.objects.filter(pk__in=[item["id"] for item in first["items"]]).delete()
+        back = json.loads(client.get(url, {"cursor": second["prev_cursor"], "limit": 5}).content)
+        assert back["items"] == second["items"]
+        assert back["has_previous"] is False
+
+
+class TestCountStrategies:
+    def test_exact_by_default(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/page/").content)
+        assert data["count_strategy"] == "exact"
+        assert data["total_is_exact"] is True
+
+    def test_capped(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/capped/?limit=10").content)
+        assert (data["total"], data["total_is_exact"], data["count_strategy"]) == (12, False, "capped")
+        assert data["has_next"] is True
+        assert data["end_index"] == 10
+
+    def test_capped_below_cap_is_exact(self, client, db):
+        for i in range(3):
+            Item.objects.create(title=f"Item {i}", price=1)
+        data = json.loads(client.get("/items/paginated/capped/").content)
+        assert (data["total"], data["total_is_exact"]) == (3, True)
+
+    def test_none_skips_count(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.get("/items/paginated/uncounted/?page_number=3")
+        data = json.loads(response.content)
+        assert data["total"] is None and data["num_pages"] is None
+        assert data["total_is_exact"] is False
+        assert len(data["items"]) == 5
+        assert data["has_next"] is False and data["has_previous"] is True
+        assert data["is_last_page"] is True
+        assert data["start_index"] == 21 and data["end_index"] == 25
+
+    def test_none_has_next(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/uncounted/?page_number=2").content)
+        assert data["has_next"] is True
+        assert data["is_last_page"] is False
+
+    def test_cached(self, client, many_items, django_assert_num_queries):
+        cache.clear()
+        first = json.loads(client.get("/items/paginated/cached-count/").content)
+        assert (first["total"], first["total_is_exact"]) == (25, True)
+        Item.objects.create(title="New", price=1)
+        with django_assert_num_queries(1):
+            second = json.loads(client.get("/items/paginated/cached-count/?page_number=2").content)
+        assert (second["total"], second["total_is_exact"], second["count_strategy"]) == (25, False, "cached")
+        # Another filter is another statement, counted on its own
+        other = json.loads(client.get("/items/paginated/cached-count/?active=false").content)
+        assert other["total"] == 0
+        cache.clear()
+
+    def test_estimated_sampled(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/estimated/").content)
+        # Every row matches, so any sampled window extrapolates to the whole pk span
+        assert (data["total"], data["total_is_exact"], data["count_strategy"]) == (25, False, "estimated")
+
+    def test_estimated_exact_below(self, many_items):
+        assert EstimatedCount().count(Item.objects.all()) == (25, True)
+
+    def test_sqlite_stat(self, many_items):
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        strategy = EstimatedCount(exact_below=0)
+        assert strategy.count(Item.objects.all()) == (25, False)
+
+    def test_estimated_union_counted_exactly(self, many_items):
+        queryset = Item.objects.order_by().filter(is_active=True).union(Item.objects.order_by().filter(is_active=False))
+        assert EstimatedCount(exact_below=0, sample_size=5).count(queryset) == (25, True)
+
+    @pytest.mark.parametrize("strategy", [CachedCount(), EstimatedCount(exact_below=0), CappedCount(cap=5)])
+    def test_empty_filter(self, many_items, strategy):
+        assert strategy.count(Item.objects.none()) == (0, True)
+        assert strategy.count(Item.objects.filter(pk__in=[])) == (0, True)
+        cache.clear()
+
+    @pytest.mark.parametrize("strategy, expected", [
+        (CachedCount(), (4, True)),
+        (CappedCount(cap=3), (3, False)),
+        (CappedCount(cap=10), (4, True)),
+    ])
+    def test_sliced_queryset(self, many_items, strategy, expected):
+        assert strategy.count(Item.objects.order_by("pk")[:4]) == expected
+        cache.clear()
+
+    def test_strategy_must_implement_count(self):
+        from djapy.pagination import CountStrategy
+
+        class Uncounted(CountStrategy):
+            name = "uncounted"
+
+        with pytest.raises(TypeError):
+            Uncounted()
+
+    def test_openapi_documents_strategy(self):
+        from tests.testapp.views import CappedOffsetPagination
+        from tests.testapp.schemas import ItemSchema
+        schema = CappedOffsetPagination.response[list[ItemSchema]].model_json_schema()
+        assert "count_strategy" in schema["properties"]
+        assert "Strategy that produced" in schema["properties"]["count_strategy"]["description"]
+
+
+class TestAsyncPagination:
+    def test_offset_matches_sync(self, client, many_items):
+        for query in ("?offset=0&limit=10", "?offset=20&limit=10", "?offset=40&limit=10"):
+            sync = json.loads(client.get(f"/items/paginated/offset/{query}").content)
+            async_ = json.loads(client.get(f"/items/async/paginated/offset/{query}").content)
+            assert async_ == sync
+
+    def test_page_number(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            data = json.loads(client.get("/items/async/paginated/page/?page_number=2&page_size=5").content)
+        assert [item["id"] for item in data["items"]] == [item.pk for item in many_items[5:10]]
+        assert data["total"] == 12
+        assert data["total_is_exact"] is False
+        assert data["count_strategy"] == "capped"
+        assert data["has_next"] is True
+
+    def test_cursor(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            first = json.loads(client.get("/items/async/paginated/cursor/?limit=10").content)
+        second = json.loads(client.get("/items/async/paginated/cursor/", {"cursor": first["cursor"], "limit": 10}).content)
+        back = json.loads(client.get("/items/async/paginated/cursor/", {"cursor": second["prev_cursor"], "limit": 10}).content)
+        assert back["items"] == first["items"]
+        assert [item["id"] for item in first["items"] + second["items"]] == [item.pk for item in many_items[:20]]
+
+    def test_invalid_cursor(self, client, many_items):
+        response = client.get("/items/async/paginated/cursor/", {"cursor": "forged", "limit": 5})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_count_on_own_connection(self, client, monkeypatch, settings):
+        settings.DJAPY_ASYNC_PARALLEL_COUNT = True
+        for i in range(25):
+            Item.objects.create(title=f"Item {i}", price=i * 10)
+        counts, closed = [], []
+
+        def count_apart(db):
+            return True
+
+        def count(queryset):
+            connection = connections[queryset.db]
+            counts.append(threading.get_ident())
+            # SQLite keeps in-memory databases open on close(), record the call instead
+            monkeypatch.setattr(connection, "close", lambda: closed.append(connection))
+            return Count(queryset.count(), True)
+
+        monkeypatch.setattr(base_pagination, "_count_apart", count_apart)
+        monkeypatch.setattr(ExactCount, "count", staticmethod(count))
+        data = json.loads(client.get("/items/async/paginated/offset/?offset=20&limit=10").content)
+        assert data["total"] == 25
+        assert len(data["items"]) == 5
+        assert counts and counts[0] != threading.get_ident()
+        # The executor thread's connection is closed once the count is done
+        assert len(closed) == 1
+
+    def test_sequential_by_default(self, client, many_items, monkeypatch):
+        def count_apart(db):
+            raise AssertionError("parallel count is off by default")
+
+        monkeypatch.setattr(base_pagination, "_count_apart", count_apart)
+        data = json.loads(client.get("/items/async/paginated/offset/?limit=10").content)
+        assert data["total"] == 25
+
+
+class TestLightPageNumberPagination:
+    def test_pages_without_count(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            data = json.loads(client.get("/items/paginated/light/?page_number=2&page_size=10").content)
+        assert [item["id"] for item in data["items"]] == [item.pk for item in many_items[10:20]]
+        assert data["has_next"] is True
+        assert data["has_previous"] is True
+        assert data["start_index"] == 11
+        assert data["end_index"] == 20
+        assert not {"total", "num_pages", "total_is_exact", "count_strategy"} & set(data)
+
+    def test_last_page(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/light/?page_number=3&page_size=10").content)
+        assert data["items_count"] == 5
+        assert data["has_next"] is False
+        assert data["is_last_page"] is True
+
+    def test_filtered_and_empty(self, client, many_items):
+        data = json.loads(client.get("/items/paginated/light/?active=false").content)
+        assert data["items"] == []
+        assert data["start_index"] == 0
+        assert data["end_index"] == 0
+        assert data["has_next"] is False
+
+    def test_async(self, client, many_items, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            data = json.loads(client.get("/items/async/paginated/light/?page_number=3&page_size=10").content)
+        assert [item["id"] for item in data["items"]] == [item.pk for item in many_items[20:]]
+        assert data["has_next"] is False
+
+    def test_openapi_omits_totals(self):
+        from django.test import RequestFactory
+        from djapy.openapi import OpenAPI
+
+        schema = OpenAPI(cache_enabled=False).dict(RequestFactory().get("/"), use_cache=False)
+        response = schema["paths"]["/items/paginated/light/"]["get"]["responses"]["200"]
+        ref = response["content"]["application/json"]["schema"]["$ref"].rsplit("/", 1)[-1]
+        properties = schema["components"]["schemas"][ref]["properties"]
+        assert {"items", "current_page", "page_size", "has_next", "has_previous"} <= set(properties)
+        assert not {"total", "num_pages"} & set(properties)
@@ -31,6 +31,30 @@ class TestJsonBodyParsing:
         )
         assert response.status_code == 400
 
+    def test_invalid_json_body(self, client, db):
+        response = client.post(
+            "/items/create/",
+            data="{not json",
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert not Item.objects.exists()
+
+    def test_body_decoded_once(self, client, db, monkeypatch):
+        from djapy.core import parser
+
+        calls = []
+        original = parser.from_json
+        monkeypatch.setattr(parser, "from_json", lambda body: calls.append(body) or original(body))
+        response = client.post(
+            "/items/create/",
+            data=json.dumps({"title": "Once", "price": -1}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert len(calls) == 1
+        assert isinstance(calls[0], bytes)
+
 
 class TestFormDataParsing:
     def test_parses_form_data(self, client, db):
@@ -92,3 +116,57 @@ class TestParserTupleAnnotation:
 
         result = prepare_schema(str)
         assert result == {200: str}
+
+
+class TestCombinedInputParsing:
+    def test_routes_path_query_and_body(self, client, items_fixture):
+        item = items_fixture[0]
+        response = client.post(
+            f"/items/{item.pk}/combined/?dry_run=true",
+            data=json.dumps({"title": "Renamed", "price": 99}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        data = json.loads(response.content)
+        assert data["id"] == item.pk
+        assert data["title"] == "Renamed"
+        item.refresh_from_db()
+        assert item.title == "Item X"
+
+    def test_validation_error(self, client, items_fixture):
+        response = client.post(
+            f"/items/{items_fixture[0].pk}/combined/",
+            data=json.dumps({"title": "Renamed", "price": -1}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert json.loads(response.content)["type"] == "validation_error"
+
+    def test_invalid_json_body(self, client, items_fixture):
+        response = client.post(
+            f"/items/{items_fixture[0].pk}/combined/",
+            data="{not json",
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+
+    def test_form_data(self, client, db):
+        response = client.post("/items/combined-form/", data={"title": "Combined", "description": "d"})
+        assert response.status_code == 200
+        assert json.loads(response.content)["title"] == "Combined"
+
+    def test_repeated_query_param(self, client, items_fixture):
+        ids = [item.pk for item in items_fixture[:2]]
+        response = client.get("/items/combined-ids/", {"ids": ids, "limit": "5"})
+        assert response.status_code == 200
+        assert [item["id"] for item in json.loads(response.content)] == ids
+
+    def test_repeated_form_param(self, client, db):
+        response = client.post("/items/combined-labelled-form/", data={"title": "Tagged", "labels": ["a", "b"]})
+        assert response.status_code == 200
+        assert json.loads(response.content) == {"title": "Tagged", "labels": ["a", "b"]}
+
+    def test_single_input_model(self):
+        from tests.testapp.views import combined_update_item
+        combined = combined_update_item.djapy_plan.combined_input
+        assert set(combined.model_fields) == {"pk", "data", "dry_run"}
@@ -0,0 +1,74 @@
+import pytest
+from django.core import signing
+
+from djapy.core import profiling
+from djapy.core.profiling import profile_summary, profile_token, summarize_profiles
+
+VIEW = "tests.testapp.views.list_items"
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.DJAPY_PROFILE_DIR = str(tmp_path)
+    profiling._summaries.clear()
+    return tmp_path
+
+
+class TestProfiling:
+    def test_off_without_directory(self, client, db, settings, tmp_path):
+        settings.DJAPY_PROFILE_SAMPLE_RATE = 1.0
+        response = client.get("/items/", HTTP_X_DJAPY_PROFILE=profile_token())
+        assert "X-Djapy-Profile" not in response.headers
+
+    def test_signed_header(self, client, db, profile_dir):
+        response = client.get("/items/", HTTP_X_DJAPY_PROFILE=profile_token("list_items"))
+        name = response.headers["X-Djapy-Profile"]
+        assert name.startswith(f"{VIEW}.") and name.endswith(".pstats")
+        assert (profile_dir / name).exists()
+        assert profile_summary()[VIEW]["count"] == 1
+
+    def test_token_for_another_view(self, client, db, profile_dir):
+        response = client.get("/items/", HTTP_X_DJAPY_PROFILE=profile_token("get_item"))
+        assert "X-Djapy-Profile" not in response.headers
+        assert list(profile_dir.iterdir()) == []
+
+    def test_forged_or_expired_token(self, client, db, profile_dir, settings):
+        assert "X-Djapy-Profile" not in client.get("/items/", HTTP_X_DJAPY_PROFILE="*:forged").headers
+        settings.DJAPY_PROFILE_TOKEN_MAX_AGE = -1
+        assert "X-Djapy-Profile" not in client.get("/items/", HTTP_X_DJAPY_PROFILE=profile_token()).headers
+        assert list(profile_dir.iterdir()) == []
+
+    def test_profile_views(self, client, db, profile_dir, settings):
+        settings.DJAPY_PROFILE_VIEWS = [VIEW]
+        response = client.get("/items/")
+        client.get("/items/public/")
+        # Only signed-header requests learn the file name
+        assert "X-Djapy-Profile" not in response.headers
+        assert [path.name.startswith(VIEW) for path in profile_dir.iterdir()] == [True]
+
+    def test_sample_rate(self, client, db, profile_dir, settings):
+        settings.DJAPY_PROFILE_SAMPLE_RATE = 1.0
+        client.get("/items/")
+        client.get("/items/")
+        assert profile_summary()[VIEW]["count"] == 2
+        assert "list_items" in summarize_profiles(VIEW)
+
+    def test_sampling_profiler(self, client, db, profile_dir, settings):
+        settings.DJAPY_PROFILER = "sampling"
+        settings.DJAPY_PROFILE_SAMPLING_INTERVAL = 0.0001
+        response = client.get("/items/", HTTP_X_DJAPY_PROFILE=profile_token())
+        name = response.headers["X-Djapy-Profile"]
+        assert name.endswith(".collapsed")
+        for line in (profile_dir / name).read_text().splitlines():
+            stack, _, count = line.rpartition(" ")
+            assert int(count) > 0
+
+    def test_async_view(self, client, db, profile_dir):
+        response = client.get("/items/async/", HTTP_X_DJAPY_PROFILE=profile_token())
+        assert response.status_code == 200
+        assert (profile_dir / response.headers["X-Djapy-Profile"]).exists()
+
+
+def test_profile_token_is_signed():
+    with pytest.raises(signing.BadSignature):
+        signing.TimestampSigner(salt="other").unsign(profile_token())
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db.models import Prefetch
+
+from djapy.core.related import load_related
+from djapy.core.streaming import streaming_response
+from tests.testapp.models import Category, Item, Tag
+from tests.testapp.schemas import ItemCatalogSchema, ItemSchema, NestedItemSchema
+
+
+@pytest.fixture
+def catalog(db):
+    tags = [Tag.objects.create(name=f"tag-{i}") for i in range(2)]
+    items = []
+    for i in range(5):
+        item = Item.objects.create(title=f"Item {i}", price=i + 1, category=Category.objects.create(name=f"Cat {i}"))
+        item.tags.set(tags)
+        items.append(item)
+    return items
+
+
+class TestAutoRelated:
+    def test_list_queries_dont_grow_with_rows(self, client, catalog, django_assert_num_queries):
+        # Items joined with their category, plus one prefetch of the tags
+        with django_assert_num_queries(2):
+            response = client.get("/items/related/")
+        data = json.loads(response.content)
+        assert len(data) == 5
+        assert data[0]["category"] == {"id": catalog[0].category_id, "name": "Cat 0"}
+        assert [tag["name"] for tag in data[0]["tags"]] == ["tag-0", "tag-1"]
+
+    def test_paginated(self, client, catalog, django_assert_num_queries):
+        # COUNT, the page and the tags prefetch
+        with django_assert_num_queries(3):
+            response = client.get("/items/related/paginated/?page_size=3")
+        assert len(json.loads(response.content)["items"]) == 3
+
+    def test_stream(self, client, catalog, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            data = json.loads(b"".join(client.get("/items/related/stream/").streaming_content))
+        assert data[4]["category"]["name"] == "Cat 4"
+
+    def test_prefetch_limited_to_schema_columns(self, catalog, django_assert_num_queries):
+        queryset = load_related(Item.objects.all(), ItemCatalogSchema)
+        with django_assert_num_queries(2) as ctx:
+            list(queryset)
+        tags_sql = ctx.captured_queries[1]["sql"]
+        assert '"testapp_tag"."name"' in tags_sql
+
+    def test_disabled(self, client, catalog, settings, django_assert_num_queries):
+        settings.DJAPY_AUTO_RELATED = False
+        with django_assert_num_queries(11):
+            client.get("/items/related/")
+
+    def test_keeps_view_prefetch(self, catalog):
+        custom = Prefetch("tags", queryset=Tag.objects.filter(name="tag-0"))
+        queryset = load_related(Item.objects.prefetch_related(custom), ItemCatalogSchema)
+        assert queryset._prefetch_related_lookups == (custom,)
+        assert [tag.name for tag in queryset[0].tags.all()] == ["tag-0"]
+
+    def test_skips_deferred_relation(self, catalog):
+        queryset = load_related(Item.objects.only("id", "title"), ItemCatalogSchema)
+        assert queryset.query.select_related is False
+        assert list(queryset)
+
+    def test_flat_schema_untouched(self, db):
+        queryset = Item.objects.all()
+        assert load_related(queryset, ItemSchema).query.select_related is False
+
+    def test_recursive_schema(self, client, db):
+        Item.objects.create(title="Loose")
+        queryset = load_related(Item.objects.all(), NestedItemSchema)
+        assert queryset.query.select_related == {"category": {}}
+        response = client.get("/items/related/recursive/")
+        assert response.status_code == 200
+        assert json.loads(response.content)[0]["category"] is None
+
+    def test_union_untouched(self, client, catalog):
+        queryset = Item.objects.filter(price__lt=2).order_by().union(Item.objects.filter(price__gt=4).order_by())
+        assert load_related(queryset, ItemCatalogSchema) is queryset
+        response = client.get("/items/related/union/")
+        assert response.status_code == 200
+        assert [item["title"] for item in json.loads(response.content)] == ["Item 0", "Item 4"]
+
+    def test_async_stream(self, client, catalog):
+        async def collect(response):
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        data = json.loads(async_to_sync(collect)(client.get("/items/async/related/stream/")))
+        assert data[4]["category"]["name"] == "Cat 4"
+        assert [tag["name"] for tag in data[4]["tags"]] == ["tag-0", "tag-1"]
+
+    def test_async_stream_joins_only_before_django_5(self, client, catalog, monkeypatch):
+        from djapy.core import plan
+        streamed = []
+
+        def spy(serializer, data, *args, **kwargs):
+            streamed.append(data)
+            return streaming_response(serializer, data, *args, **kwargs)
+
+        monkeypatch.setattr(plan, "ASYNC_ITERATOR_PREFETCH", False)
+        monkeypatch.setattr(plan, "streaming_response", spy)
+        client.get("/items/async/related/stream/")
+        assert streamed[0].query.select_related == {"category": {}}
+        assert streamed[0]._prefetch_related_lookups == ()
@@ -0,0 +1,88 @@
+import pytest
+
+from djapy.core.serializers import ResponseSerializerRegistry, response_serializers
+from djapy.schema import Schema
+from tests.testapp.models import Item
+from tests.testapp.schemas import ItemSchema
+
+
+class PointSchema(Schema):
+    x: int
+    y: int
+
+
+class TestResponseSerializerRegistry:
+    def test_get_builds_once(self):
+        registry = ResponseSerializerRegistry()
+        first = registry.get("view", 200, PointSchema)
+        second = registry.get("view", 200, PointSchema)
+        assert first is second
+        assert registry.stats()["misses"] == 1
+        assert registry.stats()["hits"] == 1
+        assert registry.stats()["entries"] == 1
+
+    def test_warm_builds_every_status(self):
+        registry = ResponseSerializerRegistry()
+        registry.warm("view", {200: list[PointSchema], 404: dict})
+        stats = registry.stats()
+        assert stats["entries"] == 2
+        assert stats["misses"] == 0
+        assert stats["build_time_total"] >= stats["build_time_max"] > 0
+
+    def test_serializer_validates_from_attributes(self):
+        registry = ResponseSerializerRegistry()
+        serializer = registry.get("view", 200, list[PointSchema])
+
+        class Obj:
+            x = 1
+            y = 2
+
+        value = serializer.validate([Obj()])
+        assert serializer.to_python(value) == [{"x": 1, "y": 2}]
+
+    def test_clear(self):
+        registry = ResponseSerializerRegistry()
+        registry.get("view", 200, PointSchema)
+        registry.clear()
+        assert registry.stats() == {
+            "entries": 0, "hits": 0, "misses": 0, "build_time_total": 0, "build_time_max": 0.0,
+        }
+
+
+class TestRegistryOnRequests:
+    def test_views_are_warmed_at_decoration(self):
+        from tests.testapp.views import list_items
+        misses = response_serializers.misses
+        serializer = response_serializers.get(list_items.djapy_plan.view_func, 200, None)
+        assert serializer.schema == list[ItemSchema]
+        assert response_serializers.misses == misses
+
+    def test_requests_hit_the_registry(self, client, db):
+        Item.objects.create(title="A", price=1)
+        misses = response_serializers.misses
+        hits = response_serializers.hits
+        client.get("/items/")
+        client.get("/items/")
+        assert response_serializers.misses == misses
+        assert response_serializers.hits == hits + 2
+
+
+class TestJsonRendering:
+    def test_to_json_returns_bytes(self):
+        registry = ResponseSerializerRegistry()
+        serializer = registry.get("view", 200, list[PointSchema])
+        value = serializer.validate([{"x": 1, "y": 2}])
+        assert serializer.to_json(value) == b'[{"x":1,"y":2}]'
+
+    def test_parser_render_matches_parse_data(self, rf):
+        from djapy.core.parser import ResponseParser
+        request = rf.get("/")
+        data = [{"x": 1, "y": 2}, {"x": 3, "y": 4}]
+        parser = ResponseParser(request, 200, data, {200: list[PointSchema]})
+        import json
+        assert json.loads(parser.render()) == parser.parse_data()
+
+    def test_render_model_instance(self, rf):
+        from djapy.core.parser import ResponseParser
+        parser = ResponseParser(rf.get("/"), 200, PointSchema(x=5, y=6), {200: PointSchema})
+        assert parser.render() == b'{"x":5,"y":6}'
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from tests.testapp.models import Item
+
+
+@pytest.fixture
+def items(db):
+    return [Item.objects.create(title=f"Item {i}", price=i) for i in range(5)]
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+class TestStreamingResponses:
+    def test_queryset_streams_json_array(self, client, items):
+        response = client.get("/items/stream/")
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/json"
+        data = json.loads(_body(response))
+        assert [item["title"] for item in data] == [f"Item {i}" for i in range(5)]
+
+    def test_empty_queryset_streams_empty_array(self, client, db):
+        response = client.get("/items/stream/")
+        assert json.loads(_body(response)) == []
+
+    def test_generator_streams_ndjson(self, client, db):
+        response = client.get("/items/stream/ndjson/?limit=4")
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = _body(response).decode().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[2])["title"] == "Gen 2"
+
+    def test_small_buffer_yields_several_chunks(self, client, items, settings):
+        settings.DJAPY_STREAM_BUFFER_SIZE = 1
+        response = client.get("/items/stream/")
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 1
+        assert len(json.loads(b"".join(chunks))) == 5
+
+    def test_invalid_item_truncates_stream(self, rf):
+        from djapy.core.serializers import ResponseSerializer
+        from djapy.core.streaming import iter_stream
+        from djapy.schema import Stream
+        from tests.testapp.schemas import TagSchema
+
+        serializer = ResponseSerializer(Stream[list[TagSchema]])
+        body = b"".join(iter_stream(serializer, [{"id": 1, "name": "a"}, {"id": "x"}], {}))
+        assert body == b'[{"id":1,"name":"a"}'
+
+
+class TestStreamMarker:
+    def test_list_item_type(self):
+        from djapy.schema import Stream
+        from tests.testapp.schemas import TagSchema
+        assert Stream[list[TagSchema]].item_type is TagSchema
+        assert Stream[TagSchema].item_type is TagSchema
+
+    def test_openapi_content_type(self, rf):
+        from djapy.openapi import openapi
+        openapi.paths = {}
+        schema = openapi.dict(rf.get("/"), use_cache=False)
+        content = schema["paths"]["/items/stream/ndjson/"]["get"]["responses"]["200"]["content"]
+        assert "application/x-ndjson" in content
+        array = schema["paths"]["/items/stream/"]["get"]["responses"]["200"]["content"]["application/json"]
+        assert array["schema"]["type"] == "array"
+
+
+class TestAsyncStreamingResponses:
+    async def _collect(self, response):
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    async def test_async_generator_streams_ndjson(self, async_client):
+        response = await async_client.get("/items/async/stream/generated/?limit=5")
+        assert response.is_async
+        lines = (await self._collect(response)).decode().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == [f"tag-{i}" for i in range(5)]
+
+    def test_queryset_uses_async_iterator(self, client, items):
+        response = client.get("/items/async/stream/")
+        assert response.is_async
+        data = json.loads(async_to_sync(self._collect)(response))
+        assert [item["title"] for item in data] == [item.title for item in items]
@@ -0,0 +1,86 @@
+import logging
+
+import pytest
+
+from djapy.core.trace import fingerprint
+from tests.testapp.models import Item, Tag
+
+
+@pytest.fixture
+def items(db):
+    tag = Tag.objects.create(name="tag")
+    items = [Item.objects.create(title=f"Item {i}", price=i + 1) for i in range(6)]
+    for item in items:
+        item.tags.add(tag)
+    return items
+
+
+@pytest.fixture
+def reports(settings):
+    collected = []
+    settings.DJAPY_TRACE_SAMPLE_RATE = 1.0
+    settings.DJAPY_TRACE_SINKS = [collected.append]
+    return collected
+
+
+def test_fingerprint_collapses_parameter_lists():
+    assert fingerprint("SELECT 1 WHERE id IN (%s, %s, %s)") == fingerprint("SELECT 1 WHERE id IN (%s)")
+
+
+class TestTrace:
+    def test_off_by_default(self, client, items, settings):
+        settings.DEBUG = True
+        response = client.get("/items/related/")
+        assert "X-Djapy-Queries" not in response.headers
+
+    def test_counts_queries_per_stage(self, client, items, reports):
+        client.get("/items/related/")
+        report, = reports
+        assert report.view == "tests.testapp.views.related_items"
+        assert report.status == 200
+        # The QuerySet is lazy: it's evaluated while serializing
+        assert report.stages["view"].queries == 0
+        assert report.stages["serialize"].queries == 2
+        assert report.queries == 2
+        assert report.repeated == []
+
+    def test_detects_n_plus_one(self, client, items, reports, caplog):
+        with caplog.at_level(logging.WARNING, logger="djapy.trace"):
+            client.get("/items/unprefetched/")
+        report, = reports
+        (stage, sql, count), = report.repeated
+        assert (stage, count) == ("serialize", 6)
+        assert "testapp_tag" in sql
+        assert "Possible N+1" in caplog.text
+
+    def test_debug_headers(self, client, items, reports, settings):
+        settings.DEBUG = True
+        response = client.get("/items/unprefetched/")
+        assert response.headers["X-Djapy-Queries"] == "7"
+        assert response.headers["X-Djapy-N-Plus-One"] == "1"
+        assert 'serialize;dur=' in response.headers["Server-Timing"]
+
+    def test_no_headers_without_debug(self, client, items, reports):
+        response = client.get("/items/unprefetched/")
+        assert "X-Djapy-Queries" not in response.headers
+        assert len(reports) == 1
+
+    def test_sampling(self, client, items, reports, settings):
+        settings.DJAPY_TRACE_SAMPLE_RATE = 0.0
+        client.get("/items/related/")
+        assert reports == []
+
+    def test_async_view(self, client, items, reports):
+        client.get("/items/async/")
+        report, = reports
+        assert report.stages["view"].queries == 1
+
+    def test_failing_sink_is_logged(self, client, items, settings, caplog):
+        def broken(report):
+            raise RuntimeError("sink down")
+
+        settings.DJAPY_TRACE_SAMPLE_RATE = 1.0
+        settings.DJAPY_TRACE_SINKS = [broken]
+        response = client.get("/items/related/")
+        assert response.status_code == 200
+        assert "Trace sink" in caplog.text
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import computed_field, Field
 from djapy.schema import Schema, Form
 from djapy.schema.schema import QueryList, Outsource
@@ -30,6 +32,39 @@ class ItemDetailSchema(Outsource):
         return len(self.tags)
 
 
+class CategorySchema(Schema):
+    id: int
+    name: str
+
+
+class ItemCatalogSchema(Outsource):
+    id: int
+    title: str
+    description: str
+    price: float
+    category: Optional[CategorySchema] = None
+    tags: QueryList[TagSchema]
+
+
+class CatalogEntrySchema(Schema):
+    item: ItemCatalogSchema
+
+
+class NestedCategorySchema(Outsource):
+    id: int
+    name: str
+    items: QueryList["NestedItemSchema"]
+
+
+class NestedItemSchema(Outsource):
+    id: int
+    title: str
+    category: Optional[NestedCategorySchema] = None
+
+
+NestedCategorySchema.model_rebuild()
+
+
 class ItemCreateSchema(Schema):
     title: str
     description: str = ""
@@ -42,6 +77,11 @@ class ItemFormSchema(Form):
     description: str = ""
 
 
+class LabelledFormSchema(Form):
+    title: str
+    labels: list[str] = []
+
+
 class ErrorSchema(Schema):
     message: str
     alias: str = "error"
@@ -1,4 +1,6 @@
 from django.urls import path
+from djapy import batch_view, metrics
+
 from . import views
 
 urlpatterns = [
@@ -13,8 +15,48 @@ urlpatterns = [
     path("items/paginated/offset/", views.paginated_items_offset, name="paginated-offset"),
     path("items/paginated/page/", views.paginated_items_page, name="paginated-page"),
     path("items/paginated/cursor/", views.paginated_items_cursor, name="paginated-cursor"),
+    path("items/paginated/capped/", views.capped_items, name="paginated-capped"),
+    path("items/paginated/uncounted/", views.uncounted_items, name="paginated-uncounted"),
+    path("items/paginated/cached-count/", views.cached_count_items, name="paginated-cached-count"),
+    path("items/paginated/estimated/", views.estimated_items, name="paginated-estimated"),
+    path("items/paginated/cursor/price/", views.price_cursor_items, name="paginated-cursor-price"),
+    path("items/paginated/cursor/newest/", views.newest_cursor_items, name="paginated-cursor-newest"),
+    path("items/async/paginated/offset/", views.async_paginated_items_offset, name="async-paginated-offset"),
+    path("items/async/paginated/page/", views.async_paginated_items_page, name="async-paginated-page"),
+    path("items/async/paginated/cursor/", views.async_price_cursor_items, name="async-paginated-cursor"),
+    path("items/paginated/light/", views.light_paginated_items, name="paginated-light"),
+    path("items/async/paginated/light/", views.async_light_paginated_items, name="async-paginated-light"),
     path("items/form-create/", views.form_create_item, name="form-create"),
     path("items/multi-method/", views.multi_method_view, name="multi-method"),
     path("items/json-response/", views.json_response_view, name="json-response"),
     path("items/status-code/", views.status_code_view, name="status-code"),
+    path("items/<int:pk>/combined/", views.combined_update_item, name="combined-update"),
+    path("items/combined-form/", views.combined_form_item, name="combined-form"),
+    path("items/combined-ids/", views.combined_items_by_id, name="combined-ids"),
+    path("items/combined-labelled-form/", views.combined_labelled_form, name="combined-labelled-form"),
+    path("items/async/echo/", views.async_echo_item, name="async-echo"),
+    path("items/async/catalog-entries/", views.async_catalog_entries, name="async-catalog-entries"),
+    path("items/stream/", views.stream_items, name="stream"),
+    path("items/stream/ndjson/", views.stream_items_ndjson, name="stream-ndjson"),
+    path("items/async/stream/", views.async_stream_items, name="async-stream"),
+    path("items/async/stream/generated/", views.async_stream_generated, name="async-stream-generated"),
+    path("items/cached/", views.cached_items, name="cached"),
+    path("items/async/cached/", views.async_cached_items, name="async-cached"),
+    path("items/versioned/", views.versioned_items, name="versioned"),
+    path("items/async/versioned/", views.async_versioned_items, name="async-versioned"),
+    path("items/catalog/", views.catalog_items, name="catalog"),
+    path("items/catalog/paginated/", views.paginated_catalog_items, name="catalog-paginated"),
+    path("items/catalog/union/", views.union_catalog_items, name="catalog-union"),
+    path("items/detailed/", views.detailed_items, name="detailed"),
+    path("items/async/catalog/", views.async_catalog_items, name="async-catalog"),
+    path("items/related/", views.related_items, name="related"),
+    path("items/ids/", views.item_ids, name="item-ids"),
+    path("items/related/recursive/", views.recursive_items, name="related-recursive"),
+    path("items/related/paginated/", views.paginated_related_items, name="related-paginated"),
+    path("items/related/stream/", views.stream_related_items, name="related-stream"),
+    path("items/async/related/stream/", views.async_stream_related_items, name="async-related-stream"),
+    path("items/related/union/", views.union_related_items, name="related-union"),
+    path("items/unprefetched/", views.unprefetched_items, name="unprefetched"),
+    path("batch/", batch_view, name="batch"),
+    path("metrics/", metrics.urls),
 ]
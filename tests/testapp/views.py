@@ -1,13 +1,14 @@
 from django.http import HttpRequest, JsonResponse
-from djapy import djapify, async_djapify
+from djapy import djapify, async_djapify, djapy_cache, djapy_condition, djapy_fields
 from djapy.core.auth import djapy_auth, SessionAuth
-from djapy.pagination import OffsetLimitPagination, PageNumberPagination, CursorPagination
+from djapy.pagination import OffsetLimitPagination, PageNumberPagination, LightPageNumberPagination, CursorPagination, CappedCount, EstimatedCount
 from djapy.pagination.dec import paginate
+from djapy.schema import Stream, NDJSONStream
 
 from .models import Item
 from .schemas import (
     ItemSchema, ItemDetailSchema, ItemCreateSchema,
-    ItemFormSchema, ErrorSchema,
+    ItemFormSchema, LabelledFormSchema, ErrorSchema, TagSchema, ItemCatalogSchema, CatalogEntrySchema, NestedItemSchema,
 )
 
 
@@ -101,3 +102,259 @@ def status_code_view(request: HttpRequest, fail: bool = False) -> {200: ItemSche
         return 400, {"message": "Intentional failure", "alias": "bad_request"}
     item = Item.objects.first()
     return 200, item
+
+
+@djapify(method="POST", combined_input=True)
+def combined_update_item(request: HttpRequest, pk: int, data: ItemCreateSchema, dry_run: bool = False) -> {200: ItemSchema, 404: ErrorSchema}:
+    item = Item.objects.filter(pk=pk).first()
+    if item is None:
+        return 404, {"message": "Item not found", "alias": "not_found"}
+    for field, value in data.model_dump().items():
+        setattr(item, field, value)
+    if not dry_run:
+        item.save()
+    return 200, item
+
+
+@djapify(method="POST", combined_input=True)
+def combined_form_item(request: HttpRequest, data: ItemFormSchema) -> {200: ItemSchema}:
+    item = Item.objects.create(title=data.title, description=data.description)
+    return 200, item
+
+
+@djapify(combined_input=True)
+def combined_items_by_id(request: HttpRequest, ids: list[int], limit: int = 10) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.filter(pk__in=ids).order_by("pk")[:limit]
+
+
+@djapify(method="POST", combined_input=True)
+def combined_labelled_form(request: HttpRequest, data: LabelledFormSchema) -> {200: LabelledFormSchema}:
+    return 200, data
+
+
+@async_djapify(method="POST")
+async def async_echo_item(request: HttpRequest, data: ItemCreateSchema) -> {200: ItemCreateSchema}:
+    return 200, data
+
+
+@async_djapify
+async def async_catalog_entries(request: HttpRequest) -> {200: list[CatalogEntrySchema]}:
+    return 200, [{"item": item} async for item in Item.objects.order_by("pk")]
+
+
+@djapify
+def stream_items(request: HttpRequest) -> Stream[list[ItemSchema]]:
+    return Item.objects.order_by("pk")
+
+
+@djapify
+def stream_items_ndjson(request: HttpRequest, limit: int = 3) -> {200: NDJSONStream[ItemSchema]}:
+    return ({"id": i, "title": f"Gen {i}", "description": "", "price": i, "is_active": True} for i in range(limit))
+
+
+@async_djapify
+async def async_stream_items(request: HttpRequest) -> Stream[list[ItemSchema]]:
+    return Item.objects.order_by("pk")
+
+
+@async_djapify
+async def async_stream_generated(request: HttpRequest, limit: int = 3) -> NDJSONStream[TagSchema]:
+    async def tags():
+        for i in range(limit):
+            yield {"id": i, "name": f"tag-{i}"}
+    return tags()
+
+
+@djapify
+@djapy_cache(ttl=60, invalidate_on=[Item])
+def cached_items(request: HttpRequest, active: bool = True) -> {200: list[ItemSchema]}:
+    return Item.objects.filter(is_active=active)
+
+
+@async_djapify
+@djapy_cache(ttl=60, invalidate_on=["testapp.Item"])
+async def async_cached_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return [item async for item in Item.objects.all()]
+
+
+def items_version(request: HttpRequest, **kwargs) -> str:
+    return str(Item.objects.order_by("-pk").values_list("pk", flat=True).first())
+
+
+@djapify
+@djapy_condition(etag=items_version)
+def versioned_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return Item.objects.order_by("pk")
+
+
+@async_djapify
+@djapy_condition(etag=items_version)
+async def async_versioned_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return [item async for item in Item.objects.order_by("pk")]
+
+
+@djapify
+@djapy_fields()
+def catalog_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.select_related("category").prefetch_related("tags").order_by("pk")
+
+
+@djapify
+@paginate(PageNumberPagination)
+@djapy_fields()
+def paginated_catalog_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.select_related("category").prefetch_related("tags").order_by("pk")
+
+
+@djapify
+@djapy_fields()
+def union_catalog_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.filter(price__lt=2).order_by().union(Item.objects.filter(price__gt=2).order_by()).order_by("pk")
+
+
+@djapify
+@djapy_fields()
+def detailed_items(request: HttpRequest) -> {200: list[ItemDetailSchema]}:
+    return Item.objects.order_by("pk")
+
+
+@async_djapify
+@djapy_fields()
+async def async_catalog_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return [item async for item in Item.objects.select_related("category").order_by("pk")]
+
+
+@djapify
+def item_ids(request: HttpRequest) -> {200: list[int]}:
+    return list(Item.objects.order_by("pk").values_list("pk", flat=True))
+
+
+@djapify
+def recursive_items(request: HttpRequest) -> {200: list[NestedItemSchema]}:
+    return Item.objects.order_by("pk")
+
+
+@djapify
+def related_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.order_by("pk")
+
+
+@djapify
+@paginate(PageNumberPagination)
+def paginated_related_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.order_by("pk")
+
+
+@djapify
+def stream_related_items(request: HttpRequest) -> Stream[list[ItemCatalogSchema]]:
+    return Item.objects.order_by("pk")
+
+
+@async_djapify
+async def async_stream_related_items(request: HttpRequest) -> Stream[list[ItemCatalogSchema]]:
+    return Item.objects.order_by("pk")
+
+
+@djapify
+def union_related_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    return Item.objects.filter(price__lt=2).order_by().union(Item.objects.filter(price__gt=4).order_by()).order_by("pk")
+
+
+@djapify
+def unprefetched_items(request: HttpRequest) -> {200: list[ItemCatalogSchema]}:
+    # A list defeats relation loading, so every item queries its tags
+    return list(Item.objects.order_by("pk"))
+
+
+class CappedOffsetPagination(OffsetLimitPagination):
+    count_strategy = CappedCount(cap=12)
+
+
+class CappedPagePagination(PageNumberPagination):
+    count_strategy = CappedCount(cap=12)
+
+
+class UncountedPagePagination(PageNumberPagination):
+    count_strategy = "none"
+
+
+class CachedCountPagePagination(PageNumberPagination):
+    count_strategy = "cached"
+
+
+class SampledOffsetPagination(OffsetLimitPagination):
+    count_strategy = EstimatedCount(exact_below=0, sample_size=10)
+
+
+@djapify
+@paginate(CappedOffsetPagination)
+def capped_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.order_by("pk")
+
+
+@djapify
+@paginate(UncountedPagePagination)
+def uncounted_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.order_by("pk")
+
+
+@djapify
+@paginate(CachedCountPagePagination)
+def cached_count_items(request: HttpRequest, active: bool = True) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.filter(is_active=active).order_by("pk")
+
+
+@djapify
+@paginate(SampledOffsetPagination)
+def estimated_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.filter(is_active=True).order_by("pk")
+
+
+class PriceCursorPagination(CursorPagination):
+    cursor_fields = ("price",)
+
+
+class NewestCursorPagination(CursorPagination):
+    cursor_fields = ("-created_at", "title")
+
+
+@djapify
+@paginate(PriceCursorPagination)
+def price_cursor_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.all()
+
+
+@djapify
+@paginate(NewestCursorPagination)
+def newest_cursor_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.all()
+
+
+@async_djapify
+@paginate(OffsetLimitPagination)
+async def async_paginated_items_offset(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.all()
+
+
+@async_djapify
+@paginate(CappedPagePagination)
+async def async_paginated_items_page(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.order_by("pk")
+
+
+@async_djapify
+@paginate(PriceCursorPagination)
+async def async_price_cursor_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.all()
+
+
+@djapify
+@paginate(LightPageNumberPagination)
+def light_paginated_items(request: HttpRequest, active: bool = True) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.filter(is_active=active).order_by("pk")
+
+
+@async_djapify
+@paginate(LightPageNumberPagination)
+async def async_light_paginated_items(request: HttpRequest) -> {200: list[ItemSchema]}:
+    return 200, Item.objects.order_by("pk")